@@ -10,7 +10,7 @@ from ai_unifier_assesment.agent.tools.code_writer_tool import (
     CodeWriterInput,
     CodeWriterTool,
 )
-from ai_unifier_assesment.dependencies import get_settings
+from ai_unifier_assesment.dependencies import get_cached_settings
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +19,7 @@ class CodeWriterService:
     def __init__(
         self,
         code_writer: Annotated[CodeWriterTool, Depends(CodeWriterTool)],
-        settings: Annotated[object, Depends(get_settings)],
+        settings: Annotated[object, Depends(get_cached_settings)],
     ):
         self._code_writer = code_writer
         self._settings = settings
@@ -1,11 +1,14 @@
 import logging
 import tempfile
+import uuid
+from datetime import datetime
 from pathlib import Path
-from typing import Annotated, AsyncGenerator, Dict, Literal
+from typing import Annotated, Any, AsyncGenerator, Dict, Literal, Optional, cast
 
 from fastapi import Depends
 from langchain_core.messages import HumanMessage
 from langgraph.graph import END, StateGraph
+from langgraph.graph.state import CompiledStateGraph
 
 from ai_unifier_assesment.agent.code_healing_event_processor import CodeHealingEventProcessor
 from ai_unifier_assesment.agent.code_writer_service import CodeWriterService
@@ -15,10 +18,15 @@ from ai_unifier_assesment.agent.state import CodeHealingState
 from ai_unifier_assesment.agent.tools.code_tester_tool import CodeTesterTool
 from ai_unifier_assesment.agent.tools.code_writer_tool import CodeWriterTool
 from ai_unifier_assesment.agent.tools.tester_models import CodeTesterInput
-from ai_unifier_assesment.dependencies import get_settings
+from ai_unifier_assesment.config import Settings
+from ai_unifier_assesment.dependencies import get_cached_settings, get_resource_registry
 from ai_unifier_assesment.large_language_model.model import Model
-from ai_unifier_assesment.resources.prompts.prompt_loader import PromptLoader
+from ai_unifier_assesment.resource_registry import ResourceRegistry
+from ai_unifier_assesment.resources.prompts.prompt_loader import PromptLoader, prompt_loader
 from ai_unifier_assesment.agent.language import Language
+from ai_unifier_assesment.services.metrics_sink import MetricsSink, get_metrics_sink
+from ai_unifier_assesment.services.stream_metrics import StreamMetrics
+from ai_unifier_assesment.services.usage_collector import UsageCollector
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +44,9 @@ class CodingAgent:
         language_detector: Annotated[LanguageDetector, Depends(LanguageDetector)],
         initial_code_generator: Annotated[InitialCodeGenerator, Depends(InitialCodeGenerator)],
         code_writer_service: Annotated[CodeWriterService, Depends(CodeWriterService)],
-        settings: Annotated[object, Depends(get_settings)],
+        settings: Annotated[object, Depends(get_cached_settings)],
+        metrics_sink: Annotated[MetricsSink, Depends(get_metrics_sink)],
+        stream_metrics: Annotated[StreamMetrics, Depends(StreamMetrics)],
     ):
         self._model = model
         self._prompt_loader = prompt_loader
@@ -47,6 +57,9 @@ class CodingAgent:
         self._initial_code_generator = initial_code_generator
         self._code_writer_service = code_writer_service
         self._settings = settings
+        self._metrics_sink = metrics_sink
+        self._stream_metrics = stream_metrics
+        self._graph: Optional[CompiledStateGraph] = None
 
     async def _detect_language_node(self, state: CodeHealingState) -> dict[str, Language]:
         response: Dict[str, Language] = await self._language_detector.detect_language(state)
@@ -175,15 +188,79 @@ class CodingAgent:
 
         return graph
 
+    def compiled_graph(self) -> CompiledStateGraph:
+        # Compiled once and reused; all per-request state travels through the graph input and config
+        if self._graph is None:
+            self._graph = self._build_graph().compile()
+        return self._graph
+
     async def code_stream(self, task_description: str) -> AsyncGenerator[str, None]:
-        graph = self._build_graph().compile()
+        graph = self.compiled_graph()
         initial_state = CodeHealingState(task_description=task_description)
+        final_state = initial_state.model_dump()
+        usage = UsageCollector()
+        started_at = datetime.utcnow()
 
         logger.info("Starting LangGraph streaming execution...")
 
-        async for event in graph.astream(initial_state.model_dump(), stream_mode=["updates"]):  # type: ignore[arg-type]
-            async for sse_chunk in self._event_processor.process_graph_event(event):  # type: ignore[arg-type]
-                yield sse_chunk
+        try:
+            async for event in graph.astream(
+                initial_state.model_dump(),  # type: ignore[arg-type]
+                stream_mode=["updates"],
+                config={"callbacks": [usage]},
+            ):
+                # With a list of stream modes each event is a (mode, {node: updates}) tuple
+                step = cast(tuple[str, Dict[str, Any]], event)
+                for updates in step[1].values():
+                    final_state.update(updates or {})
+                async for sse_chunk in self._event_processor.process_graph_event(step):
+                    yield sse_chunk
+        finally:
+            self._record_execution(final_state, usage, started_at)
+
+    def _record_execution(self, final_state: dict[str, Any], usage: UsageCollector, started_at: datetime) -> None:
+        completed_at = datetime.utcnow()
+        duration_seconds = (completed_at - started_at).total_seconds()
+        finalized = "final_code" in final_state
+        status = "success" if final_state["success"] else "failure" if finalized else "error"
+        language = final_state["language"]
+        session_id = uuid.uuid4().hex
+        cost = self._stream_metrics.calculate_cost(usage.prompt_tokens, usage.completion_tokens)
+        nodes = usage.node_breakdown(self._stream_metrics.calculate_cost)
+
+        self._metrics_sink.record(
+            endpoint="coding_agent",
+            session_id=session_id,
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            cost=cost,
+            latency_ms=duration_seconds * 1000,
+            metadata={"status": status, "nodes": nodes},
+        )
+        self._metrics_sink.record_agent_execution(
+            {
+                "session_id": session_id,
+                "task_description": final_state["task_description"],
+                "language": getattr(language, "value", language),
+                "status": status,
+                "attempts": final_state.get("attempts", final_state["attempt_number"] + 1),
+                "working_directory": final_state["working_directory"] or None,
+                "started_at": started_at,
+                "completed_at": completed_at,
+                "duration_seconds": duration_seconds,
+                "failure_reason": None if status == "success" else "tests_failed" if finalized else "interrupted",
+                "final_code_length": len(final_state["current_code"] or ""),
+                "test_output": final_state["test_output"],
+                "total_tokens": usage.total_tokens,
+                "total_cost": cost,
+                "execution_metadata": {
+                    "prompt_tokens": usage.prompt_tokens,
+                    "completion_tokens": usage.completion_tokens,
+                    "nodes": nodes,
+                },
+                "created_at": completed_at,
+            }
+        )
 
     async def _fix_code(self, state: CodeHealingState) -> CodeHealingState:
         logger.info("Fixing code based on errors...")
@@ -239,3 +316,29 @@ class CodingAgent:
             output_parts.append(f"STDOUT:\n{stdout}")
 
         return "\n\n".join(output_parts) if output_parts else "No output captured"
+
+
+def build_coding_agent(settings: Settings, metrics_sink: MetricsSink, registry: ResourceRegistry) -> CodingAgent:
+    model = Model(settings, registry)
+    code_writer = CodeWriterTool()
+    return CodingAgent(
+        model=model,
+        prompt_loader=prompt_loader,
+        code_writer=code_writer,
+        code_tester=CodeTesterTool(),
+        event_processor=CodeHealingEventProcessor(),
+        language_detector=LanguageDetector(model, prompt_loader, settings),
+        initial_code_generator=InitialCodeGenerator(model, prompt_loader, settings),
+        code_writer_service=CodeWriterService(code_writer, settings),
+        settings=settings,
+        metrics_sink=metrics_sink,
+        stream_metrics=StreamMetrics(settings),
+    )
+
+
+def get_coding_agent(
+    settings: Annotated[Settings, Depends(get_cached_settings)],
+    metrics_sink: Annotated[MetricsSink, Depends(get_metrics_sink)],
+    registry: Annotated[ResourceRegistry, Depends(get_resource_registry)],
+) -> CodingAgent:
+    return registry.get_or_create("agent.coding", lambda: build_coding_agent(settings, metrics_sink, registry))
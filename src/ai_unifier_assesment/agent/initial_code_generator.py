@@ -5,7 +5,7 @@ from fastapi import Depends
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from ai_unifier_assesment.agent.state import CodeHealingState
-from ai_unifier_assesment.dependencies import get_settings
+from ai_unifier_assesment.dependencies import get_cached_settings
 from ai_unifier_assesment.large_language_model.model import Model
 from ai_unifier_assesment.resources.prompts.prompt_loader import PromptLoader
 
@@ -17,7 +17,7 @@ class InitialCodeGenerator:
         self,
         model: Annotated[Model, Depends(Model)],
         prompt_loader: Annotated[PromptLoader, Depends(PromptLoader)],
-        settings: Annotated[object, Depends(get_settings)],
+        settings: Annotated[object, Depends(get_cached_settings)],
     ):
         self._model = model
         self._prompt_loader = prompt_loader
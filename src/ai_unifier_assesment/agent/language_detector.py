@@ -8,7 +8,7 @@ from pydantic import BaseModel, Field
 
 from ai_unifier_assesment.agent.language import Language
 from ai_unifier_assesment.agent.state import CodeHealingState
-from ai_unifier_assesment.dependencies import get_settings
+from ai_unifier_assesment.dependencies import get_cached_settings
 from ai_unifier_assesment.large_language_model.model import Model
 from ai_unifier_assesment.resources.prompts.prompt_loader import PromptLoader
 
@@ -24,7 +24,7 @@ class LanguageDetector:
         self,
         model: Annotated[Model, Depends(Model)],
         prompt_loader: Annotated[PromptLoader, Depends(PromptLoader)],
-        settings: Annotated[object, Depends(get_settings)],
+        settings: Annotated[object, Depends(get_cached_settings)],
     ):
         self._model: Runnable[Any, Any] = model.simple_model().with_structured_output(DetectedLanguage)
         self._prompt_loader = prompt_loader
@@ -1,18 +1,23 @@
 import logging
-from typing import Annotated, Any
+from typing import Annotated, Any, Optional
 
 from fastapi import Depends
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.runnables import Runnable
 from langchain_core.tools import StructuredTool
 from langgraph.graph import END, StateGraph
+from langgraph.graph.state import CompiledStateGraph
 from langgraph.prebuilt import ToolNode
 
 from ai_unifier_assesment.agent.state import TripItinerary, TripPlannerState
 from ai_unifier_assesment.agent.tools.attractions_tool import AttractionsInput, AttractionsTool
 from ai_unifier_assesment.agent.tools.flight_tool import FlightSearchInput, FlightTool
 from ai_unifier_assesment.agent.tools.weather_tool import WeatherInput, WeatherTool
+from ai_unifier_assesment.config import Settings
+from ai_unifier_assesment.dependencies import get_cached_settings, get_resource_registry
 from ai_unifier_assesment.large_language_model.model import Model
+from ai_unifier_assesment.resource_registry import ResourceRegistry
 from ai_unifier_assesment.resources.prompts.prompt_loader import prompt_loader
 
 logger = logging.getLogger(__name__)
@@ -37,6 +42,7 @@ class TripPlannerAgent:
             self._model.get_chat_model_for_evaluation().with_structured_output(TripItinerary)
         )
         self._itinerary_prompt = prompt_loader.load("trip_planner_itinerary")
+        self._graph: Optional[CompiledStateGraph] = None
 
     def _create_tools(self) -> list[StructuredTool]:
         return [
@@ -129,8 +135,14 @@ class TripPlannerAgent:
 
         return graph
 
-    async def plan_trip(self, user_prompt: str) -> dict:
-        graph = self._build_graph().compile()
+    def compiled_graph(self) -> CompiledStateGraph:
+        # Compiled once and reused; all per-request state travels through the graph input and config
+        if self._graph is None:
+            self._graph = self._build_graph().compile()
+        return self._graph
+
+    async def plan_trip(self, user_prompt: str, callbacks: Optional[list[BaseCallbackHandler]] = None) -> dict:
+        graph = self.compiled_graph()
         system_prompt = prompt_loader.load("trip_planner_system")
 
         initial_state: dict = {
@@ -140,9 +152,20 @@ class TripPlannerAgent:
             ],
         }
 
-        result = await graph.ainvoke(initial_state)  # type: ignore[arg-type]
+        result = await graph.ainvoke(initial_state, config={"callbacks": callbacks or []})  # type: ignore[arg-type]
 
         itinerary = result.get("itinerary")
         return {
             "itinerary": itinerary.model_dump() if itinerary else None,
         }
+
+
+def build_trip_planner_agent(settings: Settings, registry: ResourceRegistry) -> TripPlannerAgent:
+    return TripPlannerAgent(Model(settings, registry), FlightTool(), WeatherTool(), AttractionsTool())
+
+
+def get_trip_planner_agent(
+    settings: Annotated[Settings, Depends(get_cached_settings)],
+    registry: Annotated[ResourceRegistry, Depends(get_resource_registry)],
+) -> TripPlannerAgent:
+    return registry.get_or_create("agent.trip_planner", lambda: build_trip_planner_agent(settings, registry))
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Benchmark script for per-request agent setup cost.
+Compares building and compiling the LangGraph agents on every request with
+reusing the process-wide instances created at startup.
+
+Usage:
+    python -m ai_unifier_assesment.agent_setup_benchmark
+    python -m ai_unifier_assesment.agent_setup_benchmark --iterations 200
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict
+
+from sqlalchemy.orm import Session
+
+from ai_unifier_assesment.agent.coding_agent import build_coding_agent, get_coding_agent
+from ai_unifier_assesment.agent.trip_planner_agent import build_trip_planner_agent, get_trip_planner_agent
+from ai_unifier_assesment.dependencies import get_cached_settings
+from ai_unifier_assesment.resource_registry import ResourceRegistry
+from ai_unifier_assesment.services.metrics_sink import MetricsSink
+
+logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def _time_ms(setup: Callable[[], Any], iterations: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        setup()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.mean(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def _no_database() -> Session:
+    raise RuntimeError("The agent setup benchmark does not persist metrics")
+
+
+def run_benchmark(iterations: int = 50) -> Dict[str, Any]:
+    settings = get_cached_settings()
+    registry = ResourceRegistry()
+    # Agents are only built, never run, so the sink is never started and needs no database
+    metrics_sink = MetricsSink(_no_database, settings.metrics_sink)
+
+    # Per-request variants still share the LLM clients, so only agent construction and compilation are timed
+    def trip_planner_per_request() -> None:
+        build_trip_planner_agent(settings, registry).compiled_graph()
+
+    def coding_agent_per_request() -> None:
+        build_coding_agent(settings, metrics_sink, registry).compiled_graph()
+
+    def trip_planner_shared() -> None:
+        get_trip_planner_agent(settings, registry).compiled_graph()
+
+    def coding_agent_shared() -> None:
+        get_coding_agent(settings, metrics_sink, registry).compiled_graph()
+
+    return {
+        "iterations": iterations,
+        "trip_planner": {
+            "per_request": _time_ms(trip_planner_per_request, iterations),
+            "shared": _time_ms(trip_planner_shared, iterations),
+        },
+        "coding_agent": {
+            "per_request": _time_ms(coding_agent_per_request, iterations),
+            "shared": _time_ms(coding_agent_shared, iterations),
+        },
+    }
+
+
+def _print_report(results: Dict[str, Any]) -> None:
+    print("\n" + "=" * 60)
+    print("AGENT SETUP BENCHMARK REPORT")
+    print("=" * 60)
+    print(f"Iterations: {results['iterations']}")
+    for agent in ("trip_planner", "coding_agent"):
+        before = results[agent]["per_request"]["median_ms"]
+        after = results[agent]["shared"]["median_ms"]
+        print(f"{agent}: per-request setup {before} ms -> shared {after} ms (median)")
+    print("=" * 60 + "\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure per-request agent setup cost")
+    parser.add_argument("--iterations", type=int, default=50, help="Setups timed per variant (default: 50)")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        results = run_benchmark(iterations=args.iterations)
+        if args.json:
+            print(json.dumps(results, indent=2))
+        else:
+            _print_report(results)
+        return 0
+    except Exception as e:
+        logger.error(f"Benchmark failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
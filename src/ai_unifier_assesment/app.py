@@ -5,7 +5,18 @@ import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from ai_unifier_assesment.dependencies import get_cached_settings
+from ai_unifier_assesment.agent.coding_agent import get_coding_agent
+from ai_unifier_assesment.agent.trip_planner_agent import get_trip_planner_agent
+from ai_unifier_assesment.config import Settings
+from ai_unifier_assesment.db.session import get_engine, get_session_factory
+from ai_unifier_assesment.dependencies import get_cached_settings, get_resource_registry
+from ai_unifier_assesment.large_language_model.model import Model
+from ai_unifier_assesment.rag.embedding_service import EmbeddingService
+from ai_unifier_assesment.rag.qa_service import QA_MODEL, QAService
+from ai_unifier_assesment.rag.vector_store_service import VectorStoreService
+from ai_unifier_assesment.resource_registry import ResourceRegistry
+from ai_unifier_assesment.services.metrics_sink import get_metrics_sink
+from ai_unifier_assesment.services.stream_metrics import encoding_registry
 from ai_unifier_assesment.routes.agent import router as agent_router
 from ai_unifier_assesment.routes.chat import router as chat_router
 from ai_unifier_assesment.routes.coding_agent import router as coding_agent_router
@@ -13,11 +24,41 @@ from ai_unifier_assesment.routes.metrics_routes import router as metrics_router
 from ai_unifier_assesment.routes.rag import router as rag_router
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def _warm_up_resources(settings: Settings, registry: ResourceRegistry) -> None:
+    model = Model(settings, registry)
+    model.stream_model()
+    model.simple_model()
+    model.get_chat_model_for_evaluation()
+    get_engine(settings, registry)
+    if settings.tokenizer.warm_up:
+        encoding_registry.warm_up([settings.openai.model_name, QA_MODEL])
+
+    embedding_service = EmbeddingService(settings, registry)
+    embedding_service.get_embeddings()
+    vector_store_service = VectorStoreService(settings, embedding_service, registry)
+    QAService(settings, vector_store_service, registry).get_llm()
+    try:
+        vector_store_service.get_client()
+    except ConnectionError as e:
+        # ChromaDB may still be starting; the client is created lazily on first use instead
+        logger.warning(f"Deferring ChromaDB client creation: {e}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    settings = get_cached_settings()
+    registry = get_resource_registry()
+    _warm_up_resources(settings, registry)
+    session_factory = get_session_factory(get_engine(settings, registry), registry)
+    metrics_sink = get_metrics_sink(settings, session_factory, registry)
+    metrics_sink.start()
+    get_trip_planner_agent(settings, registry).compiled_graph()
+    get_coding_agent(settings, metrics_sink, registry).compiled_graph()
     yield
+    await registry.aclose()
 
 
 app = FastAPI(lifespan=lifespan)
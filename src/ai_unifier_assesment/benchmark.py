@@ -70,13 +70,29 @@ def _print_summary_report(results: Dict[str, Any], k: int) -> None:
     print("-" * 60)
 
     if results["meets_latency_requirement"]:
-        print("✓ PASS: Meets ≤300ms median retrieval time requirement")
+        print(f"✓ PASS: Meets ≤{results['latency_target_ms']}ms median retrieval time requirement")
     else:
-        print("✗ FAIL: Does NOT meet ≤300ms median retrieval time requirement")
+        print(f"✗ FAIL: Does NOT meet ≤{results['latency_target_ms']}ms median retrieval time requirement")
+
+    if "quantization" in results:
+        _print_quantization_report(results["quantization"], k)
 
     print("=" * 60 + "\n")
 
 
+def _print_quantization_report(quantization: Dict[str, Any], k: int) -> None:
+    print("-" * 60)
+    print(
+        f"Quantization: {quantization['mode']} "
+        f"({quantization['memory_reduction']}x smaller scan, top {quantization['rescored']} re-scored exactly)"
+    )
+    print(f"Top-{k} Recall vs Exact Search: {quantization['recall_at_k'] * 100:.2f}%")
+    print(
+        f"Top-{k} Accuracy: {quantization['quantized_accuracy_percent']}% quantized vs "
+        f"{quantization['exact_accuracy_percent']}% exact ({quantization['accuracy_loss_percent']} points lost)"
+    )
+
+
 def _print_detailed_results(results: Dict[str, Any]) -> None:
     print("Detailed Results:")
     print("-" * 60)
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -21,6 +23,20 @@ class PricingConfig(BaseModel):
 class OllamaConfig(BaseModel):
     base_url: str
     embedding_model: str
+    embed_concurrency: int
+
+
+class EmbeddingCacheConfig(BaseModel):
+    max_entries: int
+    sqlite_path: str
+    sqlite_max_entries: int
+
+
+class AnswerCacheConfig(BaseModel):
+    threshold: float
+    max_entries: int
+    collection_version_ttl_seconds: float
+    retrieval_max_entries: int
 
 
 class ChromaConfig(BaseModel):
@@ -32,6 +48,26 @@ class ChromaConfig(BaseModel):
 class RAGConfig(BaseModel):
     chunk_size: int
     chunk_overlap: int
+    vector_backend: Literal["chroma", "local"]
+    index_dir: str
+    index_nprobe: int
+    index_quantization: Literal["none", "int8", "binary"]
+    hybrid_search: bool
+    rrf_k: int
+    context_token_budget: int
+
+
+class IngestionConfig(BaseModel):
+    workers: int
+    embed_batch_size: int
+    embed_min_batch_size: int
+    embed_max_batch_size: int
+    embed_concurrency: int
+    embed_target_batch_seconds: float
+    embed_max_retries: int
+    embed_retry_backoff_seconds: float
+    upsert_batch_size: int
+    manifest_path: str
 
 
 class PostgresConfig(BaseModel):
@@ -52,6 +88,35 @@ class PostgresConfig(BaseModel):
         return f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
 
 
+class DatabasePoolConfig(BaseModel):
+    pool_size: int
+    max_overflow: int
+    pool_recycle_seconds: int
+    pool_timeout_seconds: float
+    statement_timeout_ms: int
+
+
+class ChatHistoryPoolConfig(BaseModel):
+    min_size: int
+    max_size: int
+
+
+class SessionCacheConfig(BaseModel):
+    max_sessions: int
+    ttl_seconds: float
+
+
+class TokenizerConfig(BaseModel):
+    warm_up: bool
+    num_threads: int
+
+
+class MetricsSinkConfig(BaseModel):
+    batch_size: int
+    flush_interval_seconds: float
+    max_queue_size: int
+
+
 class EvaluationConfig(BaseModel):
     test_size: int
     llm_model: str
@@ -74,16 +139,55 @@ class Settings(BaseSettings):
     memory_window_size: int = Field(default=5, alias="MEMORY_WINDOW_SIZE")
     ollama_base_url: str = Field(default="http://localhost:11434", alias="OLLAMA_BASE_URL")
     ollama_embedding_model: str = Field(default="nomic-embed-text", alias="OLLAMA_EMBEDDING_MODEL")
+    ollama_embed_concurrency: int = Field(default=8, alias="OLLAMA_EMBED_CONCURRENCY")
+    embedding_cache_max_entries: int = Field(default=4096, alias="EMBEDDING_CACHE_MAX_ENTRIES")
+    embedding_cache_sqlite_path: str = Field(default="", alias="EMBEDDING_CACHE_SQLITE_PATH")
+    embedding_cache_sqlite_max_entries: int = Field(default=100000, alias="EMBEDDING_CACHE_SQLITE_MAX_ENTRIES")
     chroma_host: str = Field(default="localhost", alias="CHROMA_HOST")
     chroma_port: int = Field(default=8000, alias="CHROMA_PORT")
     chroma_collection_name: str = Field(default="rag_corpus", alias="CHROMA_COLLECTION_NAME")
     rag_chunk_size: int = Field(default=500, alias="RAG_CHUNK_SIZE")
     rag_chunk_overlap: int = Field(default=100, alias="RAG_CHUNK_OVERLAP")
+    rag_vector_backend: Literal["chroma", "local"] = Field(default="chroma", alias="RAG_VECTOR_BACKEND")
+    rag_index_dir: str = Field(default="data/index", alias="RAG_INDEX_DIR")
+    rag_index_nprobe: int = Field(default=8, alias="RAG_INDEX_NPROBE")
+    rag_index_quantization: Literal["none", "int8", "binary"] = Field(default="int8", alias="RAG_INDEX_QUANTIZATION")
+    rag_hybrid_search: bool = Field(default=True, alias="RAG_HYBRID_SEARCH")
+    rag_rrf_k: int = Field(default=60, alias="RAG_RRF_K")
+    rag_context_token_budget: int = Field(default=1500, alias="RAG_CONTEXT_TOKEN_BUDGET")
+    ingest_workers: int = Field(default=4, alias="INGEST_WORKERS")
+    ingest_embed_batch_size: int = Field(default=32, alias="INGEST_EMBED_BATCH_SIZE")
+    ingest_embed_min_batch_size: int = Field(default=8, alias="INGEST_EMBED_MIN_BATCH_SIZE")
+    ingest_embed_max_batch_size: int = Field(default=256, alias="INGEST_EMBED_MAX_BATCH_SIZE")
+    ingest_embed_concurrency: int = Field(default=4, alias="INGEST_EMBED_CONCURRENCY")
+    ingest_embed_target_batch_seconds: float = Field(default=2.0, alias="INGEST_EMBED_TARGET_BATCH_SECONDS")
+    ingest_embed_max_retries: int = Field(default=3, alias="INGEST_EMBED_MAX_RETRIES")
+    ingest_embed_retry_backoff_seconds: float = Field(default=0.5, alias="INGEST_EMBED_RETRY_BACKOFF_SECONDS")
+    ingest_upsert_batch_size: int = Field(default=256, alias="INGEST_UPSERT_BATCH_SIZE")
+    ingest_manifest_path: str = Field(default="data/ingest_manifest.json", alias="INGEST_MANIFEST_PATH")
+    rag_answer_cache_threshold: float = Field(default=0.95, alias="RAG_ANSWER_CACHE_THRESHOLD")
+    rag_answer_cache_max_entries: int = Field(default=512, alias="RAG_ANSWER_CACHE_MAX_ENTRIES")
+    rag_collection_version_ttl_seconds: float = Field(default=30.0, alias="RAG_COLLECTION_VERSION_TTL_SECONDS")
+    rag_retrieval_cache_max_entries: int = Field(default=1024, alias="RAG_RETRIEVAL_CACHE_MAX_ENTRIES")
     postgres_host: str = Field(default="localhost", alias="POSTGRES_HOST")
     postgres_port: int = Field(default=5432, alias="POSTGRES_PORT")
     postgres_user: str = Field(default="rag_user", alias="POSTGRES_USER")
     postgres_password: str = Field(default="rag_password", alias="POSTGRES_PASSWORD")
     postgres_database: str = Field(default="rag_evaluation", alias="POSTGRES_DB")
+    postgres_pool_size: int = Field(default=5, alias="POSTGRES_POOL_SIZE")
+    postgres_max_overflow: int = Field(default=10, alias="POSTGRES_MAX_OVERFLOW")
+    postgres_pool_recycle_seconds: int = Field(default=1800, alias="POSTGRES_POOL_RECYCLE_SECONDS")
+    postgres_pool_timeout_seconds: float = Field(default=30.0, alias="POSTGRES_POOL_TIMEOUT_SECONDS")
+    postgres_statement_timeout_ms: int = Field(default=30000, alias="POSTGRES_STATEMENT_TIMEOUT_MS")
+    chat_history_pool_min_size: int = Field(default=1, alias="CHAT_HISTORY_POOL_MIN_SIZE")
+    chat_history_pool_max_size: int = Field(default=10, alias="CHAT_HISTORY_POOL_MAX_SIZE")
+    session_cache_max_sessions: int = Field(default=1000, alias="SESSION_CACHE_MAX_SESSIONS")
+    session_cache_ttl_seconds: float = Field(default=300.0, alias="SESSION_CACHE_TTL_SECONDS")
+    tokenizer_warm_up: bool = Field(default=False, alias="TOKENIZER_WARM_UP")
+    tokenizer_num_threads: int = Field(default=8, alias="TOKENIZER_NUM_THREADS")
+    metrics_sink_batch_size: int = Field(default=100, alias="METRICS_SINK_BATCH_SIZE")
+    metrics_sink_flush_interval_seconds: float = Field(default=1.0, alias="METRICS_SINK_FLUSH_INTERVAL_SECONDS")
+    metrics_sink_max_queue_size: int = Field(default=10000, alias="METRICS_SINK_MAX_QUEUE_SIZE")
     evaluation_test_size: int = Field(default=25, alias="EVALUATION_TEST_SIZE")
     evaluation_llm_model: str = Field(default="llama3.1:8b-instruct-q4_K_M", alias="EVALUATION_LLM_MODEL")
 
@@ -111,7 +215,28 @@ class Settings(BaseSettings):
 
     @property
     def ollama(self) -> OllamaConfig:
-        return OllamaConfig(base_url=self.ollama_base_url, embedding_model=self.ollama_embedding_model)
+        return OllamaConfig(
+            base_url=self.ollama_base_url,
+            embedding_model=self.ollama_embedding_model,
+            embed_concurrency=self.ollama_embed_concurrency,
+        )
+
+    @property
+    def answer_cache(self) -> AnswerCacheConfig:
+        return AnswerCacheConfig(
+            threshold=self.rag_answer_cache_threshold,
+            max_entries=self.rag_answer_cache_max_entries,
+            collection_version_ttl_seconds=self.rag_collection_version_ttl_seconds,
+            retrieval_max_entries=self.rag_retrieval_cache_max_entries,
+        )
+
+    @property
+    def embedding_cache(self) -> EmbeddingCacheConfig:
+        return EmbeddingCacheConfig(
+            max_entries=self.embedding_cache_max_entries,
+            sqlite_path=self.embedding_cache_sqlite_path,
+            sqlite_max_entries=self.embedding_cache_sqlite_max_entries,
+        )
 
     @property
     def chroma(self) -> ChromaConfig:
@@ -126,6 +251,28 @@ class Settings(BaseSettings):
         return RAGConfig(
             chunk_size=self.rag_chunk_size,
             chunk_overlap=self.rag_chunk_overlap,
+            vector_backend=self.rag_vector_backend,
+            index_dir=self.rag_index_dir,
+            index_nprobe=self.rag_index_nprobe,
+            index_quantization=self.rag_index_quantization,
+            hybrid_search=self.rag_hybrid_search,
+            rrf_k=self.rag_rrf_k,
+            context_token_budget=self.rag_context_token_budget,
+        )
+
+    @property
+    def ingestion(self) -> IngestionConfig:
+        return IngestionConfig(
+            workers=self.ingest_workers,
+            embed_batch_size=self.ingest_embed_batch_size,
+            embed_min_batch_size=self.ingest_embed_min_batch_size,
+            embed_max_batch_size=self.ingest_embed_max_batch_size,
+            embed_concurrency=self.ingest_embed_concurrency,
+            embed_target_batch_seconds=self.ingest_embed_target_batch_seconds,
+            embed_max_retries=self.ingest_embed_max_retries,
+            embed_retry_backoff_seconds=self.ingest_embed_retry_backoff_seconds,
+            upsert_batch_size=self.ingest_upsert_batch_size,
+            manifest_path=self.ingest_manifest_path,
         )
 
     @property
@@ -138,6 +285,45 @@ class Settings(BaseSettings):
             database=self.postgres_database,
         )
 
+    @property
+    def database_pool(self) -> DatabasePoolConfig:
+        return DatabasePoolConfig(
+            pool_size=self.postgres_pool_size,
+            max_overflow=self.postgres_max_overflow,
+            pool_recycle_seconds=self.postgres_pool_recycle_seconds,
+            pool_timeout_seconds=self.postgres_pool_timeout_seconds,
+            statement_timeout_ms=self.postgres_statement_timeout_ms,
+        )
+
+    @property
+    def chat_history_pool(self) -> ChatHistoryPoolConfig:
+        return ChatHistoryPoolConfig(
+            min_size=self.chat_history_pool_min_size,
+            max_size=self.chat_history_pool_max_size,
+        )
+
+    @property
+    def session_cache(self) -> SessionCacheConfig:
+        return SessionCacheConfig(
+            max_sessions=self.session_cache_max_sessions,
+            ttl_seconds=self.session_cache_ttl_seconds,
+        )
+
+    @property
+    def tokenizer(self) -> TokenizerConfig:
+        return TokenizerConfig(
+            warm_up=self.tokenizer_warm_up,
+            num_threads=self.tokenizer_num_threads,
+        )
+
+    @property
+    def metrics_sink(self) -> MetricsSinkConfig:
+        return MetricsSinkConfig(
+            batch_size=self.metrics_sink_batch_size,
+            flush_interval_seconds=self.metrics_sink_flush_interval_seconds,
+            max_queue_size=self.metrics_sink_max_queue_size,
+        )
+
     @property
     def evaluation(self) -> EvaluationConfig:
         return EvaluationConfig(
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""
+Prompt-size benchmark for context packing.
+Splits synthetic pages the way ingestion does and simulates retrievals that return
+neighbouring chunks of a page, then compares the context formatted verbatim, as QA
+did before packing, with the packed context, merged and fitted to the token budget.
+
+Usage:
+    python -m ai_unifier_assesment.context_packing_benchmark
+    python -m ai_unifier_assesment.context_packing_benchmark --k 8 --token-budget 1000 --json
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+from typing import Any, Dict
+
+import numpy as np
+from langchain_core.documents import Document
+
+from ai_unifier_assesment.rag.context_packer import pack_context
+from ai_unifier_assesment.rag.document_loader_service import DocumentLoaderService
+from ai_unifier_assesment.rag.qa_service import QA_MODEL
+from ai_unifier_assesment.services.stream_metrics import encoding_registry
+
+logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+WORDS = (
+    "frodo sam gandalf aragorn legolas gimli boromir merry pippin ring shire rivendell moria "
+    "lothlorien mordor orthanc road river mountain forest council journey shadow fire light"
+).split()
+
+
+def _page(rng: np.random.Generator, number: int, sentences: int = 40) -> Document:
+    text = " ".join(" ".join(rng.choice(WORDS, size=rng.integers(8, 20))).capitalize() + "." for _ in range(sentences))
+    return Document(page_content=text, metadata={"source": "corpus.pdf", "page": number})
+
+
+def _count_tokens(text: str) -> int:
+    return len(encoding_registry.get(QA_MODEL).encode(text, disallowed_special=()))
+
+
+def _verbatim(docs: list[Document]) -> str:
+    return "\n\n".join(
+        f"[Source {i + 1}: {doc.metadata.get('source', 'Unknown')}, Page {doc.metadata.get('page', 'N/A')}]\n"
+        f"{doc.page_content}"
+        for i, doc in enumerate(docs)
+    )
+
+
+def _retrieve(rng: np.random.Generator, pages: list[list[Document]], k: int, neighbours: int) -> list[Document]:
+    # Similar chunks tend to be neighbours on a page, whose edges repeat chunk_overlap characters
+    page = pages[rng.integers(len(pages))]
+    start = rng.integers(max(1, len(page) - neighbours + 1))
+    docs = page[start : start + neighbours]
+    others = [chunk for other in pages if other is not page for chunk in other]
+    picks = rng.choice(len(others), size=k - len(docs), replace=False)
+    docs = docs + [others[pick] for pick in picks]
+    return [docs[i] for i in rng.permutation(len(docs))]
+
+
+def run_benchmark(
+    queries: int = 50,
+    k: int = 5,
+    neighbours: int = 3,
+    token_budget: int = 1500,
+    chunk_size: int = 500,
+    chunk_overlap: int = 100,
+) -> Dict[str, Any]:
+    rng = np.random.default_rng(0)
+    splitter = DocumentLoaderService(chunk_size, chunk_overlap)
+    pages = [splitter.split_documents([_page(rng, number)]) for number in range(1, 21)]
+    variants: Dict[str, list[int]] = {"verbatim": [], "merged": [], "budgeted": []}
+    for _ in range(queries):
+        docs = _retrieve(rng, pages, k, min(neighbours, k))
+        variants["verbatim"].append(_count_tokens(_verbatim(docs)))
+        variants["merged"].append(_count_tokens(pack_context(docs, 0, _count_tokens)))
+        variants["budgeted"].append(_count_tokens(pack_context(docs, token_budget, _count_tokens)))
+    return {
+        "queries": queries,
+        "k": k,
+        "neighbours": neighbours,
+        "token_budget": token_budget,
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "tokens": {
+            name: {"median": statistics.median(counts), "max": max(counts)} for name, counts in variants.items()
+        },
+    }
+
+
+def _print_report(results: Dict[str, Any]) -> None:
+    tokens = results["tokens"]
+    before = tokens["verbatim"]["median"]
+    print("\n" + "=" * 60)
+    print("CONTEXT PACKING BENCHMARK REPORT")
+    print("=" * 60)
+    print(
+        f"k: {results['k']}, neighbouring chunks: {results['neighbours']}, "
+        f"chunk_size: {results['chunk_size']}, chunk_overlap: {results['chunk_overlap']}"
+    )
+    for name in ("verbatim", "merged", "budgeted"):
+        median = tokens[name]["median"]
+        saved = 100 * (before - median) / before if before else 0.0
+        print(f"{name}: {median} tokens median, {tokens[name]['max']} max ({saved:.1f}% fewer than verbatim)")
+    print(f"Token budget: {results['token_budget']}")
+    print("=" * 60 + "\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure prompt context size before and after packing")
+    parser.add_argument("--queries", type=int, default=50, help="Simulated retrievals (default: 50)")
+    parser.add_argument("--k", type=int, default=5, help="Chunks retrieved per query (default: 5)")
+    parser.add_argument("--neighbours", type=int, default=3, help="Adjacent chunks of one page per query (default: 3)")
+    parser.add_argument("--token-budget", type=int, default=1500, help="Context token budget (default: 1500)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Splitter chunk size (default: 500)")
+    parser.add_argument("--chunk-overlap", type=int, default=100, help="Splitter chunk overlap (default: 100)")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        results = run_benchmark(
+            queries=args.queries,
+            k=args.k,
+            neighbours=args.neighbours,
+            token_budget=args.token_budget,
+            chunk_size=args.chunk_size,
+            chunk_overlap=args.chunk_overlap,
+        )
+        if args.json:
+            print(json.dumps(results, indent=2))
+        else:
+            _print_report(results)
+        return 0
+    except Exception as e:
+        logger.error(f"Benchmark failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,47 @@
 from typing import Annotated, Generator
 
 from fastapi import Depends
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
-from ai_unifier_assesment.config import Settings, get_settings
+from ai_unifier_assesment.config import Settings
+from ai_unifier_assesment.dependencies import get_cached_settings, get_resource_registry
+from ai_unifier_assesment.resource_registry import ResourceRegistry
 
 
-def get_engine(settings: Annotated[Settings, Depends(get_settings)]):
-    return create_engine(settings.postgres.connection_string, pool_pre_ping=True)
+def create_pooled_engine(settings: Settings) -> Engine:
+    pool = settings.database_pool
+    connect_args = {}
+    if pool.statement_timeout_ms > 0:
+        connect_args["options"] = f"-c statement_timeout={pool.statement_timeout_ms}"
 
+    return create_engine(
+        settings.postgres.connection_string,
+        pool_pre_ping=True,
+        pool_size=pool.pool_size,
+        max_overflow=pool.max_overflow,
+        pool_recycle=pool.pool_recycle_seconds,
+        pool_timeout=pool.pool_timeout_seconds,
+        connect_args=connect_args,
+    )
 
-def get_session_factory(engine=Depends(get_engine)):
-    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def get_engine(
+    settings: Annotated[Settings, Depends(get_cached_settings)],
+    registry: Annotated[ResourceRegistry, Depends(get_resource_registry)],
+) -> Engine:
+    return registry.get_or_create("db.engine", lambda: create_pooled_engine(settings))
+
+
+def get_session_factory(
+    engine: Annotated[Engine, Depends(get_engine)],
+    registry: Annotated[ResourceRegistry, Depends(get_resource_registry)],
+) -> sessionmaker[Session]:
+    return registry.get_or_create(
+        "db.session_factory",
+        lambda: sessionmaker(autocommit=False, autoflush=False, bind=engine),
+    )
 
 
 def get_db_session(session_factory=Depends(get_session_factory)) -> Generator[Session, None, None]:
@@ -25,3 +54,21 @@ def get_db_session(session_factory=Depends(get_session_factory)) -> Generator[Se
         raise
     finally:
         session.close()
+
+
+def get_pool_stats(engine: Engine, max_overflow: int) -> dict:
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool_class": type(pool).__name__}
+
+    capacity = pool.size() + max(max_overflow, 0)
+    checked_out = pool.checkedout()
+    return {
+        "pool_class": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": checked_out,
+        "overflow": pool.overflow(),
+        "capacity": capacity,
+        "utilisation": round(checked_out / capacity, 4) if capacity else 0.0,
+    }
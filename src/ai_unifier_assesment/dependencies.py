@@ -1,8 +1,14 @@
 from functools import lru_cache
 
 from ai_unifier_assesment.config import Settings, get_settings
+from ai_unifier_assesment.resource_registry import ResourceRegistry
 
 
 @lru_cache
 def get_cached_settings() -> Settings:
     return get_settings()
+
+
+@lru_cache
+def get_resource_registry() -> ResourceRegistry:
+    return ResourceRegistry()
@@ -16,6 +16,11 @@ from ai_unifier_assesment.evaluation.models import (
 )
 from ai_unifier_assesment.rag.vector_store_service import VectorStoreService
 
+# Median retrieval time the benchmark must meet, warm caches and LLM latency excluded
+RETRIEVAL_LATENCY_TARGET_MS = 20
+# Quantized candidates re-scored exactly, matching the retrievers' default fetch_k
+QUANTIZATION_RESCORE = 20
+
 
 class BenchmarkService:
     def __init__(
@@ -38,7 +43,46 @@ class BenchmarkService:
         retriever = self._vector_store_service.get_retriever(self._settings.chroma.collection_name, k=k)
         results, retrieval_times, hits = self._evaluate_questions(questions, retriever)
 
-        return self._build_benchmark_result(k, len(questions), hits, retrieval_times, results)
+        benchmark = self._build_benchmark_result(k, len(questions), hits, retrieval_times, results)
+        if self._settings.rag.vector_backend == "local":
+            quantization = self._evaluate_quantization(questions, k)
+            if quantization:
+                benchmark["quantization"] = quantization
+        return benchmark
+
+    def _evaluate_quantization(self, questions: list, k: int) -> Dict[str, Any]:
+        """Compare the local index's quantized top-k with an exact float32 search of the same lists."""
+        index = self._vector_store_service.get_local_index(self._settings.chroma.collection_name)
+        if index.quantization == "none":
+            return {}
+
+        embeddings = self._vector_store_service.get_embeddings()
+        nprobe = self._settings.rag.index_nprobe
+        overlap = exact_hits = quantized_hits = 0
+        for q in questions:
+            embedding = embeddings.embed_query(q.question)
+            exact_rows, _ = index.search(embedding, k, nprobe, exact=True)
+            rows, _ = index.search(embedding, k, nprobe, rescore=QUANTIZATION_RESCORE)
+            overlap += len(set(exact_rows.tolist()) & set(rows.tolist()))
+            exact_docs = index.documents(exact_rows)
+            quantized_docs = index.documents(rows)
+            exact_hits += self._check_hit(q.ground_truth_contexts, [doc.page_content for doc in exact_docs])
+            quantized_hits += self._check_hit(q.ground_truth_contexts, [doc.page_content for doc in quantized_docs])
+
+        total = len(questions)
+        exact_accuracy = round((exact_hits / total) * 100, 2)
+        quantized_accuracy = round((quantized_hits / total) * 100, 2)
+        return {
+            "mode": index.quantization,
+            "rescored": QUANTIZATION_RESCORE,
+            "vector_bytes": index.vector_bytes,
+            "scanned_bytes": index.scanned_bytes,
+            "memory_reduction": round(index.vector_bytes / index.scanned_bytes, 1) if index.scanned_bytes else 0,
+            "recall_at_k": round(overlap / (total * k), 4),
+            "exact_accuracy_percent": exact_accuracy,
+            "quantized_accuracy_percent": quantized_accuracy,
+            "accuracy_loss_percent": round(exact_accuracy - quantized_accuracy, 2),
+        }
 
     def _evaluate_questions(self, questions: list, retriever) -> tuple[list, list[float], int]:
         retrieval_times: list[float] = []
@@ -84,7 +128,8 @@ class BenchmarkService:
             "avg_retrieval_time_ms": round(avg_time, 2),
             "min_retrieval_time_ms": round(min(times), 2) if times else 0,
             "max_retrieval_time_ms": round(max(times), 2) if times else 0,
-            "meets_latency_requirement": median_time <= 300,
+            "latency_target_ms": RETRIEVAL_LATENCY_TARGET_MS,
+            "meets_latency_requirement": median_time <= RETRIEVAL_LATENCY_TARGET_MS,
             "details": details,
         }
 
@@ -5,7 +5,7 @@ Run this script BEFORE starting the server to index documents.
 
 Usage:
     python -m ai_unifier_assesment.ingest --pdf path/to/file.pdf
-    python -m ai_unifier_assesment.ingest --directory path/to/pdfs/
+    python -m ai_unifier_assesment.ingest --directory path/to/pdfs/ [--force]
     python -m ai_unifier_assesment.ingest --stats
 """
 
@@ -51,27 +51,37 @@ def ingest_pdf(file_path: str) -> None:
     logger.info(f"Collection: {collection_name}")
 
 
-def ingest_directory(directory_path: str) -> None:
+def ingest_directory(directory_path: str, force: bool = False) -> None:
     settings = get_settings()
     service = create_ingestion_service()
     collection_name = settings.chroma.collection_name
-
-    # Check if collection already has documents
-    stats = service.get_collection_stats(collection_name)
-    if stats["document_count"] > 0:
-        logger.info(
-            f"Collection '{collection_name}' already has {stats['document_count']} documents, skipping ingestion"
-        )
-        return
+    ingestion = settings.ingestion
 
     logger.info(f"Ingesting directory: {directory_path}")
     logger.info(f"Chunk size: {settings.rag.chunk_size}, Overlap: {settings.rag.chunk_overlap}")
+    logger.info(
+        f"Workers: {ingestion.workers}, embed batch: {ingestion.embed_batch_size} "
+        f"({ingestion.embed_min_batch_size}-{ingestion.embed_max_batch_size}) x {ingestion.embed_concurrency}, "
+        f"upsert batch: {ingestion.upsert_batch_size}, manifest: {ingestion.manifest_path}"
+    )
 
-    start_time = time.time()
-    chunk_count = service.ingest_directory(directory_path, collection_name)
-    elapsed = time.time() - start_time
+    report = service.ingest_directory_pipelined(directory_path, collection_name, force=force)
 
-    logger.info(f"Ingested {chunk_count} chunks in {elapsed:.2f}s")
+    logger.info(
+        f"Ingested {report.chunks} chunks from {report.files} files in {report.elapsed_seconds:.2f}s "
+        f"({report.chunks_per_second:.1f} chunks/s)"
+    )
+    embedding = report.embedding
+    if embedding.get("batches"):
+        logger.info(
+            f"Embedded {embedding['batches']} batches at {embedding['chunks_per_second']} chunks/s, "
+            f"{embedding['tokens_per_second']} tokens/s (final batch size {embedding['batch_size']}, "
+            f"{embedding['retries']} retries)"
+        )
+    logger.info(
+        f"Reused {report.reused_chunks} stored chunks, deleted {report.deleted_chunks} stale chunks, "
+        f"skipped {report.skipped_files} unchanged files"
+    )
     logger.info(f"Collection: {collection_name}")
 
 
@@ -89,6 +99,7 @@ def main() -> int:
     parser.add_argument("--pdf", type=str, help="Path to PDF file to ingest")
     parser.add_argument("--directory", type=str, help="Path to directory containing PDFs")
     parser.add_argument("--stats", action="store_true", help="Show collection statistics")
+    parser.add_argument("--force", action="store_true", help="Re-embed every chunk, even unchanged ones")
 
     args = parser.parse_args()
 
@@ -102,7 +113,7 @@ def main() -> int:
             return 0
 
         if args.directory:
-            ingest_directory(args.directory)
+            ingest_directory(args.directory, force=args.force)
             return 0
 
         parser.print_help()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+"""
+Benchmark script for ingestion memory.
+Compares peak memory of loading and splitting a whole directory into lists with
+streaming chunks page by page, over synthetic PDF corpora of increasing size.
+
+Usage:
+    python -m ai_unifier_assesment.ingestion_memory_benchmark
+    python -m ai_unifier_assesment.ingestion_memory_benchmark --files 8 --pages 50 --scales 1 2 4 8
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict
+
+from ai_unifier_assesment.rag.document_loader_service import DocumentLoaderService
+
+logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+WORDS = ["ring", "shire", "hobbit", "wizard", "mountain", "river", "forest", "road", "king", "shadow", "light", "elf"]
+LINES_PER_PAGE = 60
+
+
+def write_pdf(path: Path, pages: int, seed: int) -> None:
+    """Write a plain-text PDF with ``pages`` pages of pseudo-random words."""
+    rng = random.Random(seed)
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_refs = []
+    for _ in range(pages):
+        lines = [" ".join(rng.choices(WORDS, k=12)) for _ in range(LINES_PER_PAGE)]
+        text = "".join(f"({line}) '\n" for line in lines)
+        stream = f"BT /F1 10 Tf 12 TL 40 800 Td\n{text}ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> "
+            b"/Contents %d 0 R >>" % content_ref
+        )
+        page_refs.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {pages} >>".encode("latin-1")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(output))
+
+
+def write_corpus(directory: Path, files: int, pages: int) -> int:
+    for f in range(files):
+        write_pdf(directory / f"synthetic_{f:03d}.pdf", pages, seed=f)
+    return sum(path.stat().st_size for path in directory.glob("*.pdf"))
+
+
+def _measure(mode: str, directory: str) -> Dict[str, Any]:
+    # Runs in a fresh process so the RSS high-water mark belongs to this measurement alone
+    loader = DocumentLoaderService()
+    tracemalloc.start()
+    start = time.perf_counter()
+    if mode == "list":
+        chunks = len(loader.load_and_split_directory(directory))
+    else:
+        # Each chunk is dropped once counted, as the embed stage does after upserting it
+        chunks = sum(1 for _ in loader.iter_directory_chunks(directory))
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "chunks": chunks,
+        "seconds": round(seconds, 2),
+        "peak_python_mb": round(peak / 2**20, 1),
+        # ru_maxrss is reported in kilobytes on Linux
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def _measure_in_subprocess(mode: str, directory: str) -> Dict[str, Any]:
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(_measure, (mode, directory))
+
+
+def run_benchmark(files: int = 4, pages: int = 25, scales: tuple[int, ...] = (1, 2, 4)) -> Dict[str, Any]:
+    runs = []
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as directory:
+            corpus_bytes = write_corpus(Path(directory), files * scale, pages)
+            runs.append(
+                {
+                    "scale": scale,
+                    "files": files * scale,
+                    "pages": files * scale * pages,
+                    "corpus_mb": round(corpus_bytes / 2**20, 1),
+                    "list": _measure_in_subprocess("list", directory),
+                    "streaming": _measure_in_subprocess("streaming", directory),
+                }
+            )
+    return {"pages_per_file": pages, "runs": runs}
+
+
+def _print_report(results: Dict[str, Any]) -> None:
+    print("\n" + "=" * 60)
+    print("INGESTION MEMORY BENCHMARK REPORT")
+    print("=" * 60)
+    print(f"Pages per file: {results['pages_per_file']}")
+    for run in results["runs"]:
+        listed, streamed = run["list"], run["streaming"]
+        print(f"x{run['scale']}: {run['files']} files, {run['pages']} pages, {listed['chunks']} chunks")
+        print(f"  list:      peak python {listed['peak_python_mb']} MB, max RSS {listed['max_rss_mb']} MB")
+        print(f"  streaming: peak python {streamed['peak_python_mb']} MB, max RSS {streamed['max_rss_mb']} MB")
+    print("=" * 60 + "\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare peak ingestion memory of list-based and streaming loading")
+    parser.add_argument("--files", type=int, default=4, help="PDFs in the smallest corpus (default: 4)")
+    parser.add_argument("--pages", type=int, default=25, help="Pages per PDF (default: 25)")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 2, 4], help="Corpus size multipliers")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        results = run_benchmark(files=args.files, pages=args.pages, scales=tuple(args.scales))
+        if args.json:
+            print(json.dumps(results, indent=2))
+        else:
+            _print_report(results)
+        return 0
+    except Exception as e:
+        logger.error(f"Benchmark failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,38 +1,59 @@
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_openai import ChatOpenAI
-from ai_unifier_assesment.config import Settings, get_settings
+from ai_unifier_assesment.config import Settings
+from ai_unifier_assesment.dependencies import get_cached_settings, get_resource_registry
+from ai_unifier_assesment.resource_registry import ResourceRegistry
 from fastapi import Depends
-from typing import Annotated
+from typing import Annotated, Callable
 from pydantic import SecretStr
 
 
 class Model:
-    def __init__(self, settings: Annotated[Settings, Depends(get_settings)]):
+    def __init__(
+        self,
+        settings: Annotated[Settings, Depends(get_cached_settings)],
+        registry: Annotated[ResourceRegistry | None, Depends(get_resource_registry)] = None,
+    ):
         self._settings = settings
+        self._registry = registry
+
+    def _shared(self, key: str, factory: Callable[[], BaseChatModel]) -> BaseChatModel:
+        if self._registry is None:
+            return factory()
+        return self._registry.get_or_create(key, factory)
 
     def stream_model(self) -> BaseChatModel:
-        return ChatOpenAI(
-            base_url=self._settings.openai.base_url,
-            api_key=SecretStr(self._settings.openai.api_key),
-            model=self._settings.openai.model_name,
-            streaming=True,
-            stream_usage=True,
-            model_kwargs={"stream_options": {"include_usage": True}},
+        return self._shared(
+            "llm.stream",
+            lambda: ChatOpenAI(
+                base_url=self._settings.openai.base_url,
+                api_key=SecretStr(self._settings.openai.api_key),
+                model=self._settings.openai.model_name,
+                streaming=True,
+                stream_usage=True,
+                model_kwargs={"stream_options": {"include_usage": True}},
+            ),
         )
 
     def get_chat_model_for_evaluation(self) -> BaseChatModel:
-        return ChatOpenAI(
-            base_url=self._settings.openai.base_url,
-            api_key=SecretStr(self._settings.openai.api_key),
-            model=self._settings.openai.model_name,
-            streaming=False,
-            model_kwargs={"response_format": {"type": "json_object"}},
+        return self._shared(
+            "llm.evaluation",
+            lambda: ChatOpenAI(
+                base_url=self._settings.openai.base_url,
+                api_key=SecretStr(self._settings.openai.api_key),
+                model=self._settings.openai.model_name,
+                streaming=False,
+                model_kwargs={"response_format": {"type": "json_object"}},
+            ),
         )
 
     def simple_model(self) -> BaseChatModel:
-        return ChatOpenAI(
-            base_url=self._settings.openai.base_url,
-            api_key=SecretStr(self._settings.openai.api_key),
-            model=self._settings.openai.model_name,
-            streaming=False,
+        return self._shared(
+            "llm.simple",
+            lambda: ChatOpenAI(
+                base_url=self._settings.openai.base_url,
+                api_key=SecretStr(self._settings.openai.api_key),
+                model=self._settings.openai.model_name,
+                streaming=False,
+            ),
         )
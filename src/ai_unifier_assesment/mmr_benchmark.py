@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Microbenchmark for MMR re-ranking.
+Compares LangChain's maximal marginal relevance, which loops over the candidates in
+Python for every pick, with the vectorized NumPy routine used by retrieval, as
+fetch_k grows.
+
+Usage:
+    python -m ai_unifier_assesment.mmr_benchmark
+    python -m ai_unifier_assesment.mmr_benchmark --fetch-k 20 200 2000 --k 10 --dim 768
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict
+
+import numpy as np
+from langchain_core.vectorstores.utils import maximal_marginal_relevance as langchain_mmr
+
+from ai_unifier_assesment.rag.mmr import maximal_marginal_relevance
+
+logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def _time_ms(select: Callable[[], Any], iterations: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        select()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.mean(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def run_benchmark(
+    fetch_ks: tuple[int, ...] = (20, 100, 500, 1000, 2000),
+    k: int = 5,
+    dim: int = 768,
+    lambda_mult: float = 0.5,
+    iterations: int = 20,
+) -> Dict[str, Any]:
+    rng = np.random.default_rng(0)
+    query = rng.normal(size=dim).astype(np.float32)
+    runs = []
+    for fetch_k in fetch_ks:
+        # float32 values as Chroma stores them, passed to both as the list rows langchain's MMR takes
+        candidates = rng.normal(size=(fetch_k, dim)).astype(np.float32).tolist()
+        expected = langchain_mmr(query, candidates, k=k, lambda_mult=lambda_mult)
+        selected = maximal_marginal_relevance(query, candidates, k=k, lambda_mult=lambda_mult)
+        runs.append(
+            {
+                "fetch_k": fetch_k,
+                "same_selection": selected == expected,
+                "langchain": _time_ms(
+                    lambda: langchain_mmr(query, candidates, k=k, lambda_mult=lambda_mult), iterations
+                ),
+                "numpy": _time_ms(
+                    lambda: maximal_marginal_relevance(query, candidates, k=k, lambda_mult=lambda_mult), iterations
+                ),
+            }
+        )
+    return {"k": k, "dim": dim, "lambda_mult": lambda_mult, "iterations": iterations, "runs": runs}
+
+
+def _print_report(results: Dict[str, Any]) -> None:
+    print("\n" + "=" * 60)
+    print("MMR RE-RANKING BENCHMARK REPORT")
+    print("=" * 60)
+    print(f"k: {results['k']}, dim: {results['dim']}, lambda_mult: {results['lambda_mult']}")
+    for run in results["runs"]:
+        before = run["langchain"]["median_ms"]
+        after = run["numpy"]["median_ms"]
+        same = "same selection" if run["same_selection"] else "DIFFERENT selection"
+        print(f"fetch_k={run['fetch_k']}: langchain {before} ms -> numpy {after} ms (median, {same})")
+    print("=" * 60 + "\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure MMR re-ranking cost as fetch_k grows")
+    parser.add_argument("--fetch-k", type=int, nargs="+", default=[20, 100, 500, 1000, 2000], help="Candidate counts")
+    parser.add_argument("--k", type=int, default=5, help="Documents selected (default: 5)")
+    parser.add_argument("--dim", type=int, default=768, help="Embedding dimensions (default: 768)")
+    parser.add_argument("--lambda-mult", type=float, default=0.5, help="Relevance/diversity trade-off (default: 0.5)")
+    parser.add_argument("--iterations", type=int, default=20, help="Selections timed per variant (default: 20)")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    args = parser.parse_args()
+
+    try:
+        results = run_benchmark(
+            fetch_ks=tuple(args.fetch_k),
+            k=args.k,
+            dim=args.dim,
+            lambda_mult=args.lambda_mult,
+            iterations=args.iterations,
+        )
+        if args.json:
+            print(json.dumps(results, indent=2))
+        else:
+            _print_report(results)
+        return 0
+    except Exception as e:
+        logger.error(f"Benchmark failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+import threading
+from collections import OrderedDict
+from typing import Annotated, Optional
+
+import numpy as np
+from fastapi import Depends
+
+from ai_unifier_assesment.config import Settings
+from ai_unifier_assesment.dependencies import get_cached_settings, get_resource_registry
+from ai_unifier_assesment.resource_registry import ResourceRegistry
+
+
+class _CollectionAnswers:
+    def __init__(self, version: str):
+        self.version = version
+        self.entries: OrderedDict[int, tuple[np.ndarray, dict]] = OrderedDict()
+        self.next_id = 0
+        self._matrix: Optional[np.ndarray] = None
+        self._ids: list[int] = []
+
+    def matrix(self) -> tuple[np.ndarray, list[int]]:
+        if self._matrix is None:
+            self._ids = list(self.entries)
+            self._matrix = np.vstack([self.entries[entry_id][0] for entry_id in self._ids])
+        return self._matrix, self._ids
+
+    def invalidate_matrix(self) -> None:
+        self._matrix = None
+
+
+class SemanticAnswerCache:
+    """Serves stored answers for questions whose embedding is close to one already answered.
+
+    Entries are scoped per collection and dropped as soon as the collection's ingest
+    version changes. Each collection keeps at most ``max_entries`` answers, evicting the
+    least recently used.
+    """
+
+    def __init__(self, threshold: float, max_entries: int):
+        self._threshold = threshold
+        self._max_entries = max_entries
+        self._collections: dict[str, _CollectionAnswers] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    def lookup(self, collection_name: str, version: str, embedding: list[float]) -> Optional[dict]:
+        query = self._normalize(embedding)
+        with self._lock:
+            answers = self._current(collection_name, version)
+            if answers is None or not answers.entries:
+                self._misses += 1
+                return None
+
+            matrix, ids = answers.matrix()
+            scores = matrix @ query
+            best = int(np.argmax(scores))
+            if scores[best] < self._threshold:
+                self._misses += 1
+                return None
+
+            answers.entries.move_to_end(ids[best])
+            self._hits += 1
+            return dict(answers.entries[ids[best]][1], similarity=round(float(scores[best]), 4))
+
+    def store(self, collection_name: str, version: str, embedding: list[float], result: dict) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            answers = self._current(collection_name, version)
+            if answers is None:
+                answers = self._collections[collection_name] = _CollectionAnswers(version)
+
+            answers.entries[answers.next_id] = (self._normalize(embedding), result)
+            answers.next_id += 1
+            while len(answers.entries) > self._max_entries:
+                answers.entries.popitem(last=False)
+                self._evictions += 1
+            answers.invalidate_matrix()
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses
+        return {
+            "entries": sum(len(answers.entries) for answers in self._collections.values()),
+            "threshold": self._threshold,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "invalidations": self._invalidations,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _current(self, collection_name: str, version: str) -> Optional[_CollectionAnswers]:
+        answers = self._collections.get(collection_name)
+        if answers is not None and answers.version != version:
+            del self._collections[collection_name]
+            self._invalidations += 1
+            return None
+        return answers
+
+    @staticmethod
+    def _normalize(embedding: list[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+def get_answer_cache(
+    settings: Annotated[Settings, Depends(get_cached_settings)],
+    registry: Annotated[ResourceRegistry, Depends(get_resource_registry)],
+) -> SemanticAnswerCache:
+    return registry.get_or_create(
+        "rag.answer_cache",
+        lambda: SemanticAnswerCache(settings.answer_cache.threshold, settings.answer_cache.max_entries),
+    )
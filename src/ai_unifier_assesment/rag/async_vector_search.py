@@ -0,0 +1,132 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+import chromadb
+from chromadb.api import AsyncClientAPI
+from chromadb.api.models.AsyncCollection import AsyncCollection
+from chromadb.errors import NotFoundError
+from langchain_core.documents import Document
+
+from ai_unifier_assesment.rag.mmr import maximal_marginal_relevance
+
+logger = logging.getLogger(__name__)
+
+
+def mmr_documents(
+    results: Any, embedding: list[float], k: int, lambda_mult: float, query_index: int = 0
+) -> list[Document]:
+    """Pick ``k`` of the documents in a Chroma query result by MMR, keeping Chroma's nearest-first order.
+
+    ``query_index`` selects one query's candidates from a result for several query embeddings.
+    """
+    candidates = [
+        Document(page_content=content, metadata=metadata or {}, id=doc_id)
+        for content, metadata, doc_id in zip(
+            results["documents"][query_index],
+            results["metadatas"][query_index],
+            results["ids"][query_index],
+            strict=False,
+        )
+    ]
+    if not candidates:
+        return []
+
+    selected = maximal_marginal_relevance(embedding, results["embeddings"][query_index], k=k, lambda_mult=lambda_mult)
+    return [candidates[i] for i in sorted(selected)]
+
+
+class AsyncChromaSearch:
+    """MMR search over Chroma's async HTTP client.
+
+    Mirrors ``Chroma.max_marginal_relevance_search_by_vector`` so results match the sync
+    retriever, but never blocks the event loop while Chroma answers the query.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        client_factory: Callable[..., Awaitable[AsyncClientAPI]] = chromadb.AsyncHttpClient,
+    ):
+        self._host = host
+        self._port = port
+        self._client_factory = client_factory
+        self._client: Optional[AsyncClientAPI] = None
+        self._collections: dict[str, AsyncCollection] = {}
+        self._lock = asyncio.Lock()
+
+    async def get_client(self) -> AsyncClientAPI:
+        if self._client is not None:
+            return self._client
+
+        async with self._lock:
+            if self._client is None:
+                try:
+                    self._client = await self._client_factory(host=self._host, port=self._port)
+                except Exception as e:
+                    logger.error(f"Failed to connect to ChromaDB at {self._host}:{self._port}: {e}")
+                    raise ConnectionError(f"Unable to establish connection to ChromaDB server: {e}") from e
+            return self._client
+
+    async def get_collection(self, collection_name: str) -> AsyncCollection:
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            client = await self.get_client()
+            collection = await client.get_or_create_collection(collection_name)
+            self._collections[collection_name] = collection
+        return collection
+
+    async def _query(self, collection_name: str, **kwargs: Any) -> Any:
+        """Query a collection, refetching its handle once if Chroma no longer knows the cached one.
+
+        A collection deleted and recreated (e.g. by re-ingestion) gets a new ID, so the
+        cached handle would keep failing until restart.
+        """
+        collection = await self.get_collection(collection_name)
+        try:
+            return await collection.query(**kwargs)
+        except NotFoundError as e:
+            logger.warning(f"Cached collection {collection_name} not found, refetching it: {e}")
+            self._collections.pop(collection_name, None)
+        collection = await self.get_collection(collection_name)
+        return await collection.query(**kwargs)
+
+    async def max_marginal_relevance_search_by_vector(
+        self,
+        collection_name: str,
+        embedding: list[float],
+        k: int = 5,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+    ) -> list[Document]:
+        results = await self._query(
+            collection_name,
+            query_embeddings=[embedding],
+            n_results=fetch_k,
+            include=["metadatas", "documents", "distances", "embeddings"],
+        )
+        return mmr_documents(results, embedding, k, lambda_mult)
+
+    async def max_marginal_relevance_search_by_vectors(
+        self,
+        collection_name: str,
+        embeddings: list[list[float]],
+        k: int = 5,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+    ) -> list[list[Document]]:
+        """MMR search for several query embeddings with a single Chroma query."""
+        if not embeddings:
+            return []
+        results = await self._query(
+            collection_name,
+            query_embeddings=embeddings,
+            n_results=fetch_k,
+            include=["metadatas", "documents", "distances", "embeddings"],
+        )
+        return [mmr_documents(results, embedding, k, lambda_mult, i) for i, embedding in enumerate(embeddings)]
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.clear_system_cache()
@@ -0,0 +1,178 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+from langchain_core.embeddings import Embeddings
+
+from ai_unifier_assesment.config import IngestionConfig
+from ai_unifier_assesment.rag.batching import batched, bounded_map
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def estimate_tokens(text: str) -> int:
+    # Ollama does not report token counts for embeddings; ~4 characters per token is close enough for throughput
+    return max(1, len(text) // 4)
+
+
+@dataclass
+class EmbeddingBatchStats:
+    size: int
+    tokens: int
+    latency_seconds: float
+    attempts: int
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.size / self.latency_seconds if self.latency_seconds else 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.tokens / self.latency_seconds if self.latency_seconds else 0.0
+
+
+class BatchEmbeddingClient:
+    """Embeds document batches with bounded concurrency, retries and an adaptive batch size.
+
+    The batch size doubles while batches finish well under ``target_batch_seconds`` and
+    halves when they take longer, within ``[min_batch_size, max_batch_size]``. Failed
+    batches are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        batch_size: int = 32,
+        min_batch_size: int = 8,
+        max_batch_size: int = 256,
+        max_in_flight: int = 4,
+        target_batch_seconds: float = 2.0,
+        max_retries: int = 3,
+        backoff_seconds: float = 0.5,
+        count_tokens: Callable[[str], int] = estimate_tokens,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._embeddings = embeddings
+        self._min_batch_size = max(1, min_batch_size)
+        self._max_batch_size = max(self._min_batch_size, max_batch_size)
+        self._batch_size = min(max(batch_size, self._min_batch_size), self._max_batch_size)
+        self._max_in_flight = max(1, max_in_flight)
+        self._target_batch_seconds = target_batch_seconds
+        self._max_retries = max_retries
+        self._backoff_seconds = backoff_seconds
+        self._count_tokens = count_tokens
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._recent: deque[EmbeddingBatchStats] = deque(maxlen=100)
+        self._batches = 0
+        self._chunks = 0
+        self._tokens = 0
+        self._retries = 0
+        self._first_started: Optional[float] = None
+        self._last_finished: Optional[float] = None
+
+    @classmethod
+    def from_config(cls, embeddings: Embeddings, config: IngestionConfig) -> "BatchEmbeddingClient":
+        return cls(
+            embeddings,
+            batch_size=config.embed_batch_size,
+            min_batch_size=config.embed_min_batch_size,
+            max_batch_size=config.embed_max_batch_size,
+            max_in_flight=config.embed_concurrency,
+            target_batch_seconds=config.embed_target_batch_seconds,
+            max_retries=config.embed_max_retries,
+            backoff_seconds=config.embed_retry_backoff_seconds,
+        )
+
+    @property
+    def batch_size(self) -> int:
+        return self._batch_size
+
+    def embed_stream(self, items: Iterable[T], text: Callable[[T], str]) -> Iterator[list[tuple[T, list[float]]]]:
+        """Yield ``(item, vector)`` pairs batch by batch, in input order."""
+
+        def embed(batch: tuple[T, ...]) -> list[tuple[T, list[float]]]:
+            return list(zip(batch, self.embed_batch([text(item) for item in batch]), strict=True))
+
+        with ThreadPoolExecutor(self._max_in_flight) as pool:
+            yield from bounded_map(pool, embed, batched(items, lambda: self._batch_size), self._max_in_flight)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [vector for batch in self.embed_stream(texts, lambda text: text) for _, vector in batch]
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        start = time.perf_counter()
+        with self._lock:
+            if self._first_started is None:
+                self._first_started = start
+
+        for attempt in range(1, self._max_retries + 2):
+            try:
+                vectors = self._embeddings.embed_documents(texts)
+                break
+            except Exception as e:
+                if attempt > self._max_retries:
+                    raise
+                delay = self._backoff_seconds * 2 ** (attempt - 1)
+                logger.warning(f"Embedding batch of {len(texts)} failed (attempt {attempt}), retrying in {delay}s: {e}")
+                with self._lock:
+                    self._retries += 1
+                self._sleep(delay)
+
+        finished = time.perf_counter()
+        stats = EmbeddingBatchStats(
+            size=len(texts),
+            tokens=sum(self._count_tokens(text) for text in texts),
+            latency_seconds=finished - start,
+            attempts=attempt,
+        )
+        self._record(stats, finished)
+        return vectors
+
+    def _record(self, stats: EmbeddingBatchStats, finished: float) -> None:
+        with self._lock:
+            self._recent.append(stats)
+            self._batches += 1
+            self._chunks += stats.size
+            self._tokens += stats.tokens
+            self._last_finished = finished
+            if stats.attempts == 1:
+                self._adapt(stats)
+        logger.debug(
+            f"Embedded batch of {stats.size} in {stats.latency_seconds:.2f}s "
+            f"({stats.chunks_per_second:.1f} chunks/s, {stats.tokens_per_second:.0f} tokens/s)"
+        )
+
+    def _adapt(self, stats: EmbeddingBatchStats) -> None:
+        # Only full batches tell us how the current size performs
+        if stats.latency_seconds > self._target_batch_seconds:
+            self._batch_size = max(self._min_batch_size, self._batch_size // 2)
+        elif stats.latency_seconds < self._target_batch_seconds / 2 and stats.size >= self._batch_size:
+            self._batch_size = min(self._max_batch_size, self._batch_size * 2)
+
+    def batch_stats(self) -> list[EmbeddingBatchStats]:
+        with self._lock:
+            return list(self._recent)
+
+    def stats(self) -> dict:
+        with self._lock:
+            elapsed = (
+                self._last_finished - self._first_started
+                if self._first_started is not None and self._last_finished is not None
+                else 0.0
+            )
+            return {
+                "batches": self._batches,
+                "chunks": self._chunks,
+                "tokens": self._tokens,
+                "retries": self._retries,
+                "batch_size": self._batch_size,
+                "chunks_per_second": round(self._chunks / elapsed, 2) if elapsed else 0.0,
+                "tokens_per_second": round(self._tokens / elapsed, 2) if elapsed else 0.0,
+            }
@@ -0,0 +1,25 @@
+from collections import deque
+from concurrent.futures import Executor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def bounded_map(executor: Executor, fn: Callable[[T], R], items: Iterable[T], max_in_flight: int) -> Iterator[R]:
+    """Like ``executor.map`` but keeps at most ``max_in_flight`` tasks queued and yields in order."""
+    pending: deque = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def batched(items: Iterable[T], size: int | Callable[[], int]) -> Iterator[tuple[T, ...]]:
+    """Split ``items`` into tuples; a callable ``size`` is re-read for every batch."""
+    iterator = iter(items)
+    while batch := tuple(islice(iterator, size() if callable(size) else size)):
+        yield batch
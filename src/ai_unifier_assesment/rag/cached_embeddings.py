@@ -0,0 +1,275 @@
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Once over its bound, the persistent tier is trimmed this far below it so eviction does not run on every put
+EVICTION_HEADROOM = 0.1
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def embed_queries(embeddings: Embeddings, texts: list[str]) -> list[list[float]]:
+    """Embed a batch of queries, through ``embeddings.embed_queries`` when it has one."""
+    if hasattr(embeddings, "embed_queries"):
+        vectors: list[list[float]] = embeddings.embed_queries(texts)
+        return vectors
+    return [embeddings.embed_query(text) for text in texts]
+
+
+async def aembed_queries(embeddings: Embeddings, texts: list[str]) -> list[list[float]]:
+    if hasattr(embeddings, "aembed_queries"):
+        vectors: list[list[float]] = await embeddings.aembed_queries(texts)
+        return vectors
+    return list(await asyncio.gather(*(embeddings.aembed_query(text) for text in texts)))
+
+
+class SqliteEmbeddingStore:
+    """Persistent embedding tier shared by every process pointing at the same file.
+
+    Holds at most about ``max_entries`` vectors (0 means no limit), evicting the least
+    recently read or written ones.
+    """
+
+    def __init__(self, path: str, max_entries: int = 0, clock: Callable[[], float] = time.time):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache "
+            "(key TEXT PRIMARY KEY, vector BLOB NOT NULL, accessed REAL NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(embedding_cache)")}
+        if "accessed" not in columns:
+            # Files written before eviction existed; their entries are evicted first
+            self._connection.execute("ALTER TABLE embedding_cache ADD COLUMN accessed REAL NOT NULL DEFAULT 0")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS embedding_cache_accessed ON embedding_cache (accessed)")
+        self._connection.commit()
+        self._size = self._count()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def _count(self) -> int:
+        return int(self._connection.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0])
+
+    def get(self, key: str) -> Optional[list[float]]:
+        with self._lock:
+            row = self._connection.execute("SELECT vector FROM embedding_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE embedding_cache SET accessed = ? WHERE key = ?", (self._clock(), key))
+            self._connection.commit()
+        return array("d", row[0]).tolist()
+
+    def put(self, key: str, vector: list[float]) -> None:
+        with self._lock:
+            exists = self._connection.execute("SELECT 1 FROM embedding_cache WHERE key = ?", (key,)).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO embedding_cache (key, vector, accessed) VALUES (?, ?, ?)",
+                (key, array("d", vector).tobytes(), self._clock()),
+            )
+            if exists is None:
+                self._size += 1
+            if self._max_entries > 0 and self._size > self._max_entries:
+                self._evict()
+            self._connection.commit()
+
+    def _evict(self) -> None:
+        keep = int(self._max_entries * (1 - EVICTION_HEADROOM))
+        self._connection.execute(
+            "DELETE FROM embedding_cache WHERE key IN "
+            "(SELECT key FROM embedding_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (keep,),
+        )
+        # Other processes may write to the same file, so recount rather than assume
+        self._size = self._count()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """Caches query embeddings in a bounded LRU with an optional persistent tier.
+
+    Keys combine the embedding model name with the normalized text, so repeated
+    questions skip the embedding round-trip. Document embeddings pass straight through.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model_name: str,
+        max_entries: int,
+        store: Optional[SqliteEmbeddingStore] = None,
+    ):
+        self._embeddings = embeddings
+        self._model_name = model_name
+        self._max_entries = max_entries
+        self._store = store
+        self._entries: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._persistent_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self._embeddings.embed_documents(texts)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await self._embeddings.aembed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        key = self._key(text)
+        vector = self._lookup(key)
+        if vector is None:
+            vector = self._embeddings.embed_query(text)
+            self._remember(key, vector)
+        return vector
+
+    async def aembed_query(self, text: str) -> list[float]:
+        key = self._key(text)
+        vector = self._lookup_memory(key)
+        if vector is None:
+            vector = await self._off_loop(self._lookup_persisted, key)
+        if vector is None:
+            vector = await self._embeddings.aembed_query(text)
+            await self._off_loop(self._remember, key, vector)
+        return vector
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        keys, vectors, missing = self._lookup_many(texts)
+        if missing:
+            self._remember_many(keys, vectors, missing, embed_queries(self._embeddings, list(missing)))
+        return vectors
+
+    async def aembed_queries(self, texts: list[str]) -> list[list[float]]:
+        """Serve cached queries and embed the rest, each distinct text once, in one batch."""
+        keys, vectors, missing = await self._off_loop(self._lookup_many, texts)
+        if missing:
+            embedded = await aembed_queries(self._embeddings, list(missing))
+            await self._off_loop(self._remember_many, keys, vectors, missing, embedded)
+        return vectors
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._persistent_hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self._hits,
+                "persistent_hits": self._persistent_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round((self._hits + self._persistent_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        if self._store is not None:
+            self._store.close()
+
+    async def aclose(self) -> None:
+        self.close()
+        if hasattr(self._embeddings, "aclose"):
+            await self._embeddings.aclose()
+
+    def _key(self, text: str) -> str:
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{self._model_name}:{digest}"
+
+    async def _off_loop(self, fn: Callable[..., T], *args: Any) -> T:
+        # SQLite reads and commits would block the event loop; without the persistent tier it is all in memory
+        if self._store is None:
+            return fn(*args)
+        return await asyncio.to_thread(fn, *args)
+
+    def _lookup_memory(self, key: str) -> Optional[list[float]]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+            return vector
+
+    def _lookup_persisted(self, key: str) -> Optional[list[float]]:
+        vector = None
+        if self._store is not None:
+            try:
+                vector = self._store.get(key)
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache read failed: {e}")
+            if vector is not None:
+                with self._lock:
+                    self._persistent_hits += 1
+                self._put_in_memory(key, vector)
+                return vector
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def _lookup(self, key: str) -> Optional[list[float]]:
+        vector = self._lookup_memory(key)
+        return vector if vector is not None else self._lookup_persisted(key)
+
+    def _lookup_many(self, texts: list[str]) -> tuple[list[str], list, dict[str, list[int]]]:
+        keys = [self._key(text) for text in texts]
+        vectors: list = [None] * len(texts)
+        # Uncached texts mapped to their positions; repeats within the batch are embedded once
+        missing: dict[str, list[int]] = {}
+        first_seen: dict[str, str] = {}
+        for i, (text, key) in enumerate(zip(texts, keys, strict=True)):
+            if key in first_seen:
+                missing[first_seen[key]].append(i)
+                continue
+            vectors[i] = self._lookup(key)
+            if vectors[i] is None:
+                first_seen[key] = text
+                missing[text] = [i]
+        return keys, vectors, missing
+
+    def _remember_many(
+        self, keys: list[str], vectors: list, missing: dict[str, list[int]], embedded: list[list[float]]
+    ) -> None:
+        for positions, vector in zip(missing.values(), embedded, strict=True):
+            self._remember(keys[positions[0]], vector)
+            for i in positions:
+                vectors[i] = vector
+
+    def _remember(self, key: str, vector: list[float]) -> None:
+        self._put_in_memory(key, vector)
+        if self._store is not None:
+            try:
+                self._store.put(key, vector)
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache write failed: {e}")
+
+    def _put_in_memory(self, key: str, vector: list[float]) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
@@ -0,0 +1,73 @@
+import logging
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+
+from chromadb import ClientAPI
+from chromadb.api import AsyncClientAPI
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "ingest_version"
+
+
+class CollectionVersions:
+    """Tracks the ingest version of each Chroma collection.
+
+    The version lives in the collection metadata so re-ingesting from the offline CLI
+    is visible to every API worker; lookups are cached for ``ttl_seconds``.
+    """
+
+    def __init__(self, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._versions: dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, client: ClientAPI, collection_name: str) -> str:
+        version = self._cached(collection_name)
+        if version is not None:
+            return version
+
+        try:
+            metadata = client.get_collection(collection_name).metadata or {}
+            version = str(metadata.get(VERSION_KEY, ""))
+        except Exception as e:
+            logger.warning(f"Could not read version of collection {collection_name}: {e}")
+            version = ""
+        return self._remember(collection_name, version)
+
+    async def aget(self, client: AsyncClientAPI, collection_name: str) -> str:
+        version = self._cached(collection_name)
+        if version is not None:
+            return version
+
+        try:
+            metadata = (await client.get_collection(collection_name)).metadata or {}
+            version = str(metadata.get(VERSION_KEY, ""))
+        except Exception as e:
+            logger.warning(f"Could not read version of collection {collection_name}: {e}")
+            version = ""
+        return self._remember(collection_name, version)
+
+    def bump(self, client: ClientAPI, collection_name: str) -> str:
+        version = uuid.uuid4().hex
+        collection = client.get_or_create_collection(collection_name)
+        # hnsw settings are fixed at creation and Chroma rejects them in modify()
+        metadata = {key: value for key, value in (collection.metadata or {}).items() if not key.startswith("hnsw:")}
+        metadata[VERSION_KEY] = version
+        collection.modify(metadata=metadata)
+        return self._remember(collection_name, version)
+
+    def _cached(self, collection_name: str) -> Optional[str]:
+        with self._lock:
+            cached = self._versions.get(collection_name)
+        if cached is not None and self._clock() - cached[0] <= self._ttl_seconds:
+            return cached[1]
+        return None
+
+    def _remember(self, collection_name: str, version: str) -> str:
+        with self._lock:
+            self._versions[collection_name] = (self._clock(), version)
+        return version
@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+from typing import Callable
+
+from langchain_core.documents import Document
+
+# Shorter shared edges are too likely to be coincidence, e.g. a repeated phrase
+MIN_OVERLAP_CHARS = 20
+# A block cut down to fewer tokens than this is dropped rather than truncated
+MIN_TRUNCATED_TOKENS = 32
+
+
+@dataclass
+class _Block:
+    number: int
+    source: str
+    page: object
+    text: str
+
+    def header(self) -> str:
+        return f"[Source {self.number}: {self.source}, Page {self.page}]"
+
+
+def _overlap(left: str, right: str) -> int:
+    """Length of the longest suffix of ``left`` that is also a prefix of ``right``."""
+    if len(right) < MIN_OVERLAP_CHARS:
+        return 0
+    probe = right[:MIN_OVERLAP_CHARS]
+    start = left.find(probe, max(0, len(left) - len(right)))
+    while start != -1:
+        # The earliest match leaves the longest overlap
+        if right.startswith(left[start:]):
+            return len(left) - start
+        start = left.find(probe, start + 1)
+    return 0
+
+
+def _merge(left: str, right: str) -> str | None:
+    """``left`` and ``right`` joined without their shared span, or None when they do not touch."""
+    if right in left:
+        return left
+    if left in right:
+        return right
+    overlap = _overlap(left, right)
+    if overlap:
+        return left + right[overlap:]
+    overlap = _overlap(right, left)
+    if overlap:
+        return right + left[overlap:]
+    return None
+
+
+def _blocks(docs: list[Document]) -> list[_Block]:
+    pages: dict[tuple[str, str], list[_Block]] = {}
+    seen: set[str] = set()
+    for number, doc in enumerate(docs, start=1):
+        text = doc.page_content.strip()
+        if text in seen:
+            continue
+        seen.add(text)
+
+        source = doc.metadata.get("source", "Unknown")
+        page = doc.metadata.get("page", "N/A")
+        blocks = pages.setdefault((str(source), str(page)), [])
+        block = _Block(number, source, page, text)
+        blocks.append(block)
+        # A merged block can now touch another block of the page, so keep folding
+        merged = True
+        while merged:
+            merged = False
+            for other in blocks:
+                joined = None if other is block else _merge(other.text, block.text)
+                if joined is not None:
+                    other.text = joined
+                    other.number = min(other.number, block.number)
+                    blocks.remove(block)
+                    block = other
+                    merged = True
+                    break
+    return sorted((block for blocks in pages.values() for block in blocks), key=lambda block: block.number)
+
+
+def _truncate(text: str, max_tokens: int, count_tokens: Callable[[str], int]) -> str:
+    tokens = count_tokens(text)
+    while tokens > max_tokens and text:
+        cut = int(len(text) * max_tokens / tokens)
+        # Break at a word boundary so the model is not handed half a word
+        boundary = text.rfind(" ", 0, cut)
+        text = text[: boundary if boundary > 0 else cut].rstrip()
+        tokens = count_tokens(text)
+    return text
+
+
+def pack_context(docs: list[Document], token_budget: int, count_tokens: Callable[[str], int]) -> str:
+    """Format retrieved chunks as cited context blocks within ``token_budget`` tokens.
+
+    Chunks from the same source and page that overlap or contain one another, as the
+    splitter's ``chunk_overlap`` produces, are merged into one block, and repeated text is
+    kept once. A block is cited as ``[Source X]`` with X the retrieval rank of its best
+    chunk, so numbers still index the sources list returned with the answer. Blocks are
+    added best first until the budget, in ``count_tokens`` tokens, is spent; the last one is
+    truncated to fit. A budget of 0 keeps everything without counting.
+    """
+    parts: list[str] = []
+    remaining = token_budget
+    for block in _blocks(docs):
+        part = f"{block.header()}\n{block.text}"
+        if token_budget > 0:
+            separator = count_tokens("\n\n") if parts else 0
+            tokens = separator + count_tokens(part)
+            if tokens > remaining:
+                body_tokens = remaining - separator - count_tokens(f"{block.header()}\n")
+                if body_tokens >= MIN_TRUNCATED_TOKENS:
+                    parts.append(f"{block.header()}\n{_truncate(block.text, body_tokens, count_tokens)}")
+                break
+            remaining -= tokens
+        parts.append(part)
+    return "\n\n".join(parts)
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Iterator
 
 from langchain_community.document_loaders import PyPDFLoader
 from langchain_core.documents import Document
@@ -14,20 +15,28 @@ class DocumentLoaderService:
         loader = PyPDFLoader(file_path)
         return loader.load()
 
+    def lazy_load_pdf(self, file_path: str) -> Iterator[Document]:
+        """Yield pages one at a time; pypdf extracts each page's text only when it is requested."""
+        return PyPDFLoader(file_path).lazy_load()
+
+    def list_pdfs(self, directory_path: str) -> list[str]:
+        return sorted(str(pdf_file) for pdf_file in Path(directory_path).glob("*.pdf"))
+
     def load_pdfs_from_directory(self, directory_path: str) -> list[Document]:
         documents: list[Document] = []
-        path = Path(directory_path)
-        for pdf_file in path.glob("*.pdf"):
-            documents.extend(self.load_pdf(str(pdf_file)))
+        for pdf_file in self.list_pdfs(directory_path):
+            documents.extend(self.load_pdf(pdf_file))
         return documents
 
-    def split_documents(self, documents: list[Document]) -> list[Document]:
-        text_splitter = RecursiveCharacterTextSplitter(
+    def _text_splitter(self) -> RecursiveCharacterTextSplitter:
+        return RecursiveCharacterTextSplitter(
             chunk_size=self._chunk_size,
             chunk_overlap=self._chunk_overlap,
             length_function=len,
         )
-        return text_splitter.split_documents(documents)
+
+    def split_documents(self, documents: list[Document]) -> list[Document]:
+        return self._text_splitter().split_documents(documents)
 
     def load_and_split(self, file_path: str) -> list[Document]:
         documents = self.load_pdf(file_path)
@@ -36,3 +45,16 @@ class DocumentLoaderService:
     def load_and_split_directory(self, directory_path: str) -> list[Document]:
         documents = self.load_pdfs_from_directory(directory_path)
         return self.split_documents(documents)
+
+    def iter_chunks(self, file_path: str) -> Iterator[Document]:
+        """Stream a PDF's chunks page by page, so only one page is held in memory at a time.
+
+        Pages are split independently either way, so this yields the same chunks as ``load_and_split``.
+        """
+        text_splitter = self._text_splitter()
+        for page in self.lazy_load_pdf(file_path):
+            yield from text_splitter.split_documents([page])
+
+    def iter_directory_chunks(self, directory_path: str) -> Iterator[Document]:
+        for pdf_file in self.list_pdfs(directory_path):
+            yield from self.iter_chunks(pdf_file)
@@ -2,17 +2,44 @@ from typing import Annotated
 
 from fastapi import Depends
 from langchain_community.embeddings import OllamaEmbeddings
+from langchain_core.embeddings import Embeddings
 
 from ai_unifier_assesment.config import Settings
-from ai_unifier_assesment.dependencies import get_cached_settings
+from ai_unifier_assesment.dependencies import get_cached_settings, get_resource_registry
+from ai_unifier_assesment.rag.cached_embeddings import CachedEmbeddings, SqliteEmbeddingStore
+from ai_unifier_assesment.rag.ollama_embeddings import AsyncOllamaEmbeddings
+from ai_unifier_assesment.resource_registry import ResourceRegistry
 
 
 class EmbeddingService:
-    def __init__(self, settings: Annotated[Settings, Depends(get_cached_settings)]):
+    def __init__(
+        self,
+        settings: Annotated[Settings, Depends(get_cached_settings)],
+        registry: Annotated[ResourceRegistry | None, Depends(get_resource_registry)] = None,
+    ):
         self._settings = settings
+        self._registry = registry
 
-    def get_embeddings(self) -> OllamaEmbeddings:
-        return OllamaEmbeddings(
-            model=self._settings.ollama.embedding_model,
-            base_url=self._settings.ollama.base_url,
+    def _create_embeddings(self) -> Embeddings:
+        embeddings = AsyncOllamaEmbeddings(
+            OllamaEmbeddings(
+                model=self._settings.ollama.embedding_model,
+                base_url=self._settings.ollama.base_url,
+            ),
+            max_concurrency=self._settings.ollama.embed_concurrency,
         )
+        cache = self._settings.embedding_cache
+        if cache.max_entries <= 0 and not cache.sqlite_path:
+            return embeddings
+
+        store = SqliteEmbeddingStore(cache.sqlite_path, cache.sqlite_max_entries) if cache.sqlite_path else None
+        return CachedEmbeddings(embeddings, self._settings.ollama.embedding_model, cache.max_entries, store)
+
+    def get_embeddings(self) -> Embeddings:
+        if self._registry is None:
+            return self._create_embeddings()
+        return self._registry.get_or_create("ollama.embeddings", self._create_embeddings)
+
+    def cache_stats(self) -> dict:
+        embeddings = self.get_embeddings()
+        return embeddings.stats() if isinstance(embeddings, CachedEmbeddings) else {}
@@ -0,0 +1,104 @@
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Generic, Iterator, Optional, Protocol, TypeVar
+
+from chromadb.api.models.Collection import Collection
+from chromadb.api.types import Include
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = "CURRENT"
+
+
+class VersionedIndex(Protocol):
+    version: str
+
+
+T = TypeVar("T", bound=VersionedIndex)
+
+
+def current_version(directory: Path) -> Optional[str]:
+    try:
+        return (directory / CURRENT_FILE).read_text().strip()
+    except FileNotFoundError:
+        return None
+
+
+def collection_pages(collection: Collection, include: Include, batch_size: int = 1024) -> Iterator[dict]:
+    """Page through a whole Chroma collection, ``batch_size`` records at a time."""
+    offset = 0
+    while True:
+        page = collection.get(include=include, limit=batch_size, offset=offset)
+        if not page["ids"]:
+            return
+        yield dict(page)
+        offset += len(page["ids"])
+
+
+def publish(directory: Path, version: str, write: Callable[[Path], None]) -> Path:
+    """Have ``write`` fill ``directory/<version>``, then atomically make it the current version.
+
+    Older versions are removed. Readers that still have their files open or mapped keep
+    working, since unlinked files live on until they are closed.
+    """
+    target = directory / version
+    staging = directory / f"{version}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    write(staging)
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(staging, target)
+
+    current_tmp = directory / f"{CURRENT_FILE}.tmp"
+    current_tmp.write_text(version)
+    os.replace(current_tmp, directory / CURRENT_FILE)
+
+    for old in directory.iterdir():
+        if old.is_dir() and old.name != version:
+            shutil.rmtree(old, ignore_errors=True)
+    return target
+
+
+class PublishedIndexStore(Generic[T]):
+    """Serves the current published index of each collection to a worker.
+
+    The ``CURRENT`` pointer written by ingestion is re-read at most every
+    ``refresh_seconds``, and a newly published version is loaded in its place.
+    """
+
+    def __init__(
+        self,
+        directory: Callable[[str], Path],
+        load: Callable[[Path], T],
+        refresh_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._directory = directory
+        self._load = load
+        self._refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._indexes: dict[str, tuple[float, T]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, collection_name: str) -> T:
+        with self._lock:
+            cached = self._indexes.get(collection_name)
+            if cached is not None and self._clock() - cached[0] <= self._refresh_seconds:
+                return cached[1]
+
+            index = cached[1] if cached is not None else None
+            directory = self._directory(collection_name)
+            version = current_version(directory)
+            if version is None:
+                raise FileNotFoundError(
+                    f"No index for collection {collection_name} in {directory}; run ingestion first"
+                )
+            if index is None or index.version != version:
+                logger.info(f"Loading index {directory / version}")
+                index = self._load(directory / version)
+            self._indexes[collection_name] = (self._clock(), index)
+            return index
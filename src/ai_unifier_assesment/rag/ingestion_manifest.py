@@ -0,0 +1,91 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+
+def ingest_signature(chunk_size: int, chunk_overlap: int, embedding_model: str) -> str:
+    """Identifies the settings a chunk was produced with; changing any of them re-embeds everything."""
+    return hashlib.sha256(f"{chunk_size}:{chunk_overlap}:{embedding_model}".encode("utf-8")).hexdigest()[:16]
+
+
+def chunk_id(signature: str, document: Document) -> str:
+    source = document.metadata.get("source", "")
+    page = document.metadata.get("page", "")
+    payload = "\0".join([signature, str(source), str(page), document.page_content])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def with_chunk_ids(signature: str, documents: list[Document]) -> list[tuple[str, Document]]:
+    """Pair chunks with their IDs, dropping repeats of identical text on the same page."""
+    identified: dict[str, Document] = {}
+    for document in documents:
+        identified.setdefault(chunk_id(signature, document), document)
+    return list(identified.items())
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IngestionManifest:
+    """Records, per ingested file, its content hash and the chunk IDs it produced.
+
+    Entries are written once every chunk of a file is in Chroma, so an unchanged file
+    can be skipped without parsing it, and chunks that a file no longer produces can
+    be deleted.
+    """
+
+    def __init__(self, path: str, collection_name: str, signature: str):
+        self._path = Path(path)
+        self._collection_name = collection_name
+        self._signature = signature
+        self._files: dict[str, dict] = {}
+        self._load()
+
+    def _read(self) -> dict:
+        if not self._path.exists():
+            return {}
+        try:
+            data = json.loads(self._path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable ingestion manifest {self._path}: {e}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _load(self) -> None:
+        self._files = self._read().get(self._collection_name, {})
+
+    def save(self) -> None:
+        data = self._read()
+        data[self._collection_name] = self._files
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data))
+        os.replace(tmp_path, self._path)
+
+    def sources(self) -> list[str]:
+        return list(self._files)
+
+    def is_current(self, source: str, content_hash: str) -> bool:
+        entry = self._files.get(source)
+        return entry is not None and entry["file_hash"] == content_hash and entry["signature"] == self._signature
+
+    def chunk_ids(self, source: str) -> list[str]:
+        entry = self._files.get(source)
+        return entry["chunk_ids"] if entry is not None else []
+
+    def record(self, source: str, content_hash: str, chunk_ids: list[str]) -> None:
+        self._files[source] = {"file_hash": content_hash, "signature": self._signature, "chunk_ids": chunk_ids}
+
+    def forget(self, source: str) -> None:
+        self._files.pop(source, None)
@@ -0,0 +1,272 @@
+import logging
+import multiprocessing
+import queue
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+import numpy as np
+from chromadb.api.models.Collection import Collection
+from langchain_core.documents import Document
+
+from ai_unifier_assesment.config import IngestionConfig
+from ai_unifier_assesment.rag.batch_embedding_client import BatchEmbeddingClient
+from ai_unifier_assesment.rag.batching import batched
+from ai_unifier_assesment.rag.ingestion_manifest import IngestionManifest, chunk_id, file_hash
+
+logger = logging.getLogger(__name__)
+
+# Chunks cross from parse workers to the embed stage in batches of this size
+PARSE_BATCH_SIZE = 32
+
+ChunkLoader = Callable[[str], Iterable[Document]]
+
+
+@dataclass
+class IngestionReport:
+    files: int = 0
+    skipped_files: int = 0
+    chunks: int = 0
+    reused_chunks: int = 0
+    deleted_chunks: int = 0
+    elapsed_seconds: float = 0.0
+    embedding: dict = field(default_factory=dict)
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+@dataclass
+class _FileProgress:
+    source: str
+    content_hash: str
+    chunk_ids: list[str] = field(default_factory=list)
+    remaining: int = 0
+    enumerated: bool = False
+    finished: bool = False
+
+    @property
+    def done(self) -> bool:
+        return self.enumerated and self.remaining == 0
+
+
+@dataclass
+class _PendingChunk:
+    file: _FileProgress
+    chunk_id: str
+    document: Document
+
+
+class IngestionPipeline:
+    """Ingests PDFs as overlapping stages: parse+split, embed, upsert.
+
+    Files are parsed and split page by page (in worker processes when ``workers > 1``) and
+    their chunks flow through a bounded queue, so memory stays flat however large the corpus
+    or a single file is. The embedding client embeds adaptive batches with bounded
+    concurrency, and embedded chunks are upserted into Chroma in batches.
+    Chunk IDs are content hashes, so files unchanged since the manifest was written are
+    skipped, chunks already in Chroma are not embedded again (which also makes an
+    interrupted run resume where it stopped) and chunks a file no longer produces are deleted,
+    including ones stored for it before the manifest existed.
+    """
+
+    def __init__(
+        self,
+        config: IngestionConfig,
+        iter_chunks: ChunkLoader,
+        embedding_client: BatchEmbeddingClient,
+        collection: Collection,
+        manifest: IngestionManifest,
+        signature: str,
+        force: bool = False,
+    ):
+        self._config = config
+        self._iter_chunks = iter_chunks
+        self._embedding_client = embedding_client
+        self._collection = collection
+        self._manifest = manifest
+        self._signature = signature
+        self._force = force
+
+    def run(self, file_paths: list[str], prune_directory: Optional[str] = None) -> IngestionReport:
+        """Ingest ``file_paths``; with ``prune_directory``, chunks of files that were in it but are gone are deleted.
+
+        Files directly in the directory are gone when not listed; files in its subdirectories, which
+        a directory listing does not cover, only once deleted from disk. Other directories are left alone.
+        """
+        start_time = time.time()
+        report = IngestionReport()
+        pending_files = []
+        for path in file_paths:
+            content_hash = file_hash(path)
+            if not self._force and self._manifest.is_current(path, content_hash):
+                report.skipped_files += 1
+            else:
+                pending_files.append((path, content_hash))
+
+        chunks = self._pending_chunks(pending_files, report)
+        embedded = self._embedding_client.embed_stream(chunks, lambda chunk: chunk.document.page_content)
+        buffer: list[tuple[_PendingChunk, list[float]]] = []
+        for batch in embedded:
+            buffer.extend(batch)
+            if len(buffer) >= self._config.upsert_batch_size:
+                self._upsert(buffer, report)
+                buffer = []
+        if buffer:
+            self._upsert(buffer, report)
+
+        if prune_directory is not None:
+            listed = set(file_paths)
+            directory = Path(prune_directory).resolve()
+            for source in self._manifest.sources():
+                if _removed(source, listed, directory):
+                    logger.info(f"Removing chunks of deleted file {source}")
+                    report.deleted_chunks += self._delete(self._manifest.chunk_ids(source))
+                    self._manifest.forget(source)
+
+        self._manifest.save()
+        report.elapsed_seconds = time.time() - start_time
+        report.embedding = self._embedding_client.stats()
+        return report
+
+    def _chunk_batches(self, paths: list[str]) -> Iterator[tuple[str, Optional[list[Document]]]]:
+        """Yield ``(path, chunks)`` as files are split, then ``(path, None)`` once a file is exhausted."""
+        if self._config.workers <= 1 or len(paths) <= 1:
+            for path in paths:
+                for batch in batched(self._iter_chunks(path), PARSE_BATCH_SIZE):
+                    yield path, list(batch)
+                yield path, None
+            return
+        yield from _parallel_chunk_batches(self._iter_chunks, paths, self._config.workers)
+
+    def _pending_chunks(self, pending_files: list[tuple[str, str]], report: IngestionReport) -> Iterator[_PendingChunk]:
+        files = {path: _FileProgress(path, content_hash) for path, content_hash in pending_files}
+        seen: dict[str, set[str]] = {path: set() for path in files}
+        for path, documents in self._chunk_batches(list(files)):
+            progress = files[path]
+            if documents is None:
+                progress.enumerated = True
+                report.files += 1
+                logger.info(f"Split {path}: {progress.remaining} of {len(progress.chunk_ids)} chunks new or changed")
+                if progress.done:
+                    self._finish_file(progress, report)
+                del seen[path]
+                continue
+
+            # Identical text on the same page yields the same ID; keep only the first
+            identified: dict[str, Document] = {}
+            for document in documents:
+                document_id = chunk_id(self._signature, document)
+                if document_id not in seen[path]:
+                    identified.setdefault(document_id, document)
+            seen[path].update(identified)
+            progress.chunk_ids.extend(identified)
+
+            existing = set() if self._force else self._existing_ids(list(identified))
+            report.reused_chunks += len(existing)
+            for document_id, document in identified.items():
+                if document_id not in existing:
+                    progress.remaining += 1
+                    yield _PendingChunk(progress, document_id, document)
+
+    def _existing_ids(self, chunk_ids: list[str]) -> set[str]:
+        existing: set[str] = set()
+        for batch in batched(chunk_ids, self._config.upsert_batch_size):
+            existing.update(self._collection.get(ids=list(batch), include=[])["ids"])
+        return existing
+
+    def _upsert(self, embedded: list[tuple[_PendingChunk, list[float]]], report: IngestionReport) -> None:
+        self._collection.upsert(
+            ids=[chunk.chunk_id for chunk, _ in embedded],
+            embeddings=np.asarray([vector for _, vector in embedded], dtype=np.float32),
+            documents=[chunk.document.page_content for chunk, _ in embedded],
+            # Chroma rejects empty metadata but takes None for a chunk without any
+            metadatas=[chunk.document.metadata or None for chunk, _ in embedded],  # type: ignore[misc]
+        )
+        report.chunks += len(embedded)
+        for chunk, _ in embedded:
+            chunk.file.remaining -= 1
+            if chunk.file.done:
+                self._finish_file(chunk.file, report)
+
+    def _finish_file(self, progress: _FileProgress, report: IngestionReport) -> None:
+        if progress.finished:
+            return
+        progress.finished = True
+        # Stale chunks go only once the new ones are stored, so retrieval never sees a gap. Chroma is asked
+        # too, for chunks the manifest never recorded, e.g. random-ID chunks from before it existed
+        recorded = set(self._manifest.chunk_ids(progress.source))
+        recorded.update(stored_chunk_ids(self._collection, progress.source))
+        stale = recorded - set(progress.chunk_ids)
+        report.deleted_chunks += self._delete(list(stale))
+        self._manifest.record(progress.source, progress.content_hash, progress.chunk_ids)
+        self._manifest.save()
+
+    def _delete(self, chunk_ids: list[str]) -> int:
+        for batch in batched(chunk_ids, self._config.upsert_batch_size):
+            self._collection.delete(ids=list(batch))
+        return len(chunk_ids)
+
+
+def _removed(source: str, listed: set[str], directory: Path) -> bool:
+    path = Path(source).resolve()
+    if path.parent == directory:
+        return source not in listed
+    return path.is_relative_to(directory) and not path.exists()
+
+
+def stored_chunk_ids(collection: Collection, source: str) -> list[str]:
+    return collection.get(where={"source": source}, include=[])["ids"]
+
+
+def _parse_worker(iter_chunks: ChunkLoader, paths: multiprocessing.Queue, results: multiprocessing.Queue) -> None:
+    while (path := paths.get()) is not None:
+        try:
+            for batch in batched(iter_chunks(path), PARSE_BATCH_SIZE):
+                results.put(("chunks", path, list(batch)))
+            results.put(("done", path, None))
+        except Exception as e:
+            results.put(("error", path, repr(e)))
+
+
+def _parallel_chunk_batches(
+    iter_chunks: ChunkLoader, paths: list[str], workers: int
+) -> Iterator[tuple[str, Optional[list[Document]]]]:
+    # Spawned rather than forked, the embed stage already runs threads in this process
+    context = multiprocessing.get_context("spawn")
+    path_queue = context.Queue()
+    # Bounded so parse workers block instead of piling chunks up while embedding catches up
+    results = context.Queue(maxsize=workers * 4)
+    for path in paths:
+        path_queue.put(path)
+    processes = []
+    for _ in range(min(workers, len(paths))):
+        path_queue.put(None)
+        process = context.Process(target=_parse_worker, args=(iter_chunks, path_queue, results), daemon=True)
+        process.start()
+        processes.append(process)
+
+    try:
+        remaining = len(paths)
+        while remaining:
+            try:
+                kind, path, payload = results.get(timeout=1.0)
+            except queue.Empty:
+                crashed = [process for process in processes if process.exitcode not in (None, 0)]
+                if crashed:
+                    raise RuntimeError(f"Parse worker exited with code {crashed[0].exitcode}")
+                continue
+            if kind == "error":
+                raise RuntimeError(f"Failed to parse {path}: {payload}")
+            if kind == "done":
+                remaining -= 1
+                yield path, None
+            else:
+                yield path, payload
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
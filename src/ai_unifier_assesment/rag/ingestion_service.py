@@ -1,3 +1,4 @@
+import logging
 from typing import Annotated
 
 from fastapi import Depends
@@ -5,9 +6,15 @@ from langchain_core.documents import Document
 
 from ai_unifier_assesment.config import Settings
 from ai_unifier_assesment.dependencies import get_cached_settings
+from ai_unifier_assesment.rag.batch_embedding_client import BatchEmbeddingClient
+from ai_unifier_assesment.rag.batching import batched
 from ai_unifier_assesment.rag.document_loader_service import DocumentLoaderService
+from ai_unifier_assesment.rag.ingestion_manifest import IngestionManifest, ingest_signature, with_chunk_ids
+from ai_unifier_assesment.rag.ingestion_pipeline import IngestionPipeline, IngestionReport, stored_chunk_ids
 from ai_unifier_assesment.rag.vector_store_service import VectorStoreService
 
+logger = logging.getLogger(__name__)
+
 
 class IngestionService:
     def __init__(
@@ -28,13 +35,66 @@ class IngestionService:
         chunks = self._document_loader.load_and_split_directory(directory_path)
         return self._store_chunks(chunks, collection_name)
 
+    def ingest_directory_pipelined(
+        self, directory_path: str, collection_name: str = "rag_corpus", force: bool = False
+    ) -> IngestionReport:
+        """Incrementally sync a directory into the collection through the staged pipeline.
+
+        Only new or changed chunks are embedded and chunks of edited files, or of files deleted
+        from this directory, are removed; ``force`` re-embeds every chunk.
+        """
+        manifest = IngestionManifest(self._settings.ingestion.manifest_path, collection_name, self._signature())
+        pipeline = IngestionPipeline(
+            self._settings.ingestion,
+            self._document_loader.iter_chunks,
+            BatchEmbeddingClient.from_config(self._vector_store_service.get_embeddings(), self._settings.ingestion),
+            self._vector_store_service.refresh_collection(collection_name),
+            manifest,
+            self._signature(),
+            force=force,
+        )
+        report = pipeline.run(self._document_loader.list_pdfs(directory_path), prune_directory=directory_path)
+        if report.chunks or report.deleted_chunks:
+            self._vector_store_service.bump_collection_version(collection_name)
+        self._publish(collection_name)
+        return report
+
+    def _publish(self, collection_name: str) -> None:
+        if self._vector_store_service.uses_local_index():
+            self._vector_store_service.publish_local_index(collection_name)
+        if self._vector_store_service.uses_hybrid_search():
+            self._vector_store_service.publish_lexical_index(collection_name)
+
+    def _signature(self) -> str:
+        return ingest_signature(
+            self._settings.rag.chunk_size, self._settings.rag.chunk_overlap, self._settings.ollama.embedding_model
+        )
+
     def _store_chunks(self, chunks: list[Document], collection_name: str) -> int:
         if not chunks:
             return 0
 
+        # Content-hash IDs make re-ingesting the same file overwrite its chunks instead of duplicating them
+        identified = with_chunk_ids(self._signature(), chunks)
         vector_store = self._vector_store_service.get_vector_store(collection_name)
-        vector_store.add_documents(chunks)
-        return len(chunks)
+        vector_store.add_documents(
+            [document for _, document in identified], ids=[chunk_id for chunk_id, _ in identified]
+        )
+        self._delete_stale_chunks(identified, collection_name)
+        self._vector_store_service.bump_collection_version(collection_name)
+        self._publish(collection_name)
+        return len(identified)
+
+    def _delete_stale_chunks(self, identified: list[tuple[str, Document]], collection_name: str) -> None:
+        """Delete chunks stored for the ingested files that they no longer produce, e.g. from an older version."""
+        collection = self._vector_store_service.refresh_collection(collection_name)
+        current = {chunk_id for chunk_id, _ in identified}
+        for source in {document.metadata["source"] for _, document in identified if "source" in document.metadata}:
+            stale = [chunk_id for chunk_id in stored_chunk_ids(collection, source) if chunk_id not in current]
+            if stale:
+                logger.info(f"Removing {len(stale)} stale chunks of {source}")
+                for batch in batched(stale, self._settings.ingestion.upsert_batch_size):
+                    collection.delete(ids=list(batch))
 
     def get_collection_stats(self, collection_name: str = "rag_corpus") -> dict:
         client = self._vector_store_service.get_client()
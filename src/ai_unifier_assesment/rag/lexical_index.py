@@ -0,0 +1,140 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+from chromadb.api.models.Collection import Collection
+from langchain_core.documents import Document
+
+from ai_unifier_assesment.rag.index_publisher import PublishedIndexStore, collection_pages, publish
+from ai_unifier_assesment.rag.index_publisher import current_version as published_version
+
+logger = logging.getLogger(__name__)
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.casefold())
+
+
+def lexical_index_dir(index_dir: str, collection_name: str) -> Path:
+    return Path(index_dir) / f"{collection_name}-bm25"
+
+
+def current_version(index_dir: str, collection_name: str) -> Optional[str]:
+    return published_version(lexical_index_dir(index_dir, collection_name))
+
+
+def build_lexical_index(collection: Collection, index_dir: str, version: str, batch_size: int = 1024) -> Path:
+    """Build a BM25 inverted index over a Chroma collection and publish it next to the vector index.
+
+    Postings are stored as CSR arrays: for term ``t``, ``doc_ids[offsets[t]:offsets[t + 1]]``
+    are the ascending uint32 rows containing it and ``term_freqs`` the matching uint16 counts.
+    """
+    ids: list[str] = []
+    documents: list[str] = []
+    metadatas: list[dict] = []
+    postings: dict[str, list[tuple[int, int]]] = {}
+    doc_lengths: list[int] = []
+    for page in collection_pages(collection, ["documents", "metadatas"], batch_size):
+        for doc_id, document, metadata in zip(page["ids"], page["documents"], page["metadatas"], strict=True):
+            row = len(ids)
+            ids.append(doc_id)
+            documents.append(document)
+            metadatas.append(metadata or {})
+            tokens = tokenize(document)
+            doc_lengths.append(len(tokens))
+            for term, count in Counter(tokens).items():
+                postings.setdefault(term, []).append((row, min(count, np.iinfo(np.uint16).max)))
+
+    vocabulary = sorted(postings)
+    offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(postings[term]) for term in vocabulary])
+    doc_ids = np.fromiter((row for term in vocabulary for row, _ in postings[term]), dtype=np.uint32)
+    term_freqs = np.fromiter((count for term in vocabulary for _, count in postings[term]), dtype=np.uint16)
+
+    def write(staging: Path) -> None:
+        np.savez(
+            staging / "postings.npz",
+            offsets=offsets,
+            doc_ids=doc_ids,
+            term_freqs=term_freqs,
+            doc_lengths=np.asarray(doc_lengths, dtype=np.uint32),
+        )
+        (staging / "records.json").write_text(
+            json.dumps(
+                {
+                    "version": version,
+                    "vocabulary": vocabulary,
+                    "ids": ids,
+                    "documents": documents,
+                    "metadatas": metadatas,
+                }
+            )
+        )
+
+    target = publish(lexical_index_dir(index_dir, collection.name), version, write)
+    logger.info(f"Published lexical index {target} ({len(ids)} chunks, {len(vocabulary)} terms)")
+    return target
+
+
+class LexicalIndex:
+    """Okapi BM25 over one published collection version."""
+
+    def __init__(self, directory: Path):
+        with np.load(directory / "postings.npz") as postings:
+            self._offsets = postings["offsets"]
+            self._doc_ids = postings["doc_ids"]
+            self._term_freqs = postings["term_freqs"].astype(np.float32)
+            doc_lengths = postings["doc_lengths"].astype(np.float32)
+        records = json.loads((directory / "records.json").read_text())
+        self.version: str = records["version"]
+        self._terms = {term: i for i, term in enumerate(records["vocabulary"])}
+        self._ids: list[str] = records["ids"]
+        self._documents: list[str] = records["documents"]
+        self._metadatas: list[dict] = records["metadatas"]
+        average_length = doc_lengths.mean() if len(doc_lengths) else 1.0
+        # The document-length part of the BM25 denominator only depends on the document
+        self._length_norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths / max(average_length, 1e-9))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def search(self, query: str, n: int) -> tuple[np.ndarray, np.ndarray]:
+        """Rows of the ``n`` best BM25 matches for ``query`` and their scores, best first."""
+        scores = np.zeros(len(self._ids), dtype=np.float32)
+        for term in set(tokenize(query)):
+            term_id = self._terms.get(term)
+            if term_id is None:
+                continue
+            start, end = self._offsets[term_id], self._offsets[term_id + 1]
+            rows = self._doc_ids[start:end]
+            tf = self._term_freqs[start:end]
+            idf = np.log1p((len(self._ids) - (end - start) + 0.5) / ((end - start) + 0.5))
+            scores[rows] += idf * tf * (BM25_K1 + 1) / (tf + self._length_norm[rows])
+
+        matched = np.flatnonzero(scores)
+        n = min(n, len(matched))
+        if n == 0:
+            return matched, scores[matched]
+        best = matched[np.argpartition(-scores[matched], n - 1)[:n]]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return best, scores[best]
+
+    def documents(self, rows: np.ndarray) -> list[Document]:
+        return [
+            Document(page_content=self._documents[row], metadata=self._metadatas[row], id=self._ids[row])
+            for row in rows
+        ]
+
+
+class LexicalIndexStore(PublishedIndexStore[LexicalIndex]):
+    def __init__(self, index_dir: str, refresh_seconds: float, clock: Callable[[], float] = time.monotonic):
+        super().__init__(lambda name: lexical_index_dir(index_dir, name), LexicalIndex, refresh_seconds, clock)
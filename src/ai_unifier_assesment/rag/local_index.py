@@ -0,0 +1,388 @@
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Callable, Literal, Optional
+
+import numpy as np
+from chromadb.api.models.Collection import Collection
+from langchain_core.documents import Document
+
+from ai_unifier_assesment.rag.index_publisher import PublishedIndexStore, collection_pages, publish
+from ai_unifier_assesment.rag.index_publisher import current_version as published_version
+from ai_unifier_assesment.rag.mmr import maximal_marginal_relevance
+
+logger = logging.getLogger(__name__)
+
+# Below this many vectors a full scan is as fast as probing inverted lists, and exact
+MIN_IVF_SIZE = 2048
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLES_PER_LIST = 64
+# Queries scored together by search_many; bounds the candidates x queries distance matrix
+QUERY_BLOCK_SIZE = 64
+
+Quantization = Literal["none", "int8", "binary"]
+# Set bits per byte value, for Hamming distances between packed binary codes
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint16)
+
+
+def current_version(index_dir: str, collection_name: str) -> Optional[str]:
+    return published_version(Path(index_dir) / collection_name)
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray, block_size: int = 8192) -> np.ndarray:
+    centroid_norms = np.einsum("ij,ij->i", centroids, centroids)
+    assignments = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), block_size):
+        block = vectors[start : start + block_size]
+        # |x - c|^2 without the |x|^2 term, which is the same for every centroid
+        assignments[start : start + block_size] = np.argmin(centroid_norms - 2 * block @ centroids.T, axis=1)
+    return assignments
+
+
+def _kmeans(vectors: np.ndarray, n_lists: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), n_lists * KMEANS_SAMPLES_PER_LIST)
+    sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+    centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assignments = _nearest(sample, centroids)
+        for i in range(n_lists):
+            members = sample[assignments == i]
+            # An emptied list keeps its centroid rather than collapsing onto another one
+            if len(members):
+                centroids[i] = members.mean(axis=0)
+    return centroids
+
+
+def _quantize(vectors: np.ndarray, quantization: Quantization) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Compact codes for ``vectors`` plus the parameters needed to compare queries with them.
+
+    ``int8`` maps each dimension's value range linearly onto -127..127 (4x smaller than
+    float32), ``binary`` keeps one bit per dimension, set when the value is above the
+    dimension's mean (32x smaller).
+    """
+    dim = vectors.shape[1]
+    if quantization == "int8":
+        low = vectors.min(axis=0) if len(vectors) else np.zeros(dim, dtype=np.float32)
+        high = vectors.max(axis=0) if len(vectors) else np.zeros(dim, dtype=np.float32)
+        center = (high + low) / 2
+        scale = np.where(high > low, (high - low) / 254, 1.0).astype(np.float32)
+        codes = np.clip(np.rint((vectors - center) / scale), -127, 127).astype(np.int8)
+        decoded = center + codes * scale
+        return codes, {"center": center, "scale": scale, "norms": np.einsum("ij,ij->i", decoded, decoded)}
+    if quantization == "binary":
+        center = vectors.mean(axis=0) if len(vectors) else np.zeros(dim, dtype=np.float32)
+        return np.packbits(vectors > center, axis=1), {"center": center.astype(np.float32)}
+    raise ValueError(f"Unknown quantization: {quantization}")
+
+
+def build_local_index(
+    collection: Collection,
+    index_dir: str,
+    version: str,
+    n_lists: Optional[int] = None,
+    batch_size: int = 1024,
+    seed: int = 0,
+    quantization: Quantization = "none",
+) -> Path:
+    """Export a Chroma collection to ``index_dir/<collection>/<version>`` and make it current.
+
+    Vectors are clustered into ``n_lists`` inverted lists (about sqrt(n) by default) and
+    written grouped by list, so probing a list reads one contiguous slice of the file.
+    With ``quantization``, a compact copy of every vector is written alongside for
+    candidate search, and the float32 vectors are only read to re-score the shortlist.
+    """
+    ids: list[str] = []
+    documents: list[str] = []
+    metadatas: list[dict] = []
+    blocks: list[np.ndarray] = []
+    for page in collection_pages(collection, ["embeddings", "documents", "metadatas"], batch_size):
+        ids.extend(page["ids"])
+        documents.extend(page["documents"])
+        metadatas.extend(metadata or {} for metadata in page["metadatas"])
+        blocks.append(np.asarray(page["embeddings"], dtype=np.float32))
+    vectors = np.vstack(blocks) if blocks else np.zeros((0, 0), dtype=np.float32)
+
+    if n_lists is None:
+        n_lists = int(np.sqrt(len(vectors))) if len(vectors) >= MIN_IVF_SIZE else 0
+    n_lists = min(n_lists, len(vectors))
+    if n_lists:
+        centroids = _kmeans(vectors, n_lists, seed)
+        assignments = _nearest(vectors, centroids)
+        order = np.argsort(assignments, kind="stable")
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=n_lists))])
+    else:
+        centroids = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+        order = np.arange(len(vectors))
+        offsets = np.array([0], dtype=np.int64)
+    vectors = vectors[order]
+
+    def write(staging: Path) -> None:
+        vectors.tofile(staging / "vectors.f32")
+        if quantization != "none":
+            codes, parameters = _quantize(vectors, quantization)
+            codes.tofile(staging / "codes.bin")
+            # Typed loosely so the arrays are not checked against savez's allow_pickle keyword
+            arrays: dict[str, Any] = parameters
+            np.savez(staging / "quantization.npz", **arrays)
+        np.savez(
+            staging / "ivf.npz",
+            centroids=centroids,
+            offsets=offsets.astype(np.int64),
+            norms=np.einsum("ij,ij->i", vectors, vectors),
+        )
+        records = {
+            "ids": [ids[i] for i in order],
+            "documents": [documents[i] for i in order],
+            "metadatas": [metadatas[i] for i in order],
+        }
+        (staging / "records.json").write_text(json.dumps(records))
+        (staging / "index.json").write_text(
+            json.dumps(
+                {
+                    "version": version,
+                    "count": len(vectors),
+                    "dim": int(vectors.shape[1]),
+                    "lists": n_lists,
+                    "quantization": quantization,
+                }
+            )
+        )
+
+    # Workers still searching an old version keep their mapping
+    target = publish(Path(index_dir) / collection.name, version, write)
+    logger.info(f"Published local index {target} ({len(vectors)} vectors, {n_lists} lists, {quantization} codes)")
+    return target
+
+
+class LocalVectorIndex:
+    """Read-only index of one exported collection version.
+
+    Vectors are memory-mapped float32, so workers on the same host share the page cache
+    instead of each holding a copy. Candidates come from the ``nprobe`` inverted lists
+    nearest to the query, ranked by L2 distance like Chroma's default collections.
+    Quantized indexes rank the candidates by their codes first and re-score only the
+    shortlist against the float32 vectors.
+    """
+
+    def __init__(self, directory: Path):
+        info = json.loads((directory / "index.json").read_text())
+        self.version: str = info["version"]
+        self._count: int = info["count"]
+        self._dim: int = info["dim"]
+        self.quantization: Quantization = info.get("quantization", "none")
+        self._vectors = (
+            np.memmap(directory / "vectors.f32", dtype=np.float32, mode="r", shape=(self._count, self._dim))
+            if self._count
+            else np.zeros((0, self._dim), dtype=np.float32)
+        )
+        with np.load(directory / "ivf.npz") as ivf:
+            self._centroids = ivf["centroids"]
+            self._offsets = ivf["offsets"]
+            self._norms = ivf["norms"]
+        self._codes = self._load_codes(directory)
+        records = json.loads((directory / "records.json").read_text())
+        self._ids: list[str] = records["ids"]
+        self._documents: list[str] = records["documents"]
+        self._metadatas: list[dict] = records["metadatas"]
+
+    def _load_codes(self, directory: Path) -> Optional[np.ndarray]:
+        if self.quantization == "none":
+            return None
+        with np.load(directory / "quantization.npz") as parameters:
+            self._quantization = {name: parameters[name] for name in parameters.files}
+        dtype: type[np.integer]
+        if self.quantization == "int8":
+            dtype, width = np.int8, self._dim
+        else:
+            dtype, width = np.uint8, (self._dim + 7) // 8
+        if not self._count:
+            return np.zeros((0, width), dtype=dtype)
+        return np.memmap(directory / "codes.bin", dtype=dtype, mode="r", shape=(self._count, width))
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def vector_bytes(self) -> int:
+        return self._vectors.nbytes
+
+    @property
+    def scanned_bytes(self) -> int:
+        """Size of the vectors scanned for candidates: the codes when quantized."""
+        return (self._codes if self._codes is not None else self._vectors).nbytes
+
+    def _exact_distances(self, rows: np.ndarray, query: np.ndarray) -> np.ndarray:
+        return np.asarray(self._norms[rows] - 2 * (self._vectors[rows] @ query) + query @ query, dtype=np.float32)
+
+    def _approximate_distances(self, codes: np.ndarray, rows: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Distances from the ``codes`` of ``rows``, only comparable with each other for the same query."""
+        center = self._quantization["center"]
+        if self.quantization == "int8":
+            # |x|^2 - 2 x.q for x = center + scale * code; |q|^2 does not change the ranking
+            scaled_query = self._quantization["scale"] * query
+            distances = self._quantization["norms"][rows] - 2 * (center @ query + codes[rows] @ scaled_query)
+        else:
+            query_bits = np.packbits(query > center)
+            distances = _POPCOUNT[np.bitwise_xor(codes[rows], query_bits)].sum(axis=1, dtype=np.float32)
+        return np.asarray(distances, dtype=np.float32)
+
+    def _exact_distances_many(self, rows: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """``_exact_distances`` for every query at once, as a candidates x queries matrix."""
+        squared = np.einsum("ij,ij->i", queries, queries)
+        distances = self._norms[rows][:, None] - 2 * (self._vectors[rows] @ queries.T) + squared[None, :]
+        return np.asarray(distances, dtype=np.float32)
+
+    def _approximate_distances_many(self, codes: np.ndarray, rows: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        if self.quantization == "binary":
+            return np.stack([self._approximate_distances(codes, rows, query) for query in queries], axis=1)
+        center = self._quantization["center"]
+        scaled_queries = queries * self._quantization["scale"]
+        distances = self._quantization["norms"][rows][:, None] - 2 * (
+            (queries @ center)[None, :] + codes[rows] @ scaled_queries.T
+        )
+        return np.asarray(distances, dtype=np.float32)
+
+    @staticmethod
+    def _nearest(rows: np.ndarray, distances: np.ndarray, n: int) -> tuple[np.ndarray, np.ndarray]:
+        n = min(n, len(rows))
+        nearest = np.argpartition(distances, n - 1)[:n]
+        nearest = nearest[np.argsort(distances[nearest], kind="stable")]
+        return rows[nearest], distances[nearest]
+
+    def _candidate_rows(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        n_lists = len(self._centroids)
+        if n_lists == 0 or nprobe >= n_lists:
+            return np.arange(self._count)
+        distances = np.einsum("ij,ij->i", self._centroids, self._centroids) - 2 * self._centroids @ query
+        probed = np.argpartition(distances, nprobe - 1)[:nprobe]
+        return np.concatenate([np.arange(self._offsets[i], self._offsets[i + 1]) for i in np.sort(probed)])
+
+    def _probed_lists(self, queries: np.ndarray, nprobe: int) -> Optional[np.ndarray]:
+        """Queries x lists mask of the inverted lists each query probes, or None when every list is scanned."""
+        n_lists = len(self._centroids)
+        if n_lists == 0 or nprobe >= n_lists:
+            return None
+        distances = np.einsum("ij,ij->i", self._centroids, self._centroids)[None, :] - 2 * queries @ self._centroids.T
+        probed = np.zeros((len(queries), n_lists), dtype=bool)
+        np.put_along_axis(probed, np.argpartition(distances, nprobe - 1, axis=1)[:, :nprobe], True, axis=1)
+        return probed
+
+    def search(
+        self, embedding: list[float], n: int, nprobe: int = 8, rescore: int = 0, exact: bool = False
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Rows of the ``n`` nearest vectors and their squared L2 distances, nearest first.
+
+        A quantized index shortlists ``max(n, rescore)`` candidates by their codes and
+        re-scores those exactly; ``exact`` skips the codes and scans the float32 vectors.
+        """
+        query = np.asarray(embedding, dtype=np.float32)
+        rows = self._candidate_rows(query, nprobe)
+        if len(rows) == 0 or n <= 0:
+            return rows[:0], np.zeros(0, dtype=np.float32)
+        codes = None if exact else self._codes
+        if codes is not None:
+            rows, _ = self._nearest(rows, self._approximate_distances(codes, rows, query), max(n, rescore))
+            # Sorted rows keep reads of the memory-mapped float32 file sequential
+            rows = np.sort(rows)
+        return self._nearest(rows, self._exact_distances(rows, query), n)
+
+    def search_many(
+        self, embeddings: list[list[float]], n: int, nprobe: int = 8, rescore: int = 0, exact: bool = False
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """``search`` for several queries, each block of queries scored in one matrix product.
+
+        The candidates of a block are the union of the lists its queries probe; each query
+        then only ranks the rows of its own lists, so results match ``search`` per query.
+        """
+        queries = (
+            np.asarray(embeddings, dtype=np.float32).reshape(len(embeddings), -1)
+            if embeddings
+            else np.zeros((0, 0), dtype=np.float32)
+        )
+        results: list[tuple[np.ndarray, np.ndarray]] = []
+        for start in range(0, len(queries), QUERY_BLOCK_SIZE):
+            results.extend(self._search_block(queries[start : start + QUERY_BLOCK_SIZE], n, nprobe, rescore, exact))
+        return results
+
+    def _search_block(
+        self, queries: np.ndarray, n: int, nprobe: int, rescore: int, exact: bool
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32))
+        if self._count == 0 or n <= 0:
+            return [empty] * len(queries)
+        probed = self._probed_lists(queries, nprobe)
+        if probed is None:
+            rows = np.arange(self._count)
+            member = np.ones((len(queries), self._count), dtype=bool)
+        else:
+            lists = np.flatnonzero(probed.any(axis=0))
+            rows = np.concatenate([np.arange(self._offsets[i], self._offsets[i + 1]) for i in lists])
+            member = probed[:, np.searchsorted(self._offsets, rows, side="right") - 1]
+
+        codes = None if exact else self._codes
+        quantized = codes is not None
+        distances = (
+            self._approximate_distances_many(codes, rows, queries)
+            if codes is not None
+            else self._exact_distances_many(rows, queries)
+        )
+        results = []
+        for i, query in enumerate(queries):
+            candidates = rows[member[i]]
+            if len(candidates) == 0:
+                results.append(empty)
+                continue
+            if quantized:
+                shortlist, _ = self._nearest(candidates, distances[member[i], i], max(n, rescore))
+                shortlist = np.sort(shortlist)
+                results.append(self._nearest(shortlist, self._exact_distances(shortlist, query), n))
+            else:
+                results.append(self._nearest(candidates, distances[member[i], i], n))
+        return results
+
+    def vectors(self, rows: np.ndarray) -> np.ndarray:
+        return np.asarray(self._vectors[rows])
+
+    def documents(self, rows: np.ndarray) -> list[Document]:
+        return [
+            Document(page_content=self._documents[row], metadata=self._metadatas[row], id=self._ids[row])
+            for row in rows
+        ]
+
+    def max_marginal_relevance_search_by_vector(
+        self,
+        embedding: list[float],
+        k: int = 5,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        nprobe: int = 8,
+    ) -> list[Document]:
+        rows, _ = self.search(embedding, fetch_k, nprobe)
+        if len(rows) == 0:
+            return []
+        selected = maximal_marginal_relevance(embedding, self.vectors(rows), k=k, lambda_mult=lambda_mult)
+        return self.documents(rows[sorted(selected)])
+
+    def max_marginal_relevance_search_by_vectors(
+        self,
+        embeddings: list[list[float]],
+        k: int = 5,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        nprobe: int = 8,
+    ) -> list[list[Document]]:
+        results: list[list[Document]] = []
+        for embedding, (rows, _) in zip(embeddings, self.search_many(embeddings, fetch_k, nprobe), strict=True):
+            if len(rows) == 0:
+                results.append([])
+                continue
+            selected = maximal_marginal_relevance(embedding, self.vectors(rows), k=k, lambda_mult=lambda_mult)
+            results.append(self.documents(rows[sorted(selected)]))
+        return results
+
+
+class LocalIndexStore(PublishedIndexStore[LocalVectorIndex]):
+    def __init__(self, index_dir: str, refresh_seconds: float, clock: Callable[[], float] = time.monotonic):
+        super().__init__(lambda name: Path(index_dir) / name, LocalVectorIndex, refresh_seconds, clock)
@@ -0,0 +1,41 @@
+import numpy as np
+
+
+def _normalized(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    # Zero vectors get zero similarity to everything instead of NaN
+    return np.asarray(np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0), dtype=np.float32)
+
+
+def maximal_marginal_relevance(
+    query_embedding: np.ndarray | list[float],
+    candidate_embeddings: np.ndarray | list[list[float]],
+    k: int = 4,
+    lambda_mult: float = 0.5,
+) -> list[int]:
+    """Indices of ``k`` candidates chosen by maximal marginal relevance, in selection order.
+
+    Selects the same candidates as ``langchain_core``'s implementation, but scores all
+    candidates with one matrix product and keeps each candidate's highest similarity to
+    the selection up to date incrementally, so each pick costs one matrix-vector product
+    rather than a Python loop over the candidates.
+    """
+    candidates = _normalized(np.asarray(candidate_embeddings, dtype=np.float32))
+    k = min(k, len(candidates))
+    if k <= 0:
+        return []
+    query = _normalized(np.asarray(query_embedding, dtype=np.float32).reshape(-1))
+
+    relevance = candidates @ query
+    redundancy = np.full(len(candidates), -np.inf, dtype=np.float32)
+    selected = [int(np.argmax(relevance))]
+    available = np.ones(len(candidates), dtype=bool)
+    available[selected[0]] = False
+    while len(selected) < k:
+        np.maximum(redundancy, candidates @ candidates[selected[-1]], out=redundancy)
+        scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        chosen = int(np.argmax(scores))
+        selected.append(chosen)
+        available[chosen] = False
+    return selected
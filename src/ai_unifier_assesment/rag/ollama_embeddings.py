@@ -0,0 +1,86 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from langchain_community.embeddings import OllamaEmbeddings
+from langchain_core.embeddings import Embeddings
+
+# Model options the sync client sends with every /api/embeddings request
+OPTION_FIELDS = (
+    "mirostat",
+    "mirostat_eta",
+    "mirostat_tau",
+    "num_ctx",
+    "num_gpu",
+    "num_thread",
+    "repeat_last_n",
+    "repeat_penalty",
+    "temperature",
+    "stop",
+    "tfs_z",
+    "top_k",
+    "top_p",
+)
+
+
+class AsyncOllamaEmbeddings(Embeddings):
+    """Adds native async calls to the community ``OllamaEmbeddings``.
+
+    Async requests hit the same ``/api/embeddings`` endpoint with the same payload as the
+    sync client, so query vectors stay comparable with the ones already stored in Chroma.
+    At most ``max_concurrency`` requests are in flight at once, so a large batch queues
+    here instead of exhausting the connection pool.
+    """
+
+    def __init__(self, embeddings: OllamaEmbeddings, timeout: float = 60.0, max_concurrency: int = 8):
+        self._embeddings = embeddings
+        self._client = httpx.AsyncClient(timeout=timeout)
+        self._max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self._embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embeddings.embed_query(text)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        instruction = self._embeddings.embed_instruction
+        return list(await asyncio.gather(*(self._aembed(f"{instruction}{text}") for text in texts)))
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return await self._aembed(f"{self._embeddings.query_instruction}{text}")
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """Embed several queries concurrently, ``max_concurrency`` requests at a time."""
+        if not texts:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self._max_concurrency, len(texts))) as executor:
+            return list(executor.map(self.embed_query, texts))
+
+    async def aembed_queries(self, texts: list[str]) -> list[list[float]]:
+        """Embed several queries concurrently, ``max_concurrency`` requests at a time.
+
+        Ollama's batch ``/api/embed`` endpoint normalizes its output, so its vectors would
+        not be comparable with the ones stored in Chroma; each query is its own request.
+        """
+        instruction = self._embeddings.query_instruction
+        return list(await asyncio.gather(*(self._aembed(f"{instruction}{text}") for text in texts)))
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    def _options(self) -> dict:
+        return {name: getattr(self._embeddings, name) for name in OPTION_FIELDS}
+
+    async def _aembed(self, prompt: str) -> list[float]:
+        async with self._semaphore:
+            response = await self._client.post(
+                f"{self._embeddings.base_url}/api/embeddings",
+                json={"model": self._embeddings.model, "prompt": prompt, "options": self._options()},
+                headers={"Content-Type": "application/json", **(self._embeddings.headers or {})},
+            )
+        if response.status_code != 200:
+            raise ValueError(f"Error raised by inference API HTTP code: {response.status_code}, {response.text}")
+        embedding: list[float] = response.json()["embedding"]
+        return embedding
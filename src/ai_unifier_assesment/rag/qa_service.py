@@ -1,16 +1,36 @@
 import time
-from typing import Annotated
+from dataclasses import dataclass
+from typing import Annotated, Optional
 
 from fastapi import Depends
 from langchain_community.llms import Ollama
 from langchain_core.documents import Document
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnablePassthrough
 
 from ai_unifier_assesment.config import Settings
-from ai_unifier_assesment.dependencies import get_cached_settings
+from ai_unifier_assesment.dependencies import get_cached_settings, get_resource_registry
+from ai_unifier_assesment.rag.answer_cache import SemanticAnswerCache, get_answer_cache
+from ai_unifier_assesment.rag.context_packer import pack_context
+from ai_unifier_assesment.rag.retrieval_cache import RetrievalCache, get_retrieval_cache
 from ai_unifier_assesment.rag.vector_store_service import VectorStoreService
+from ai_unifier_assesment.resource_registry import ResourceRegistry
+from ai_unifier_assesment.services.stream_metrics import encoding_registry
+
+# tiktoken has no Llama encoding, so the registry counts its tokens with cl100k_base, the base of Llama 3's vocabulary
+QA_MODEL = "llama3.2"
+
+
+@dataclass
+class RetrievedContext:
+    collection_name: str
+    answer_scope: str
+    embedding: list[float]
+    version: Optional[str]
+    docs: list[Document]
+    sources: list[dict]
+    retrieval_time_ms: float
+    cached_answer: Optional[str] = None
 
 
 class QAService:
@@ -18,23 +38,35 @@ class QAService:
         self,
         settings: Annotated[Settings, Depends(get_cached_settings)],
         vector_store_service: Annotated[VectorStoreService, Depends(VectorStoreService)],
+        registry: Annotated[ResourceRegistry | None, Depends(get_resource_registry)] = None,
+        answer_cache: Annotated[SemanticAnswerCache | None, Depends(get_answer_cache)] = None,
+        retrieval_cache: Annotated[RetrievalCache | None, Depends(get_retrieval_cache)] = None,
     ):
         self._settings = settings
         self._vector_store_service = vector_store_service
+        self._registry = registry
+        self._answer_cache = answer_cache
+        self._retrieval_cache = retrieval_cache
 
-    def get_llm(self) -> Ollama:
+    def _create_llm(self) -> Ollama:
         return Ollama(
-            model="llama3.2",
+            model=QA_MODEL,
             base_url=self._settings.ollama.base_url,
         )
 
+    def get_llm(self) -> Ollama:
+        if self._registry is None:
+            return self._create_llm()
+        return self._registry.get_or_create("ollama.qa_llm", self._create_llm)
+
     def format_docs_with_citations(self, docs: list[Document]) -> str:
-        formatted = []
-        for i, doc in enumerate(docs):
-            source = doc.metadata.get("source", "Unknown")
-            page = doc.metadata.get("page", "N/A")
-            formatted.append(f"[Source {i + 1}: {source}, Page {page}]\n{doc.page_content}")
-        return "\n\n".join(formatted)
+        """Context for the prompt: overlapping chunks merged, cited by retrieval rank, within the token budget."""
+        return pack_context(docs, self._settings.rag.context_token_budget, self._count_tokens)
+
+    @staticmethod
+    def _count_tokens(text: str) -> int:
+        # Retrieved text is untrusted, so special-token markers in it are counted as plain text
+        return len(encoding_registry.get(QA_MODEL).encode(text, disallowed_special=()))
 
     def get_prompt(self) -> ChatPromptTemplate:
         return ChatPromptTemplate.from_template(
@@ -49,52 +81,300 @@ Question: {question}
 Answer with citations:"""
         )
 
-    def create_chain(self, retriever):
-        prompt = self.get_prompt()
-        llm = self.get_llm()
+    def create_chain(self):
+        """Answer chain over already retrieved context, so a question is only embedded and searched once."""
+        return self.get_prompt() | self.get_llm() | StrOutputParser()
 
-        chain = (
-            {"context": retriever | self.format_docs_with_citations, "question": RunnablePassthrough()}
-            | prompt
-            | llm
-            | StrOutputParser()
-        )
-        return chain
+    @staticmethod
+    def _answer_scope(collection_name: str, fetch_k: int, lambda_mult: float) -> str:
+        # MMR parameters change which sources an answer is built from, so each combination gets its own answers
+        return f"{collection_name}:mmr:{fetch_k}:{lambda_mult}"
+
+    def _uses_retrieval_cache(self) -> bool:
+        return self._retrieval_cache is not None and self._retrieval_cache.enabled
+
+    def _retrieval_key(
+        self, question: str, collection_name: str, k: int, fetch_k: int, lambda_mult: float, version: Optional[str]
+    ) -> Optional[tuple]:
+        if not self._uses_retrieval_cache():
+            return None
+        version = version or self._vector_store_service.get_collection_version(collection_name)
+        return RetrievalCache.key(collection_name, version, question, k, "mmr", fetch_k, lambda_mult)
 
-    def answer(self, question: str, collection_name: str = "rag_corpus") -> dict:
-        retriever = self._vector_store_service.get_retriever(collection_name)
+    async def _aretrieval_key(
+        self, question: str, collection_name: str, k: int, fetch_k: int, lambda_mult: float, version: Optional[str]
+    ) -> Optional[tuple]:
+        if not self._uses_retrieval_cache():
+            return None
+        version = version or await self._vector_store_service.aget_collection_version(collection_name)
+        return RetrievalCache.key(collection_name, version, question, k, "mmr", fetch_k, lambda_mult)
 
+    def _cached_docs(self, key: Optional[tuple]) -> Optional[list[Document]]:
+        if key is None or self._retrieval_cache is None:
+            return None
+        return self._retrieval_cache.get(key)
+
+    def _cache_docs(self, key: Optional[tuple], docs: list[Document]) -> None:
+        if key is None or self._retrieval_cache is None:
+            return
+        self._retrieval_cache.put(key, docs)
+
+    def _retrieve(
+        self,
+        question: str,
+        collection_name: str,
+        k: int,
+        fetch_k: int,
+        lambda_mult: float,
+        version: Optional[str] = None,
+    ) -> list[Document]:
+        """Retrieve through the retrieval cache, so an exact repeat costs a dictionary lookup."""
+        key = self._retrieval_key(question, collection_name, k, fetch_k, lambda_mult, version)
+        docs = self._cached_docs(key)
+        if docs is None:
+            retriever = self._vector_store_service.get_retriever(
+                collection_name, k, fetch_k=fetch_k, lambda_mult=lambda_mult
+            )
+            docs = retriever.invoke(question)
+            self._cache_docs(key, docs)
+        return docs
+
+    def answer(
+        self, question: str, collection_name: str = "rag_corpus", fetch_k: int = 20, lambda_mult: float = 0.5
+    ) -> dict:
         start_time = time.time()
-        docs = retriever.invoke(question)
+        version = None
+        answer_scope = self._answer_scope(collection_name, fetch_k, lambda_mult)
+        if self._answer_cache is not None and self._answer_cache.enabled:
+            # The query embedding is cached, so the retriever below reuses it on a miss
+            version = self._vector_store_service.get_collection_version(collection_name)
+            embedding = self._vector_store_service.get_embeddings().embed_query(question)
+            cached = self._answer_cache.lookup(answer_scope, version, embedding)
+            if cached is not None:
+                return {
+                    "answer": cached["answer"],
+                    "sources": cached["sources"],
+                    "retrieval_time_ms": round((time.time() - start_time) * 1000, 2),
+                    "cached": True,
+                }
+
+        docs = self._retrieve(question, collection_name, 5, fetch_k, lambda_mult, version)
         retrieval_time_ms = (time.time() - start_time) * 1000
 
-        chain = self.create_chain(retriever)
-        answer = chain.invoke(question)
+        chain = self.create_chain()
+        answer = chain.invoke({"context": self.format_docs_with_citations(docs), "question": question})
+        sources = self._sources(docs)
+
+        # The version is only looked up when the answer cache is enabled
+        if self._answer_cache is not None and version is not None:
+            self._answer_cache.store(answer_scope, version, embedding, {"answer": answer, "sources": sources})
 
         return {
             "answer": answer,
-            "sources": [
-                {"source": doc.metadata.get("source", "Unknown"), "page": doc.metadata.get("page", "N/A")}
-                for doc in docs
-            ],
+            "sources": sources,
             "retrieval_time_ms": round(retrieval_time_ms, 2),
+            "cached": False,
         }
 
-    def retrieve_only(self, question: str, collection_name: str = "rag_corpus", k: int = 5) -> dict:
-        retriever = self._vector_store_service.get_retriever(collection_name, k)
+    def retrieve_only(
+        self,
+        question: str,
+        collection_name: str = "rag_corpus",
+        k: int = 5,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+    ) -> dict:
+        start_time = time.time()
+        docs = self._retrieve(question, collection_name, k, fetch_k, lambda_mult)
+        retrieval_time_ms = (time.time() - start_time) * 1000
+
+        return {"documents": self._documents(docs), "retrieval_time_ms": round(retrieval_time_ms, 2)}
 
+    async def aretrieve_context(
+        self, question: str, collection_name: str = "rag_corpus", fetch_k: int = 20, lambda_mult: float = 0.5
+    ) -> RetrievedContext:
+        """Embed the question once, then serve it from the answer cache or retrieve its documents."""
         start_time = time.time()
-        docs = retriever.invoke(question)
+        embedding = await self._vector_store_service.get_embeddings().aembed_query(question)
+        version = None
+        answer_scope = self._answer_scope(collection_name, fetch_k, lambda_mult)
+        if self._answer_cache is not None and self._answer_cache.enabled:
+            version = await self._vector_store_service.aget_collection_version(collection_name)
+            cached = self._answer_cache.lookup(answer_scope, version, embedding)
+            if cached is not None:
+                return RetrievedContext(
+                    collection_name=collection_name,
+                    answer_scope=answer_scope,
+                    embedding=embedding,
+                    version=version,
+                    docs=[],
+                    sources=cached["sources"],
+                    retrieval_time_ms=round((time.time() - start_time) * 1000, 2),
+                    cached_answer=cached["answer"],
+                )
+
+        key = await self._aretrieval_key(question, collection_name, 5, fetch_k, lambda_mult, version)
+        docs = self._cached_docs(key)
+        if docs is None:
+            docs = await self._vector_store_service.aretrieve_by_vector(
+                embedding, collection_name, fetch_k=fetch_k, lambda_mult=lambda_mult, query=question
+            )
+            self._cache_docs(key, docs)
+        return RetrievedContext(
+            collection_name=collection_name,
+            answer_scope=answer_scope,
+            embedding=embedding,
+            version=version,
+            docs=docs,
+            sources=self._sources(docs),
+            retrieval_time_ms=round((time.time() - start_time) * 1000, 2),
+        )
+
+    def remember_answer(self, context: RetrievedContext, answer: str) -> None:
+        if context.version is None or self._answer_cache is None:
+            return
+        self._answer_cache.store(
+            context.answer_scope, context.version, context.embedding, {"answer": answer, "sources": context.sources}
+        )
+
+    async def aanswer(
+        self, question: str, collection_name: str = "rag_corpus", fetch_k: int = 20, lambda_mult: float = 0.5
+    ) -> dict:
+        """Async variant of ``answer``: embedding, Chroma query and LLM call never block the event loop."""
+        context = await self.aretrieve_context(question, collection_name, fetch_k, lambda_mult)
+        answer = context.cached_answer
+        if answer is None:
+            answer = await self.create_chain().ainvoke(
+                {"context": self.format_docs_with_citations(context.docs), "question": question}
+            )
+            self.remember_answer(context, answer)
+
+        return {
+            "answer": answer,
+            "sources": context.sources,
+            "retrieval_time_ms": context.retrieval_time_ms,
+            "cached": context.cached_answer is not None,
+        }
+
+    async def aretrieve_only(
+        self,
+        question: str,
+        collection_name: str = "rag_corpus",
+        k: int = 5,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+    ) -> dict:
+        start_time = time.time()
+        key = await self._aretrieval_key(question, collection_name, k, fetch_k, lambda_mult, None)
+        docs = self._cached_docs(key)
+        if docs is None:
+            docs = await self._vector_store_service.aretrieve(question, collection_name, k, fetch_k, lambda_mult)
+            self._cache_docs(key, docs)
         retrieval_time_ms = (time.time() - start_time) * 1000
 
+        return {"documents": self._documents(docs), "retrieval_time_ms": round(retrieval_time_ms, 2)}
+
+    def retrieve_many(
+        self,
+        questions: list[str],
+        collection_name: str = "rag_corpus",
+        k: int = 5,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+    ) -> dict:
+        """Retrieve for many questions at once: cached ones are looked up, the rest share one batched search."""
+        start_time = time.time()
+        version = None
+        if self._uses_retrieval_cache():
+            version = self._vector_store_service.get_collection_version(collection_name)
+        keys = [
+            self._retrieval_key(question, collection_name, k, fetch_k, lambda_mult, version) for question in questions
+        ]
+        cached = [self._cached_docs(key) for key in keys]
+        lookup_ms = (time.time() - start_time) * 1000
+
+        misses = [i for i, found in enumerate(cached) if found is None]
+        batch_start = time.time()
+        retrieved: list[list[Document]] = []
+        if misses:
+            retrieved = self._vector_store_service.retrieve_many(
+                [questions[i] for i in misses], collection_name, k, fetch_k, lambda_mult
+            )
+        docs = self._fill_misses(keys, cached, retrieved)
+        return self._batch_result(docs, misses, lookup_ms, (time.time() - batch_start) * 1000, start_time)
+
+    async def aretrieve_many(
+        self,
+        questions: list[str],
+        collection_name: str = "rag_corpus",
+        k: int = 5,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+    ) -> dict:
+        start_time = time.time()
+        version = None
+        if self._uses_retrieval_cache():
+            version = await self._vector_store_service.aget_collection_version(collection_name)
+        keys = [
+            self._retrieval_key(question, collection_name, k, fetch_k, lambda_mult, version) for question in questions
+        ]
+        cached = [self._cached_docs(key) for key in keys]
+        lookup_ms = (time.time() - start_time) * 1000
+
+        misses = [i for i, found in enumerate(cached) if found is None]
+        batch_start = time.time()
+        retrieved: list[list[Document]] = []
+        if misses:
+            retrieved = await self._vector_store_service.aretrieve_many(
+                [questions[i] for i in misses], collection_name, k, fetch_k, lambda_mult
+            )
+        docs = self._fill_misses(keys, cached, retrieved)
+        return self._batch_result(docs, misses, lookup_ms, (time.time() - batch_start) * 1000, start_time)
+
+    def _fill_misses(
+        self,
+        keys: list[Optional[tuple]],
+        cached: list[Optional[list[Document]]],
+        retrieved: list[list[Document]],
+    ) -> list[list[Document]]:
+        """Fill the cache misses in order with the retrieved documents, caching each."""
+        searched = iter(retrieved)
+        docs = []
+        for key, found in zip(keys, cached, strict=True):
+            if found is None:
+                found = next(searched)
+                self._cache_docs(key, found)
+            docs.append(found)
+        return docs
+
+    def _batch_result(
+        self, docs: list[list[Document]], misses: list[int], lookup_ms: float, batch_ms: float, start_time: float
+    ) -> dict:
+        # Each question is charged an equal share of the lookups, and searched questions a share of the batch
+        times = [lookup_ms / len(docs) if docs else 0.0] * len(docs)
+        for i in misses:
+            times[i] += batch_ms / len(misses)
         return {
-            "documents": [
-                {
-                    "content": doc.page_content,
-                    "source": doc.metadata.get("source", "Unknown"),
-                    "page": doc.metadata.get("page", "N/A"),
-                }
-                for doc in docs
+            "results": [
+                {"documents": self._documents(found), "retrieval_time_ms": round(elapsed, 2)}
+                for found, elapsed in zip(docs, times, strict=True)
             ],
-            "retrieval_time_ms": round(retrieval_time_ms, 2),
+            "retrieval_time_ms": round((time.time() - start_time) * 1000, 2),
         }
+
+    @staticmethod
+    def _sources(docs: list[Document]) -> list[dict]:
+        return [
+            {"source": doc.metadata.get("source", "Unknown"), "page": doc.metadata.get("page", "N/A")} for doc in docs
+        ]
+
+    @staticmethod
+    def _documents(docs: list[Document]) -> list[dict]:
+        return [
+            {
+                "content": doc.page_content,
+                "source": doc.metadata.get("source", "Unknown"),
+                "page": doc.metadata.get("page", "N/A"),
+            }
+            for doc in docs
+        ]
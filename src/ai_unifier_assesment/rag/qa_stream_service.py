@@ -0,0 +1,66 @@
+import json
+import time
+from typing import Annotated, AsyncGenerator
+
+from fastapi import Depends
+
+from ai_unifier_assesment.rag.qa_service import QAService
+from ai_unifier_assesment.services.metrics_sink import MetricsSink, get_metrics_sink
+from ai_unifier_assesment.services.stream_metrics import StreamMetrics, TokenCounter
+
+
+class QAStreamService:
+    """Streams a RAG answer as SSE: sources first, then answer tokens, then stats."""
+
+    def __init__(
+        self,
+        qa_service: Annotated[QAService, Depends(QAService)],
+        metrics: Annotated[StreamMetrics, Depends(StreamMetrics)],
+        token_counter: Annotated[TokenCounter, Depends(TokenCounter)],
+        metrics_sink: Annotated[MetricsSink, Depends(get_metrics_sink)],
+    ):
+        self._qa_service = qa_service
+        self._metrics = metrics
+        self._token_counter = token_counter
+        self._metrics_sink = metrics_sink
+
+    @staticmethod
+    def _data_event(text: str) -> str:
+        # Answers contain newlines, every line needs its own data field to survive SSE framing
+        return "".join(f"data: {line}\n" for line in text.split("\n")) + "\n"
+
+    async def stream_answer(
+        self, question: str, collection_name: str = "rag_corpus", fetch_k: int = 20, lambda_mult: float = 0.5
+    ) -> AsyncGenerator[str, None]:
+        start_time = time.time()
+        context = await self._qa_service.aretrieve_context(question, collection_name, fetch_k, lambda_mult)
+        cached = context.cached_answer is not None
+        sources_event = {"sources": context.sources, "retrieval_time_ms": context.retrieval_time_ms, "cached": cached}
+        yield f"event: sources\ndata: {json.dumps(sources_event)}\n\n"
+
+        prompt_tokens = completion_tokens = 0
+        if (answer := context.cached_answer) is not None:
+            yield self._data_event(answer)
+        else:
+            inputs = {"context": self._qa_service.format_docs_with_citations(context.docs), "question": question}
+            prompt_tokens = self._token_counter.count_text_tokens(self._qa_service.get_prompt().format(**inputs))
+            parts = []
+            async for token in self._qa_service.create_chain().astream(inputs):
+                if token:
+                    parts.append(token)
+                    completion_tokens += self._token_counter.count_text_tokens(token)
+                    yield self._data_event(token)
+            self._qa_service.remember_answer(context, "".join(parts))
+
+        stats = self._metrics.build_stats(start_time, prompt_tokens, completion_tokens)
+        self._metrics_sink.record(
+            endpoint="rag_qa",
+            session_id=None,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost=stats["cost"],
+            latency_ms=stats["latency_ms"],
+            metadata={"collection_name": collection_name, "cached": cached},
+        )
+
+        yield f"event: stats\ndata: {json.dumps(stats)}\n\n"
@@ -0,0 +1,21 @@
+from langchain_core.documents import Document
+
+# The constant from the original RRF paper; it damps the advantage of the very top ranks
+DEFAULT_RRF_K = 60
+
+
+def reciprocal_rank_fusion(rankings: list[list[Document]], k: int, rrf_k: int = DEFAULT_RRF_K) -> list[Document]:
+    """Merge ranked lists by summing ``1 / (rrf_k + rank)`` per document and keep the top ``k``.
+
+    Documents are matched across lists by ID (content when there is none). Ties keep the
+    order in which documents were first seen, so earlier lists win them.
+    """
+    scores: dict[str, float] = {}
+    documents: dict[str, Document] = {}
+    for ranking in rankings:
+        for rank, document in enumerate(ranking, start=1):
+            key = document.id or document.page_content
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            documents.setdefault(key, document)
+    best = sorted(scores, key=lambda key: scores[key], reverse=True)[:k]
+    return [documents[key] for key in best]
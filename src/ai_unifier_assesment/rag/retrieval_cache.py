@@ -0,0 +1,83 @@
+import threading
+from collections import OrderedDict
+from typing import Annotated, Hashable, Optional
+
+from fastapi import Depends
+from langchain_core.documents import Document
+
+from ai_unifier_assesment.config import Settings
+from ai_unifier_assesment.dependencies import get_cached_settings, get_resource_registry
+from ai_unifier_assesment.resource_registry import ResourceRegistry
+
+
+class RetrievalCache:
+    """LRU cache of retrieved documents for exact repeats of a retrieval request.
+
+    Keys include the collection's ingest version, so re-ingesting a collection makes
+    its earlier results unreachable; they age out as newer entries are stored. At most
+    ``max_entries`` results are kept, evicting the least recently used.
+    """
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Hashable, list[Document]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    @staticmethod
+    def key(
+        collection_name: str,
+        version: str,
+        query: str,
+        k: int,
+        search_type: str,
+        fetch_k: int,
+        lambda_mult: float,
+    ) -> tuple:
+        return collection_name, version, query, k, search_type, fetch_k, lambda_mult
+
+    def get(self, key: Hashable) -> Optional[list[Document]]:
+        with self._lock:
+            docs = self._entries.get(key)
+            if docs is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return list(docs)
+
+    def put(self, key: Hashable, docs: list[Document]) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = list(docs)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def get_retrieval_cache(
+    settings: Annotated[Settings, Depends(get_cached_settings)],
+    registry: Annotated[ResourceRegistry, Depends(get_resource_registry)],
+) -> RetrievalCache:
+    return registry.get_or_create(
+        "rag.retrieval_cache", lambda: RetrievalCache(settings.answer_cache.retrieval_max_entries)
+    )
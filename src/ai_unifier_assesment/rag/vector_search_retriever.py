@@ -0,0 +1,19 @@
+from typing import Callable
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+
+class VectorSearchRetriever(BaseRetriever):
+    """Embeds the query and hands it, with its vector, to ``search``, so any vector search can serve as a retriever."""
+
+    embeddings: Embeddings
+    search: Callable[[str, list[float]], list[Document]]
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> list[Document]:
+        return self.search(query, self.embeddings.embed_query(query))
@@ -1,14 +1,29 @@
-from typing import Annotated
+from pathlib import Path
+from typing import Annotated, Any, Optional
+import asyncio
 import logging
 
 import chromadb
-from chromadb import ClientAPI
+import numpy as np
+from chromadb import ClientAPI, Collection
+from chromadb.errors import NotFoundError
 from fastapi import Depends
 from langchain_chroma import Chroma
 
 from ai_unifier_assesment.config import Settings
-from ai_unifier_assesment.dependencies import get_cached_settings
+from ai_unifier_assesment.dependencies import get_cached_settings, get_resource_registry
+from ai_unifier_assesment.rag.async_vector_search import AsyncChromaSearch, mmr_documents
+from ai_unifier_assesment.rag.cached_embeddings import aembed_queries, embed_queries
+from ai_unifier_assesment.rag.collection_versions import CollectionVersions
 from ai_unifier_assesment.rag.embedding_service import EmbeddingService
+from ai_unifier_assesment.rag import lexical_index, local_index
+from ai_unifier_assesment.rag.lexical_index import LexicalIndexStore, build_lexical_index
+from ai_unifier_assesment.rag.local_index import LocalIndexStore, LocalVectorIndex, build_local_index
+from ai_unifier_assesment.rag.rank_fusion import reciprocal_rank_fusion
+from ai_unifier_assesment.rag.vector_search_retriever import VectorSearchRetriever
+from ai_unifier_assesment.resource_registry import ResourceRegistry
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.vectorstores import VectorStore
 
@@ -18,12 +33,23 @@ class VectorStoreService:
         self,
         settings: Annotated[Settings, Depends(get_cached_settings)],
         embedding_service: Annotated[EmbeddingService, Depends(EmbeddingService)],
+        registry: Annotated[ResourceRegistry | None, Depends(get_resource_registry)] = None,
     ):
         self._settings = settings
         self._embedding_service = embedding_service
+        self._registry = registry
         self._logger = logging.getLogger(__name__)
 
     def get_client(self) -> ClientAPI:
+        if self._registry is None:
+            return self._create_client()
+        return self._registry.get_or_create(
+            "chroma.client",
+            self._create_client,
+            closer=lambda client: client.clear_system_cache(),
+        )
+
+    def _create_client(self) -> ClientAPI:
         try:
             return chromadb.HttpClient(
                 host=self._settings.chroma.host,
@@ -35,25 +61,308 @@ class VectorStoreService:
             )
             raise ConnectionError(f"Unable to establish connection to ChromaDB server: {e}") from e
 
+    def get_collection(self, collection_name: str = "rag_corpus") -> Collection:
+        """Raw Chroma collection for writers that bring their own embeddings and for vector queries."""
+        if self._registry is None:
+            return self.get_client().get_or_create_collection(collection_name)
+        return self._registry.get_or_create(
+            f"chroma.collection.{collection_name}",
+            lambda: self.get_client().get_or_create_collection(collection_name),
+        )
+
+    def refresh_collection(self, collection_name: str = "rag_corpus") -> Collection:
+        """Fetch the collection again instead of reusing the cached handle.
+
+        A collection deleted and recreated, e.g. in a fresh Chroma, gets a new ID that the
+        cached handle does not know; writers and exporters start from a fresh handle.
+        """
+        if self._registry is not None:
+            self._registry.discard(f"chroma.collection.{collection_name}")
+        return self.get_collection(collection_name)
+
+    def _query(self, collection_name: str, **kwargs: Any) -> Any:
+        """Query the cached collection, refetching its handle once if Chroma no longer knows it."""
+        try:
+            return self.get_collection(collection_name).query(**kwargs)
+        except NotFoundError as e:
+            self._logger.warning(f"Cached collection {collection_name} not found, refetching it: {e}")
+        return self.refresh_collection(collection_name).query(**kwargs)
+
     def get_vector_store(self, collection_name: str = "rag_corpus") -> VectorStore:
+        # Not cached: the wrapper holds its collection handle, which would go stale if the collection is recreated
         return Chroma(
             client=self.get_client(),
             collection_name=collection_name,
             embedding_function=self._embedding_service.get_embeddings(),
         )
 
+    def get_embeddings(self) -> Embeddings:
+        return self._embedding_service.get_embeddings()
+
+    def _collection_versions(self) -> CollectionVersions:
+        ttl_seconds = self._settings.answer_cache.collection_version_ttl_seconds
+        if self._registry is None:
+            return CollectionVersions(ttl_seconds)
+        return self._registry.get_or_create("chroma.collection_versions", lambda: CollectionVersions(ttl_seconds))
+
+    def get_collection_version(self, collection_name: str = "rag_corpus") -> str:
+        if self.uses_local_index():
+            return self.get_local_index(collection_name).version
+        return self._collection_versions().get(self.get_client(), collection_name)
+
+    def bump_collection_version(self, collection_name: str = "rag_corpus") -> str:
+        """Mark the collection as re-ingested so answers cached against it are discarded."""
+        return self._collection_versions().bump(self.get_client(), collection_name)
+
+    def uses_local_index(self) -> bool:
+        return self._settings.rag.vector_backend == "local"
+
+    def get_local_index_store(self) -> LocalIndexStore:
+        def create() -> LocalIndexStore:
+            return LocalIndexStore(
+                self._settings.rag.index_dir, self._settings.answer_cache.collection_version_ttl_seconds
+            )
+
+        if self._registry is None:
+            return create()
+        return self._registry.get_or_create("local_index.store", create)
+
+    def get_local_index(self, collection_name: str = "rag_corpus") -> LocalVectorIndex:
+        return self.get_local_index_store().get(collection_name)
+
+    def _published_version(self, collection_name: str) -> str:
+        version = self._collection_versions().get(self.get_client(), collection_name)
+        if not version:
+            # Collections ingested before versioning existed get one, indexes are stored under it
+            version = self.bump_collection_version(collection_name)
+        return version
+
+    def publish_local_index(self, collection_name: str = "rag_corpus", force: bool = False) -> Optional[Path]:
+        """Export the Chroma collection for the local backend unless its current version is already exported."""
+        version = self._published_version(collection_name)
+        if not force and local_index.current_version(self._settings.rag.index_dir, collection_name) == version:
+            return None
+        return build_local_index(
+            self.refresh_collection(collection_name),
+            self._settings.rag.index_dir,
+            version,
+            quantization=self._settings.rag.index_quantization,
+        )
+
+    def uses_hybrid_search(self) -> bool:
+        return self._settings.rag.hybrid_search
+
+    def get_lexical_index_store(self) -> LexicalIndexStore:
+        def create() -> LexicalIndexStore:
+            return LexicalIndexStore(
+                self._settings.rag.index_dir, self._settings.answer_cache.collection_version_ttl_seconds
+            )
+
+        if self._registry is None:
+            return create()
+        return self._registry.get_or_create("lexical_index.store", create)
+
+    def publish_lexical_index(self, collection_name: str = "rag_corpus", force: bool = False) -> Optional[Path]:
+        """Build the BM25 index of the collection unless its current version is already built."""
+        version = self._published_version(collection_name)
+        if not force and lexical_index.current_version(self._settings.rag.index_dir, collection_name) == version:
+            return None
+        return build_lexical_index(self.refresh_collection(collection_name), self._settings.rag.index_dir, version)
+
+    def lexical_search(self, query: str, collection_name: str = "rag_corpus", n: int = 20) -> list[Document]:
+        """Best ``n`` BM25 matches, or none when hybrid search is off or the index was never built."""
+        if not self.uses_hybrid_search():
+            return []
+        try:
+            index = self.get_lexical_index_store().get(collection_name)
+        except FileNotFoundError as e:
+            self._logger.debug(f"Skipping lexical search: {e}")
+            return []
+        return index.documents(index.search(query, n)[0])
+
+    def _lexical_search_many(self, queries: list[str], collection_name: str, n: int) -> list[list[Document]]:
+        return [self.lexical_search(query, collection_name, n) for query in queries]
+
+    def _fuse(self, dense: list[Document], lexical: list[Document], k: int) -> list[Document]:
+        if not lexical:
+            return dense
+        return reciprocal_rank_fusion([dense, lexical], k, self._settings.rag.rrf_k)
+
+    def get_async_search(self) -> AsyncChromaSearch:
+        if self._registry is None:
+            return self._create_async_search()
+        return self._registry.get_or_create("chroma.async_search", self._create_async_search)
+
+    def _create_async_search(self) -> AsyncChromaSearch:
+        return AsyncChromaSearch(self._settings.chroma.host, self._settings.chroma.port)
+
+    async def aget_collection_version(self, collection_name: str = "rag_corpus") -> str:
+        if self.uses_local_index():
+            return (await asyncio.to_thread(self.get_local_index, collection_name)).version
+        client = await self.get_async_search().get_client()
+        return await self._collection_versions().aget(client, collection_name)
+
+    async def aretrieve(
+        self,
+        question: str,
+        collection_name: str = "rag_corpus",
+        k: int = 5,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+    ) -> list[Document]:
+        embedding = await self.get_embeddings().aembed_query(question)
+        return await self.aretrieve_by_vector(embedding, collection_name, k, fetch_k, lambda_mult, query=question)
+
+    async def aretrieve_many(
+        self,
+        questions: list[str],
+        collection_name: str = "rag_corpus",
+        k: int = 5,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+    ) -> list[list[Document]]:
+        """Async counterpart of ``retrieve_many``."""
+        embeddings = await aembed_queries(self.get_embeddings(), questions)
+        if self.uses_local_index():
+            dense_search = asyncio.to_thread(
+                self._dense_search_many, embeddings, collection_name, k, fetch_k, lambda_mult
+            )
+        else:
+            dense_search = self.get_async_search().max_marginal_relevance_search_by_vectors(
+                collection_name, embeddings, k=k, fetch_k=fetch_k, lambda_mult=lambda_mult
+            )
+        if not self.uses_hybrid_search():
+            return await dense_search
+
+        dense, lexical = await asyncio.gather(
+            dense_search, asyncio.to_thread(self._lexical_search_many, questions, collection_name, fetch_k)
+        )
+        return [self._fuse(docs, matches, k) for docs, matches in zip(dense, lexical, strict=True)]
+
+    async def aretrieve_by_vector(
+        self,
+        embedding: list[float],
+        collection_name: str = "rag_corpus",
+        k: int = 5,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        query: Optional[str] = None,
+    ) -> list[Document]:
+        """Async counterpart of ``retrieve_by_vector``; the dense and lexical searches run concurrently."""
+        if self.uses_local_index():
+            # Scanning the probed lists is CPU work, and a refresh may load a new index from disk
+            dense_search = asyncio.to_thread(self._dense_search, embedding, collection_name, k, fetch_k, lambda_mult)
+        else:
+            dense_search = self.get_async_search().max_marginal_relevance_search_by_vector(
+                collection_name, embedding, k=k, fetch_k=fetch_k, lambda_mult=lambda_mult
+            )
+        if query is None or not self.uses_hybrid_search():
+            return await dense_search
+
+        dense, lexical = await asyncio.gather(
+            dense_search, asyncio.to_thread(self.lexical_search, query, collection_name, fetch_k)
+        )
+        return self._fuse(dense, lexical, k)
+
+    def retrieve_by_vector(
+        self,
+        embedding: list[float],
+        collection_name: str = "rag_corpus",
+        k: int = 5,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        query: Optional[str] = None,
+    ) -> list[Document]:
+        """MMR search: the ``fetch_k`` nearest chunks are re-ranked in process down to ``k``.
+
+        With hybrid search and a ``query``, the result is fused with the best BM25 matches
+        by reciprocal rank, which recovers exact-term hits such as names dense retrieval misses.
+        """
+        dense = self._dense_search(embedding, collection_name, k, fetch_k, lambda_mult)
+        if query is None:
+            return dense
+        return self._fuse(dense, self.lexical_search(query, collection_name, fetch_k), k)
+
+    def retrieve_many(
+        self,
+        questions: list[str],
+        collection_name: str = "rag_corpus",
+        k: int = 5,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+    ) -> list[list[Document]]:
+        """Retrieve for several questions: queries are embedded concurrently and searched together.
+
+        Chroma gets one multi-query request; the local index scores each block of queries in
+        one matrix product. Each question gets the documents ``retrieve_by_vector`` would
+        return for it alone.
+        """
+        embeddings = embed_queries(self.get_embeddings(), questions)
+        dense = self._dense_search_many(embeddings, collection_name, k, fetch_k, lambda_mult)
+        lexical = self._lexical_search_many(questions, collection_name, fetch_k)
+        return [self._fuse(docs, matches, k) for docs, matches in zip(dense, lexical, strict=True)]
+
+    def _dense_search_many(
+        self, embeddings: list[list[float]], collection_name: str, k: int, fetch_k: int, lambda_mult: float
+    ) -> list[list[Document]]:
+        if not embeddings:
+            return []
+        if self.uses_local_index():
+            return self.get_local_index(collection_name).max_marginal_relevance_search_by_vectors(
+                embeddings, k=k, fetch_k=fetch_k, lambda_mult=lambda_mult, nprobe=self._settings.rag.index_nprobe
+            )
+        results = self._query(
+            collection_name,
+            query_embeddings=np.asarray(embeddings, dtype=np.float32),
+            n_results=fetch_k,
+            include=["metadatas", "documents", "distances", "embeddings"],
+        )
+        return [mmr_documents(results, embedding, k, lambda_mult, i) for i, embedding in enumerate(embeddings)]
+
+    def _dense_search(
+        self, embedding: list[float], collection_name: str, k: int, fetch_k: int, lambda_mult: float
+    ) -> list[Document]:
+        if self.uses_local_index():
+            return self.get_local_index(collection_name).max_marginal_relevance_search_by_vector(
+                embedding, k=k, fetch_k=fetch_k, lambda_mult=lambda_mult, nprobe=self._settings.rag.index_nprobe
+            )
+        results = self._query(
+            collection_name,
+            query_embeddings=np.asarray([embedding], dtype=np.float32),
+            n_results=fetch_k,
+            include=["metadatas", "documents", "distances", "embeddings"],
+        )
+        return mmr_documents(results, embedding, k, lambda_mult)
+
     def get_retriever(
         self,
         collection_name: str = "rag_corpus",
         k: int = 5,
         search_type: str = "mmr",
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
         **kwargs,
     ) -> BaseRetriever:
-        vector_store = self.get_vector_store(collection_name)
-        search_kwargs = {"k": k, "fetch_k": 20}
-        search_kwargs.update(kwargs)
+        if search_type == "mmr":
+            return VectorSearchRetriever(
+                embeddings=self.get_embeddings(),
+                search=lambda query, embedding: self.retrieve_by_vector(
+                    embedding, collection_name, k, fetch_k, lambda_mult, query=query
+                ),
+            )
 
-        return vector_store.as_retriever(
+        if self.uses_local_index():
+
+            def search(query: str, embedding: list[float]) -> list[Document]:
+                index = self.get_local_index(collection_name)
+                rows, _ = index.search(embedding, k, self._settings.rag.index_nprobe, rescore=fetch_k)
+                return index.documents(rows)
+
+            return VectorSearchRetriever(embeddings=self.get_embeddings(), search=search)
+
+        search_kwargs = {"k": k}
+        search_kwargs.update(kwargs)
+        return self.get_vector_store(collection_name).as_retriever(
             search_type=search_type,
             search_kwargs=search_kwargs,
         )
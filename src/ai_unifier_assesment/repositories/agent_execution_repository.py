@@ -0,0 +1,22 @@
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from ai_unifier_assesment.db.session import get_db_session
+from ai_unifier_assesment.models.agent_execution import AgentExecution
+
+
+class AgentExecutionRepository:
+    """SQLAlchemy repository for agent execution records."""
+
+    def __init__(self, session: Annotated[Session, Depends(get_db_session)]):
+        self._session = session
+
+    def create_many(self, rows: list[dict]) -> int:
+        """Insert pre-built agent execution rows with a single multi-row INSERT ... VALUES statement."""
+        if not rows:
+            return 0
+        self._session.execute(insert(AgentExecution), rows)
+        return len(rows)
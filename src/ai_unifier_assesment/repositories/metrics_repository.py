@@ -2,7 +2,7 @@ from datetime import datetime, timedelta
 from typing import Annotated, Optional
 
 from fastapi import Depends
-from sqlalchemy import desc
+from sqlalchemy import desc, insert
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.query import Query
 
@@ -41,6 +41,13 @@ class MetricsRepository:
         self._session.flush()
         return metric
 
+    def create_many(self, rows: list[dict]) -> int:
+        """Insert pre-built metric rows with a single multi-row INSERT ... VALUES statement."""
+        if not rows:
+            return 0
+        self._session.execute(insert(Metric), rows)
+        return len(rows)
+
     def get_all(
         self,
         endpoint: Optional[str] = None,
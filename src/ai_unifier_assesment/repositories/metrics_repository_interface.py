@@ -19,6 +19,10 @@ class MetricsRepositoryInterface(Protocol):
         """Create and persist a new metric record."""
         ...
 
+    def create_many(self, rows: list[dict]) -> int:
+        """Bulk insert metric rows keyed by Metric attribute names."""
+        ...
+
     def get_all(
         self,
         endpoint: Optional[str] = None,
@@ -0,0 +1,73 @@
+import inspect
+import logging
+import threading
+from typing import Any, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ResourceRegistry:
+    """Process-wide cache of heavy clients (engines, HTTP clients, LLM wrappers).
+
+    Each resource is created once per worker on first use and released in reverse
+    creation order when the FastAPI lifespan shuts down.
+    """
+
+    def __init__(self) -> None:
+        self._resources: dict[str, Any] = {}
+        self._closers: dict[str, Callable[[Any], Any] | None] = {}
+        # Re-entrant so a factory can resolve the resources it is composed of
+        self._lock = threading.RLock()
+
+    def get_or_create(self, key: str, factory: Callable[[], T], closer: Callable[[T], Any] | None = None) -> T:
+        resource = self._resources.get(key)
+        if resource is not None:
+            return resource  # type: ignore[no-any-return]
+
+        with self._lock:
+            if key not in self._resources:
+                logger.info(f"Creating shared resource: {key}")
+                self._resources[key] = factory()
+                self._closers[key] = closer
+            return self._resources[key]  # type: ignore[no-any-return]
+
+    def discard(self, key: str) -> None:
+        """Forget a resource without closing it, so the next ``get_or_create`` builds a new one."""
+        with self._lock:
+            self._resources.pop(key, None)
+            self._closers.pop(key, None)
+
+    def keys(self) -> list[str]:
+        return list(self._resources)
+
+    async def aclose(self) -> None:
+        with self._lock:
+            resources = list(self._resources.items())
+            closers = dict(self._closers)
+            self._resources.clear()
+            self._closers.clear()
+
+        for key, resource in reversed(resources):
+            try:
+                await self._close_resource(resource, closers.get(key))
+                logger.info(f"Closed shared resource: {key}")
+            except Exception as e:
+                logger.error(f"Failed to close shared resource {key}: {e}")
+
+    @staticmethod
+    async def _close_resource(resource: Any, closer: Callable[[Any], Any] | None) -> None:
+        if closer is not None:
+            result = closer(resource)
+        elif hasattr(resource, "aclose"):
+            result = resource.aclose()
+        elif hasattr(resource, "dispose"):
+            result = resource.dispose()
+        elif hasattr(resource, "close"):
+            result = resource.close()
+        else:
+            return
+
+        if inspect.isawaitable(result):
+            await result
@@ -5,8 +5,10 @@ from typing import Annotated
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
-from ai_unifier_assesment.agent.trip_planner_agent import TripPlannerAgent
-from ai_unifier_assesment.repositories.metrics_repository import MetricsRepository
+from ai_unifier_assesment.agent.trip_planner_agent import TripPlannerAgent, get_trip_planner_agent
+from ai_unifier_assesment.services.metrics_sink import MetricsSink, get_metrics_sink
+from ai_unifier_assesment.services.stream_metrics import StreamMetrics
+from ai_unifier_assesment.services.usage_collector import UsageCollector
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -23,25 +25,26 @@ class TripPlanResponse(BaseModel):
 @router.post("/api/plan-trip", response_model=TripPlanResponse)
 async def plan_trip(
     request: TripPlanRequest,
-    agent: Annotated[TripPlannerAgent, Depends(TripPlannerAgent)],
-    metrics_repo: Annotated[MetricsRepository, Depends(MetricsRepository)],
+    agent: Annotated[TripPlannerAgent, Depends(get_trip_planner_agent)],
+    metrics_sink: Annotated[MetricsSink, Depends(get_metrics_sink)],
+    stream_metrics: Annotated[StreamMetrics, Depends(StreamMetrics)],
 ) -> TripPlanResponse:
     start_time = time.time()
-    result = await agent.plan_trip(request.prompt)
+    usage = UsageCollector()
+    result = await agent.plan_trip(request.prompt, callbacks=[usage])
     latency_ms = (time.time() - start_time) * 1000
 
-    # Persist metrics (agent doesn't return token counts yet, so we'll estimate or skip)
-    try:
-        metrics_repo.create(
-            endpoint="agent",
-            session_id=None,
-            prompt_tokens=0,  # TODO: Implement token counting for agent
-            completion_tokens=0,
-            cost=0.0,  # TODO: Calculate cost based on model usage
-            latency_ms=latency_ms,
-            metadata={"prompt": request.prompt[:100]},  # Store truncated prompt
-        )
-    except Exception as e:
-        logger.error(f"Failed to persist agent metrics: {e}")
+    metrics_sink.record(
+        endpoint="agent",
+        session_id=None,
+        prompt_tokens=usage.prompt_tokens,
+        completion_tokens=usage.completion_tokens,
+        cost=stream_metrics.calculate_cost(usage.prompt_tokens, usage.completion_tokens),
+        latency_ms=latency_ms,
+        metadata={
+            "prompt": request.prompt[:100],  # Store truncated prompt
+            "nodes": usage.node_breakdown(stream_metrics.calculate_cost),
+        },
+    )
 
     return TripPlanResponse(itinerary=result["itinerary"])
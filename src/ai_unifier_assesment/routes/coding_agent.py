@@ -7,7 +7,7 @@ from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from ai_unifier_assesment.agent.coding_agent import CodingAgent
+from ai_unifier_assesment.agent.coding_agent import CodingAgent, get_coding_agent
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +24,7 @@ class CodeHealingRequest(BaseModel):
 @router.post("/api/heal-code/stream")
 async def heal_code_stream(
     request: CodeHealingRequest,
-    agent: Annotated[CodingAgent, Depends(CodingAgent)],
+    agent: Annotated[CodingAgent, Depends(get_coding_agent)],
 ):
     return StreamingResponse(
         agent.code_stream(request.task_description),
@@ -2,8 +2,17 @@ from typing import Annotated, Optional
 
 from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel, ConfigDict
+from sqlalchemy import Engine
 
+from ai_unifier_assesment.config import Settings
+from ai_unifier_assesment.db.session import get_engine, get_pool_stats
+from ai_unifier_assesment.dependencies import get_cached_settings
+from ai_unifier_assesment.rag.answer_cache import SemanticAnswerCache, get_answer_cache
+from ai_unifier_assesment.rag.embedding_service import EmbeddingService
+from ai_unifier_assesment.rag.retrieval_cache import RetrievalCache, get_retrieval_cache
 from ai_unifier_assesment.repositories.metrics_repository import MetricsRepository
+from ai_unifier_assesment.services.metrics_sink import MetricsSink, get_metrics_sink
+from ai_unifier_assesment.services.session_window_cache import SessionWindowCache, get_session_window_cache
 
 router = APIRouter()
 
@@ -23,6 +32,15 @@ class MetricResponse(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
+class RuntimeStatsResponse(BaseModel):
+    db_pool: dict
+    metrics_sink: dict
+    session_cache: dict
+    embedding_cache: dict
+    answer_cache: dict
+    retrieval_cache: dict
+
+
 @router.get("/api/metrics", response_model=list[MetricResponse])
 async def get_metrics(
     metrics_repo: Annotated[MetricsRepository, Depends(MetricsRepository)],
@@ -47,3 +65,24 @@ async def get_metrics(
         )
         for m in metrics
     ]
+
+
+@router.get("/api/metrics/runtime", response_model=RuntimeStatsResponse)
+async def get_runtime_stats(
+    engine: Annotated[Engine, Depends(get_engine)],
+    settings: Annotated[Settings, Depends(get_cached_settings)],
+    metrics_sink: Annotated[MetricsSink, Depends(get_metrics_sink)],
+    session_cache: Annotated[SessionWindowCache, Depends(get_session_window_cache)],
+    embedding_service: Annotated[EmbeddingService, Depends(EmbeddingService)],
+    answer_cache: Annotated[SemanticAnswerCache, Depends(get_answer_cache)],
+    retrieval_cache: Annotated[RetrievalCache, Depends(get_retrieval_cache)],
+):
+    """Report utilisation of process-wide resources such as the database connection pool."""
+    return RuntimeStatsResponse(
+        db_pool=get_pool_stats(engine, settings.database_pool.max_overflow),
+        metrics_sink=metrics_sink.stats(),
+        session_cache=session_cache.stats(),
+        embedding_cache=embedding_service.cache_stats(),
+        answer_cache=answer_cache.stats(),
+        retrieval_cache=retrieval_cache.stats(),
+    )
@@ -1,9 +1,11 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
 from ai_unifier_assesment.rag.qa_service import QAService
+from ai_unifier_assesment.rag.qa_stream_service import QAStreamService
 
 router = APIRouter(prefix="/rag", tags=["RAG"])
 
@@ -11,6 +13,17 @@ router = APIRouter(prefix="/rag", tags=["RAG"])
 class QuestionRequest(BaseModel):
     question: str
     collection_name: str = "rag_corpus"
+    # MMR re-ranks the fetch_k nearest chunks; lambda_mult 1 ranks by relevance only, 0 by diversity only
+    fetch_k: int = Field(default=20, ge=1, le=1000)
+    lambda_mult: float = Field(default=0.5, ge=0.0, le=1.0)
+
+
+class BatchQuestionRequest(BaseModel):
+    questions: list[str] = Field(min_length=1, max_length=1000)
+    collection_name: str = "rag_corpus"
+    k: int = Field(default=5, ge=1, le=100)
+    fetch_k: int = Field(default=20, ge=1, le=1000)
+    lambda_mult: float = Field(default=0.5, ge=0.0, le=1.0)
 
 
 class SourceInfo(BaseModel):
@@ -22,6 +35,7 @@ class AnswerResponse(BaseModel):
     answer: str
     sources: list[SourceInfo]
     retrieval_time_ms: float
+    cached: bool = False
 
 
 class DocumentInfo(BaseModel):
@@ -35,19 +49,51 @@ class RetrieveResponse(BaseModel):
     retrieval_time_ms: float
 
 
+class BatchRetrieveResponse(BaseModel):
+    # One entry per question, in request order
+    results: list[RetrieveResponse]
+    retrieval_time_ms: float
+
+
 @router.post("/qa", response_model=AnswerResponse)
 async def question_answer(
     request: QuestionRequest,
     qa_service: Annotated[QAService, Depends(QAService)],
 ) -> AnswerResponse:
-    result = qa_service.answer(request.question, request.collection_name)
+    result = await qa_service.aanswer(request.question, request.collection_name, request.fetch_k, request.lambda_mult)
     return AnswerResponse(**result)
 
 
+@router.post("/qa/stream")
+async def question_answer_stream(
+    request: QuestionRequest,
+    qa_stream_service: Annotated[QAStreamService, Depends(QAStreamService)],
+):
+    return StreamingResponse(
+        qa_stream_service.stream_answer(
+            request.question, request.collection_name, request.fetch_k, request.lambda_mult
+        ),
+        media_type="text/event-stream",
+    )
+
+
 @router.post("/retrieve", response_model=RetrieveResponse)
 async def retrieve_documents(
     request: QuestionRequest,
     qa_service: Annotated[QAService, Depends(QAService)],
 ) -> RetrieveResponse:
-    result = qa_service.retrieve_only(request.question, request.collection_name)
+    result = await qa_service.aretrieve_only(
+        request.question, request.collection_name, fetch_k=request.fetch_k, lambda_mult=request.lambda_mult
+    )
     return RetrieveResponse(**result)
+
+
+@router.post("/retrieve/batch", response_model=BatchRetrieveResponse)
+async def retrieve_documents_batch(
+    request: BatchQuestionRequest,
+    qa_service: Annotated[QAService, Depends(QAService)],
+) -> BatchRetrieveResponse:
+    result = await qa_service.aretrieve_many(
+        request.questions, request.collection_name, request.k, request.fetch_k, request.lambda_mult
+    )
+    return BatchRetrieveResponse(**result)
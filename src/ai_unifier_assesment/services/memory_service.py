@@ -4,19 +4,44 @@ from fastapi import Depends
 from langchain_community.chat_message_histories import PostgresChatMessageHistory
 from langchain_core.chat_history import BaseChatMessageHistory
 from langchain_core.messages import trim_messages
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
 
 from ai_unifier_assesment.config import Settings
-from ai_unifier_assesment.dependencies import get_settings
+from ai_unifier_assesment.dependencies import get_cached_settings
+from ai_unifier_assesment.services.pooled_chat_history import (
+    PooledChatMessageHistory,
+    get_chat_history_pool,
+    get_chat_history_sync_pool,
+)
+from ai_unifier_assesment.services.session_window_cache import SessionWindowCache, get_session_window_cache
 
 
 class MemoryService:
-    def __init__(self, settings: Annotated[Settings, Depends(get_settings)]):
+    def __init__(
+        self,
+        settings: Annotated[Settings, Depends(get_cached_settings)],
+        pool: Annotated[AsyncConnectionPool | None, Depends(get_chat_history_pool)] = None,
+        window_cache: Annotated[SessionWindowCache | None, Depends(get_session_window_cache)] = None,
+        sync_pool: Annotated[ConnectionPool | None, Depends(get_chat_history_sync_pool)] = None,
+    ):
         self._settings = settings
+        self._pool = pool
+        self._sync_pool = sync_pool
+        self._window_cache = window_cache
 
     def get_session_history(self, session_id: str) -> BaseChatMessageHistory:
-        return PostgresChatMessageHistory(
-            session_id=session_id,
-            connection_string=self._settings.postgres.raw_connection_string,
+        if self._pool is None or self._sync_pool is None:
+            # Standalone use outside the API: one short-lived connection per history
+            return PostgresChatMessageHistory(
+                session_id=session_id,
+                connection_string=self._settings.postgres.raw_connection_string,
+            )
+        return PooledChatMessageHistory(
+            self._pool,
+            self._sync_pool,
+            session_id,
+            window_size=self._settings.memory_window_size,
+            window_cache=self._window_cache,
         )
 
     def get_trimmer(self):
@@ -0,0 +1,194 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Annotated, Callable, Optional
+
+from fastapi import Depends
+from sqlalchemy.orm import Session, sessionmaker
+
+from ai_unifier_assesment.config import MetricsSinkConfig, Settings
+from ai_unifier_assesment.db.session import get_session_factory
+from ai_unifier_assesment.dependencies import get_cached_settings, get_resource_registry
+from ai_unifier_assesment.repositories.agent_execution_repository import AgentExecutionRepository
+from ai_unifier_assesment.repositories.metrics_repository import MetricsRepository
+from ai_unifier_assesment.resource_registry import ResourceRegistry
+
+logger = logging.getLogger(__name__)
+
+METRICS_TABLE = "metrics"
+AGENT_EXECUTIONS_TABLE = "agent_executions"
+REPOSITORIES: dict[str, type[MetricsRepository] | type[AgentExecutionRepository]] = {
+    METRICS_TABLE: MetricsRepository,
+    AGENT_EXECUTIONS_TABLE: AgentExecutionRepository,
+}
+
+
+class MetricsSink:
+    """Collects metric rows without blocking the caller and persists them in batches.
+
+    Rows are queued in memory and a background task flushes them with one bulk insert and
+    transaction per table whenever ``batch_size`` rows are waiting or ``flush_interval_seconds``
+    has elapsed.
+    Closing the sink drains everything still queued.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], config: MetricsSinkConfig):
+        self._session_factory = session_factory
+        self._config = config
+        self._queue: asyncio.Queue[tuple[str, dict]] = asyncio.Queue(maxsize=config.max_queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self._in_flight: Optional[asyncio.Task] = None
+        self._pending: list[tuple[str, dict]] = []
+        self._closing = False
+        self._dropped = 0
+        self._flushed = 0
+        self._failed = 0
+        self._batches = 0
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def record(
+        self,
+        endpoint: str,
+        session_id: Optional[str],
+        prompt_tokens: int,
+        completion_tokens: int,
+        cost: float,
+        latency_ms: float,
+        metadata: Optional[dict] = None,
+    ) -> bool:
+        row = {
+            "timestamp": datetime.utcnow(),
+            "endpoint": endpoint,
+            "session_id": session_id,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "cost": cost,
+            "latency_ms": latency_ms,
+            "extra_data": metadata or {},
+        }
+        return self._enqueue(METRICS_TABLE, row, f"metric for endpoint {endpoint}")
+
+    def record_agent_execution(self, row: dict) -> bool:
+        """Queue an ``agent_executions`` row keyed by AgentExecution attribute names."""
+        return self._enqueue(AGENT_EXECUTIONS_TABLE, row, f"agent execution {row.get('session_id')}")
+
+    def _enqueue(self, table: str, row: dict, description: str) -> bool:
+        if self._closing:
+            self._dropped += 1
+            logger.warning(f"Metrics sink is closing, dropped {description}")
+            return False
+
+        try:
+            self._queue.put_nowait((table, row))
+        except asyncio.QueueFull:
+            self._dropped += 1
+            logger.warning(f"Metrics queue full, dropped {description}")
+            return False
+
+        self.start()
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "backlog": self._queue.qsize(),
+            "dropped": self._dropped,
+            "flushed": self._flushed,
+            "failed": self._failed,
+            "batches": self._batches,
+        }
+
+    async def aclose(self) -> None:
+        self._closing = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._in_flight is not None:
+            await self._in_flight
+
+        self._pending.extend(self._drain(self._queue.qsize()))
+        while self._pending:
+            batch, self._pending = self._pending[: self._config.batch_size], self._pending[self._config.batch_size :]
+            await self._flush(batch)
+        logger.info(f"Metrics sink closed: {self.stats()}")
+
+    async def _run(self) -> None:
+        while True:
+            await self._collect_batch()
+            batch, self._pending = self._pending, []
+            # Shielded so a shutdown cancellation never abandons rows that are already being written
+            self._in_flight = asyncio.ensure_future(self._flush(batch))
+            await asyncio.shield(self._in_flight)
+            self._in_flight = None
+
+    async def _collect_batch(self) -> None:
+        self._pending.append(await self._queue.get())
+        deadline = asyncio.get_running_loop().time() + self._config.flush_interval_seconds
+
+        while len(self._pending) < self._config.batch_size:
+            self._pending.extend(self._drain(self._config.batch_size - len(self._pending)))
+            remaining = deadline - asyncio.get_running_loop().time()
+            if len(self._pending) >= self._config.batch_size or remaining <= 0:
+                break
+            try:
+                self._pending.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+    def _drain(self, limit: int) -> list[tuple[str, dict]]:
+        rows: list[tuple[str, dict]] = []
+        while len(rows) < limit and not self._queue.empty():
+            rows.append(self._queue.get_nowait())
+        return rows
+
+    async def _flush(self, batch: list[tuple[str, dict]]) -> None:
+        if not batch:
+            return
+        written = await asyncio.to_thread(self._write, batch)
+        self._flushed += written
+        self._failed += len(batch) - written
+        if written:
+            self._batches += 1
+
+    def _write(self, batch: list[tuple[str, dict]]) -> int:
+        """Write each table's rows in its own transaction, so a bad row in one table never drops the other's."""
+        written = 0
+        for table, repository in REPOSITORIES.items():
+            rows = [row for row_table, row in batch if row_table == table]
+            if not rows:
+                continue
+            try:
+                self._write_table(repository, rows)
+                written += len(rows)
+            except Exception as e:
+                logger.error(f"Failed to persist {len(rows)} {table} rows: {e}")
+        return written
+
+    def _write_table(
+        self, repository: type[MetricsRepository] | type[AgentExecutionRepository], rows: list[dict]
+    ) -> None:
+        session = self._session_factory()
+        try:
+            repository(session).create_many(rows)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+
+def get_metrics_sink(
+    settings: Annotated[Settings, Depends(get_cached_settings)],
+    session_factory: Annotated[sessionmaker[Session], Depends(get_session_factory)],
+    registry: Annotated[ResourceRegistry, Depends(get_resource_registry)],
+) -> MetricsSink:
+    return registry.get_or_create("metrics.sink", lambda: MetricsSink(session_factory, settings.metrics_sink))
@@ -0,0 +1,164 @@
+import json
+from typing import Annotated, Sequence
+
+from fastapi import Depends
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from psycopg import sql
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+
+from ai_unifier_assesment.config import Settings
+from ai_unifier_assesment.dependencies import get_cached_settings, get_resource_registry
+from ai_unifier_assesment.resource_registry import ResourceRegistry
+from ai_unifier_assesment.services.session_window_cache import SessionWindowCache
+
+
+class PooledChatMessageHistory(BaseChatMessageHistory):
+    """Chat history for one session backed by shared psycopg connection pools.
+
+    Only the trailing ``window_size`` messages are read, matching what the memory
+    trimmer keeps, and new messages are appended with a single multi-row insert.
+    When a window cache is given, hot sessions are served without touching Postgres.
+    The async methods use ``pool``; sync callers go through ``sync_pool``.
+    """
+
+    def __init__(
+        self,
+        pool: AsyncConnectionPool,
+        sync_pool: ConnectionPool,
+        session_id: str,
+        window_size: int,
+        table_name: str = "message_store",
+        window_cache: SessionWindowCache | None = None,
+    ):
+        self._pool = pool
+        self._sync_pool = sync_pool
+        self._session_id = session_id
+        self._window_size = window_size
+        self._table = sql.Identifier(table_name)
+        self._window_cache = window_cache
+
+    @property
+    def messages(self) -> list[BaseMessage]:  # type: ignore[override]
+        cached = self._cached_window()
+        if cached is not None:
+            return cached
+
+        self._sync_pool.open()
+        with self._sync_pool.connection() as conn:
+            rows = conn.execute(self._window_query(), (self._session_id, self._window_size)).fetchall()
+        return self._cache_window(rows)
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        if not messages:
+            return
+
+        self._sync_pool.open()
+        with self._sync_pool.connection() as conn:
+            conn.execute(*self._insert(messages))
+        self._cache_appended(messages)
+
+    def clear(self) -> None:
+        self._sync_pool.open()
+        with self._sync_pool.connection() as conn:
+            conn.execute(self._delete_query(), (self._session_id,))
+        self._invalidate_window()
+
+    async def aget_messages(self) -> list[BaseMessage]:
+        cached = self._cached_window()
+        if cached is not None:
+            return cached
+
+        await self._pool.open()
+        async with self._pool.connection() as conn:
+            cursor = await conn.execute(self._window_query(), (self._session_id, self._window_size))
+            rows = await cursor.fetchall()
+        return self._cache_window(rows)
+
+    async def aadd_messages(self, messages: Sequence[BaseMessage]) -> None:
+        if not messages:
+            return
+
+        await self._pool.open()
+        async with self._pool.connection() as conn:
+            await conn.execute(*self._insert(messages))
+        self._cache_appended(messages)
+
+    async def aclear(self) -> None:
+        await self._pool.open()
+        async with self._pool.connection() as conn:
+            await conn.execute(self._delete_query(), (self._session_id,))
+        self._invalidate_window()
+
+    def _window_query(self) -> sql.Composed:
+        return sql.SQL(
+            "SELECT message FROM ("
+            "SELECT id, message FROM {} WHERE session_id = %s ORDER BY id DESC LIMIT %s"
+            ") AS recent ORDER BY id"
+        ).format(self._table)
+
+    def _insert(self, messages: Sequence[BaseMessage]) -> tuple[sql.Composed, list[str]]:
+        values = sql.SQL(", ").join(sql.SQL("(%s, %s)") for _ in messages)
+        query = sql.SQL("INSERT INTO {} (session_id, message) VALUES ").format(self._table) + values
+        params: list[str] = []
+        for message in messages:
+            params.extend([self._session_id, json.dumps(message_to_dict(message))])
+        return query, params
+
+    def _delete_query(self) -> sql.Composed:
+        return sql.SQL("DELETE FROM {} WHERE session_id = %s").format(self._table)
+
+    def _cached_window(self) -> list[BaseMessage] | None:
+        return self._window_cache.get(self._session_id) if self._window_cache is not None else None
+
+    def _cache_window(self, rows: list) -> list[BaseMessage]:
+        messages = messages_from_dict([self._load(row[0]) for row in rows])
+        if self._window_cache is not None:
+            self._window_cache.put(self._session_id, messages)
+        return messages
+
+    def _cache_appended(self, messages: Sequence[BaseMessage]) -> None:
+        if self._window_cache is not None:
+            self._window_cache.append(self._session_id, messages)
+
+    def _invalidate_window(self) -> None:
+        if self._window_cache is not None:
+            self._window_cache.invalidate(self._session_id)
+
+    @staticmethod
+    def _load(message: dict | str) -> dict:
+        # json columns come back decoded, text columns as raw strings
+        return json.loads(message) if isinstance(message, str) else message
+
+
+def get_chat_history_pool(
+    settings: Annotated[Settings, Depends(get_cached_settings)],
+    registry: Annotated[ResourceRegistry, Depends(get_resource_registry)],
+) -> AsyncConnectionPool:
+    return registry.get_or_create(
+        "chat_history.pool",
+        lambda: AsyncConnectionPool(
+            settings.postgres.raw_connection_string,
+            min_size=settings.chat_history_pool.min_size,
+            max_size=settings.chat_history_pool.max_size,
+            kwargs={"autocommit": True},
+            open=False,
+        ),
+    )
+
+
+def get_chat_history_sync_pool(
+    settings: Annotated[Settings, Depends(get_cached_settings)],
+    registry: Annotated[ResourceRegistry, Depends(get_resource_registry)],
+) -> ConnectionPool:
+    # Only sync callers use it, so it holds no idle connections and is opened on first use
+    return registry.get_or_create(
+        "chat_history.sync_pool",
+        lambda: ConnectionPool(
+            settings.postgres.raw_connection_string,
+            min_size=0,
+            max_size=settings.chat_history_pool.max_size,
+            kwargs={"autocommit": True},
+            open=False,
+        ),
+    )
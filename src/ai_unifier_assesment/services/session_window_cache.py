@@ -0,0 +1,98 @@
+import time
+from collections import OrderedDict
+from typing import Annotated, Callable, Sequence
+
+from fastapi import Depends
+from langchain_core.messages import BaseMessage
+
+from ai_unifier_assesment.config import Settings
+from ai_unifier_assesment.dependencies import get_cached_settings, get_resource_registry
+from ai_unifier_assesment.resource_registry import ResourceRegistry
+
+
+class SessionWindowCache:
+    """Bounded per-worker LRU cache of each chat session's trailing message window.
+
+    Entries expire after ``ttl_seconds`` so sessions continued on another worker are
+    re-read from Postgres, and the least recently used session is evicted once
+    ``max_sessions`` is reached.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int,
+        ttl_seconds: float,
+        window_size: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._max_sessions = max_sessions
+        self._ttl_seconds = ttl_seconds
+        self._window_size = window_size
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, list[BaseMessage]]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, session_id: str) -> list[BaseMessage] | None:
+        entry = self._entries.get(session_id)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        stored_at, messages = entry
+        if self._clock() - stored_at > self._ttl_seconds:
+            del self._entries[session_id]
+            self._expirations += 1
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(session_id)
+        self._hits += 1
+        return list(messages)
+
+    def put(self, session_id: str, messages: Sequence[BaseMessage]) -> None:
+        if self._max_sessions <= 0:
+            return
+        self._entries[session_id] = (self._clock(), list(messages)[-self._window_size :])
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self._max_sessions:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def append(self, session_id: str, messages: Sequence[BaseMessage]) -> None:
+        """Write-through update; sessions not currently cached are left to the next read."""
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return
+        self.put(session_id, entry[1] + list(messages))
+
+    def invalidate(self, session_id: str) -> None:
+        self._entries.pop(session_id, None)
+
+    def stats(self) -> dict:
+        lookups = self._hits + self._misses
+        return {
+            "sessions": len(self._entries),
+            "max_sessions": self._max_sessions,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def get_session_window_cache(
+    settings: Annotated[Settings, Depends(get_cached_settings)],
+    registry: Annotated[ResourceRegistry, Depends(get_resource_registry)],
+) -> SessionWindowCache:
+    return registry.get_or_create(
+        "chat_history.window_cache",
+        lambda: SessionWindowCache(
+            max_sessions=settings.session_cache.max_sessions,
+            ttl_seconds=settings.session_cache.ttl_seconds,
+            window_size=settings.memory_window_size,
+        ),
+    )
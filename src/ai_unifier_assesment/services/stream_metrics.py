@@ -1,40 +1,103 @@
 import logging
+import threading
 import time
 from decimal import Decimal
-from typing import Annotated
+from typing import Annotated, Any, Callable, Iterable, Optional
 
 import tiktoken
 from fastapi import Depends
 
-from ai_unifier_assesment.config import Settings, get_settings
+from ai_unifier_assesment.config import Settings
+from ai_unifier_assesment.dependencies import get_cached_settings
 
 logger = logging.getLogger(__name__)
 
 
+class EncodingRegistry:
+    """Process-wide cache of tiktoken encodings keyed by model name."""
+
+    def __init__(self) -> None:
+        self._encodings: dict[str, tiktoken.Encoding] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_name: str) -> tiktoken.Encoding:
+        encoding = self._encodings.get(model_name)
+        if encoding is not None:
+            return encoding
+
+        with self._lock:
+            if model_name not in self._encodings:
+                try:
+                    self._encodings[model_name] = tiktoken.encoding_for_model(model_name)
+                except KeyError:
+                    self._encodings[model_name] = tiktoken.get_encoding("cl100k_base")
+            return self._encodings[model_name]
+
+    def warm_up(self, model_names: Iterable[str]) -> None:
+        for model_name in model_names:
+            try:
+                self.get(model_name).encode("warm up")
+            except Exception as e:
+                # tiktoken may need to download its BPE files; fall back to loading on first use
+                logger.warning(f"Could not preload tiktoken encoding for {model_name}: {e}")
+
+
+encoding_registry = EncodingRegistry()
+
+
 class TokenCounter:
-    def __init__(self, settings: Annotated[Settings, Depends(get_settings)]):
-        model_name = settings.openai.model_name
-        try:
-            self._encoding = tiktoken.encoding_for_model(model_name)
-        except KeyError:
-            self._encoding = tiktoken.get_encoding("cl100k_base")
+    def __init__(self, settings: Annotated[Settings, Depends(get_cached_settings)]):
+        self._encoding = encoding_registry.get(settings.openai.model_name)
+        self._num_threads = settings.tokenizer.num_threads
 
     def count_message_tokens(self, messages: list[dict]) -> int:
-        tokens = 0
-        for message in messages:
-            tokens += 3
-            tokens += len(self._encoding.encode(message.get("content", "")))
-            if message.get("name"):
-                tokens += len(self._encoding.encode(message["name"]))
-        tokens += 3
-        return tokens
+        """Count a chat prompt, encoding every message's content and name in one batch."""
+        texts = [message.get("content", "") for message in messages]
+        texts += [message["name"] for message in messages if message.get("name")]
+        return 3 * len(messages) + sum(self.count_many(texts)) + 3
 
     def count_text_tokens(self, text: str) -> int:
         return len(self._encoding.encode(text))
 
+    def count_many(self, texts: list[str]) -> list[int]:
+        """Count tokens for several texts at once, encoding them across tiktoken's thread pool."""
+        if not texts:
+            return []
+        return [len(tokens) for tokens in self._encoding.encode_batch(texts, num_threads=self._num_threads)]
+
+
+class StreamingUsage:
+    """Accumulates token usage while a completion streams.
+
+    Usage reported by the provider on the stream wins. Otherwise completion tokens are
+    counted chunk by chunk as they arrive, so nothing is re-encoded once the stream ends.
+    """
+
+    def __init__(self, token_counter: TokenCounter):
+        self._token_counter = token_counter
+        self._counted_completion_tokens = 0
+        self._reported: Optional[dict] = None
+
+    def add(self, chunk: Any) -> None:
+        usage = getattr(chunk, "usage_metadata", None)
+        if usage:
+            self._reported = usage
+        if chunk.content:
+            self._counted_completion_tokens += self._token_counter.count_text_tokens(chunk.content)
+
+    def prompt_tokens(self, count_prompt: Callable[[], int]) -> int:
+        if self._reported is not None:
+            return int(self._reported.get("input_tokens", 0))
+        return count_prompt()
+
+    def completion_tokens(self) -> int:
+        if self._reported is not None:
+            return int(self._reported.get("output_tokens", 0))
+        return self._counted_completion_tokens
+
 
 class StreamMetrics:
-    def __init__(self, settings: Annotated[Settings, Depends(get_settings)]):
+    def __init__(self, settings: Annotated[Settings, Depends(get_cached_settings)]):
         self._pricing = settings.pricing
 
     def _calculate_cost(self, prompt_tokens: int, completion_tokens: int) -> Decimal:
@@ -42,6 +105,9 @@ class StreamMetrics:
         output_cost = Decimal(completion_tokens) / Decimal(1_000_000) * Decimal(str(self._pricing.output_cost_per_1m))
         return input_cost + output_cost
 
+    def calculate_cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return float(round(self._calculate_cost(prompt_tokens, completion_tokens), 8))
+
     def build_stats(
         self,
         start_time: float,
@@ -49,11 +115,10 @@ class StreamMetrics:
         completion_tokens: int,
     ) -> dict:
         latency_ms = (time.time() - start_time) * 1000
-        cost = self._calculate_cost(prompt_tokens, completion_tokens)
 
         return {
             "prompt_tokens": prompt_tokens,
             "completion_tokens": completion_tokens,
-            "cost": float(round(cost, 8)),
+            "cost": self.calculate_cost(prompt_tokens, completion_tokens),
             "latency_ms": round(latency_ms, 0),
         }
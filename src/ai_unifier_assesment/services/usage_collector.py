@@ -0,0 +1,157 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+NODE_STEP_TAG = "graph:step:"
+UNATTRIBUTED_NODE = "llm"
+
+
+@dataclass
+class NodeUsage:
+    runs: int = 0
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+class UsageCollector(BaseCallbackHandler):
+    """Aggregates provider-reported token usage and node latency across a LangGraph run.
+
+    Pass it in the ``callbacks`` of the graph config; LangChain propagates it to every
+    LLM call made inside the graph's nodes, which are attributed via ``langgraph_node``.
+    """
+
+    run_inline = True
+
+    def __init__(self) -> None:
+        self._nodes: dict[str, NodeUsage] = {}
+        self._node_runs: dict[UUID, tuple[str, float]] = {}
+        self._llm_runs: dict[UUID, str] = {}
+        self._lock = threading.Lock()
+
+    def on_chain_start(
+        self,
+        serialized: Optional[dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        tags: Optional[list[str]] = None,
+        metadata: Optional[dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        if node and any(tag.startswith(NODE_STEP_TAG) for tag in tags or []):
+            with self._lock:
+                self._node_runs[run_id] = (node, time.perf_counter())
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish_node_run(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish_node_run(run_id)
+
+    def on_chat_model_start(
+        self,
+        serialized: Optional[dict[str, Any]],
+        messages: Any,
+        *,
+        run_id: UUID,
+        metadata: Optional[dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._start_llm_run(run_id, metadata)
+
+    def on_llm_start(
+        self,
+        serialized: Optional[dict[str, Any]],
+        prompts: list[str],
+        *,
+        run_id: UUID,
+        metadata: Optional[dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._start_llm_run(run_id, metadata)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        prompt_tokens, completion_tokens = self._extract_usage(response)
+        with self._lock:
+            usage = self._node(self._llm_runs.pop(run_id, UNATTRIBUTED_NODE))
+            usage.llm_calls += 1
+            usage.prompt_tokens += prompt_tokens
+            usage.completion_tokens += completion_tokens
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._llm_runs.pop(run_id, None)
+
+    @property
+    def prompt_tokens(self) -> int:
+        return sum(usage.prompt_tokens for usage in self._nodes.values())
+
+    @property
+    def completion_tokens(self) -> int:
+        return sum(usage.completion_tokens for usage in self._nodes.values())
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def node_breakdown(self, calculate_cost: Callable[[int, int], float]) -> dict[str, dict]:
+        return {
+            node: {
+                "runs": usage.runs,
+                "llm_calls": usage.llm_calls,
+                "prompt_tokens": usage.prompt_tokens,
+                "completion_tokens": usage.completion_tokens,
+                "total_tokens": usage.total_tokens,
+                "latency_ms": round(usage.latency_ms, 2),
+                "cost": calculate_cost(usage.prompt_tokens, usage.completion_tokens),
+            }
+            for node, usage in self._nodes.items()
+        }
+
+    def _node(self, name: str) -> NodeUsage:
+        return self._nodes.setdefault(name, NodeUsage())
+
+    def _start_llm_run(self, run_id: UUID, metadata: Optional[dict[str, Any]]) -> None:
+        with self._lock:
+            self._llm_runs[run_id] = (metadata or {}).get("langgraph_node", UNATTRIBUTED_NODE)
+
+    def _finish_node_run(self, run_id: UUID) -> None:
+        with self._lock:
+            started = self._node_runs.pop(run_id, None)
+            if started is None:
+                return
+            node, start = started
+            usage = self._node(node)
+            usage.runs += 1
+            usage.latency_ms += (time.perf_counter() - start) * 1000
+
+    @staticmethod
+    def _extract_usage(response: LLMResult) -> tuple[int, int]:
+        prompt_tokens = completion_tokens = 0
+        reported = False
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    reported = True
+                    prompt_tokens += usage.get("input_tokens", 0)
+                    completion_tokens += usage.get("output_tokens", 0)
+
+        if not reported:
+            # Older providers only report usage in llm_output
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            prompt_tokens = token_usage.get("prompt_tokens", 0)
+            completion_tokens = token_usage.get("completion_tokens", 0)
+        return prompt_tokens, completion_tokens
@@ -1,5 +1,6 @@
 """Tests for CodingAgent - one assert per test, clear and minimal."""
 
+from datetime import datetime
 from pathlib import Path
 from unittest.mock import AsyncMock, Mock
 
@@ -47,6 +48,8 @@ def agent():
         language_detector=mock_language_detector,
         initial_code_generator=mock_initial_code_generator,
         code_writer_service=code_writer_service,
+        metrics_sink=Mock(),
+        stream_metrics=Mock(calculate_cost=Mock(return_value=0.25)),
     )
 
 
@@ -257,3 +260,34 @@ def test_should_return_total_attempts_in_finalize(agent):
     result = agent._finalize_node(state)
 
     assert result["attempts"] == 3
+
+
+def test_should_record_agent_execution_with_usage(agent):
+    usage = Mock(prompt_tokens=100, completion_tokens=20, total_tokens=120)
+    usage.node_breakdown.return_value = {"code_generator": {"total_tokens": 120}}
+    final_state = CodeHealingState(task_description="Write fibonacci", current_code="code", success=True).model_dump()
+    final_state.update({"final_code": "code", "attempts": 2})
+
+    agent._record_execution(final_state, usage, datetime.utcnow())
+
+    row = agent._metrics_sink.record_agent_execution.call_args.args[0]
+    assert_that(row).contains_entry(
+        {"status": "success"}, {"language": "python"}, {"attempts": 2}, {"total_tokens": 120}, {"total_cost": 0.25}
+    )
+
+
+def test_should_record_interrupted_execution_as_error(agent):
+    usage = Mock(prompt_tokens=0, completion_tokens=0, total_tokens=0)
+    usage.node_breakdown.return_value = {}
+    final_state = CodeHealingState(task_description="Write fibonacci").model_dump()
+
+    agent._record_execution(final_state, usage, datetime.utcnow())
+
+    row = agent._metrics_sink.record_agent_execution.call_args.args[0]
+    assert_that(row).contains_entry({"status": "error"}, {"failure_reason": "interrupted"})
+
+
+def test_should_compile_graph_once(agent):
+    first = agent.compiled_graph()
+
+    assert_that(agent.compiled_graph()).is_same_as(first)
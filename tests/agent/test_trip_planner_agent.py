@@ -110,3 +110,14 @@ async def test_plan_trip_returns_none_itinerary_when_not_generated(
                 "itinerary": None,
             }
         )
+
+
+def test_compiled_graph_is_built_once(mock_model, flight_tool, weather_tool, attractions_tool):
+    agent = TripPlannerAgent(mock_model, flight_tool, weather_tool, attractions_tool)
+
+    with patch.object(agent, "_build_graph") as mock_build:
+        first = agent.compiled_graph()
+        second = agent.compiled_graph()
+
+    assert_that(first).is_same_as(second)
+    mock_build.assert_called_once()
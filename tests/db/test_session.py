@@ -0,0 +1,64 @@
+from unittest.mock import MagicMock, patch
+
+from assertpy import assert_that
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from ai_unifier_assesment.config import DatabasePoolConfig, PostgresConfig, Settings
+from ai_unifier_assesment.db.session import create_pooled_engine, get_engine, get_pool_stats
+from ai_unifier_assesment.resource_registry import ResourceRegistry
+
+
+def create_settings(statement_timeout_ms: int = 5000) -> Settings:
+    settings = MagicMock(spec=Settings)
+    settings.postgres = PostgresConfig(host="db", port=5432, user="u", password="p", database="d")
+    settings.database_pool = DatabasePoolConfig(
+        pool_size=7,
+        max_overflow=3,
+        pool_recycle_seconds=900,
+        pool_timeout_seconds=4.0,
+        statement_timeout_ms=statement_timeout_ms,
+    )
+    return settings
+
+
+def test_should_create_engine_with_configured_pool():
+    with patch("ai_unifier_assesment.db.session.create_engine") as mock_create:
+        create_pooled_engine(create_settings())
+
+        mock_create.assert_called_once_with(
+            "postgresql+psycopg://u:p@db:5432/d",
+            pool_pre_ping=True,
+            pool_size=7,
+            max_overflow=3,
+            pool_recycle=900,
+            pool_timeout=4.0,
+            connect_args={"options": "-c statement_timeout=5000"},
+        )
+
+
+def test_should_skip_statement_timeout_when_disabled():
+    with patch("ai_unifier_assesment.db.session.create_engine") as mock_create:
+        create_pooled_engine(create_settings(statement_timeout_ms=0))
+
+        assert_that(mock_create.call_args.kwargs["connect_args"]).is_empty()
+
+
+def test_should_share_engine_across_requests():
+    registry = ResourceRegistry()
+
+    with patch("ai_unifier_assesment.db.session.create_engine") as mock_create:
+        first = get_engine(create_settings(), registry)
+        second = get_engine(create_settings(), registry)
+
+        assert_that(first).is_same_as(second)
+        mock_create.assert_called_once()
+
+
+def test_should_report_pool_utilisation():
+    engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=4, max_overflow=4)
+
+    with engine.connect():
+        stats = get_pool_stats(engine, max_overflow=4)
+
+    assert_that(stats).contains_entry({"checked_out": 1}, {"capacity": 8}, {"utilisation": 0.125})
@@ -1,5 +1,6 @@
 from unittest.mock import MagicMock
 
+import numpy as np
 from assertpy import assert_that
 from langchain_core.documents import Document
 
@@ -83,6 +84,18 @@ def test_should_calculate_median_retrieval_time():
     assert_that(result).contains_key("meets_latency_requirement")
 
 
+def test_should_require_median_retrieval_within_20ms():
+    service = BenchmarkService(
+        MagicMock(spec=Settings), MagicMock(spec=EvaluationDataService), MagicMock(spec=VectorStoreService)
+    )
+
+    fast = service._build_benchmark_result(5, 3, 3, [5.0, 12.0, 40.0], [])
+    slow = service._build_benchmark_result(5, 3, 3, [15.0, 25.0, 40.0], [])
+
+    assert_that(fast).contains_entry({"latency_target_ms": 20}, {"meets_latency_requirement": True})
+    assert_that(slow["meets_latency_requirement"]).is_false()
+
+
 def test_should_check_hit_with_exact_match():
     settings = MagicMock(spec=Settings)
     evaluation_service = MagicMock(spec=EvaluationDataService)
@@ -162,3 +175,70 @@ def test_should_return_zero_for_empty_median():
     result = service._calculate_median([])
 
     assert_that(result).is_equal_to(0.0)
+
+
+def test_should_report_quantization_recall_against_exact_search():
+    settings = MagicMock(spec=Settings)
+    settings.chroma.collection_name = "test_collection"
+    settings.rag.vector_backend = "local"
+    settings.rag.index_nprobe = 8
+    evaluation_service = MagicMock(spec=EvaluationDataService)
+    vector_store_service = MagicMock(spec=VectorStoreService)
+
+    q1 = MagicMock(spec=EvaluationQuestion)
+    q1.id = 1
+    q1.question = "Q1"
+    q1.ground_truth_contexts = ["matching content"]
+    evaluation_service.get_all_questions.return_value = [q1]
+
+    mock_retriever = MagicMock()
+    mock_retriever.invoke.return_value = []
+    vector_store_service.get_retriever.return_value = mock_retriever
+    index = vector_store_service.get_local_index.return_value
+    index.quantization = "int8"
+    index.vector_bytes = 4000
+    index.scanned_bytes = 1000
+    index.search.side_effect = lambda embedding, k, nprobe, **kwargs: (
+        (np.array([0, 1]), None) if kwargs.get("exact") else (np.array([0, 2]), None)
+    )
+    index.documents.side_effect = lambda rows: [
+        Document(page_content="matching content" if row == 1 else f"chunk {row}") for row in rows
+    ]
+
+    service = BenchmarkService(settings, evaluation_service, vector_store_service)
+    result = service.run_retrieval_benchmark(k=2)
+
+    assert_that(result["quantization"]).is_equal_to(
+        {
+            "mode": "int8",
+            "rescored": 20,
+            "vector_bytes": 4000,
+            "scanned_bytes": 1000,
+            "memory_reduction": 4.0,
+            "recall_at_k": 0.5,
+            "exact_accuracy_percent": 100.0,
+            "quantized_accuracy_percent": 0.0,
+            "accuracy_loss_percent": 100.0,
+        }
+    )
+
+
+def test_should_not_report_quantization_for_chroma_backend():
+    settings = MagicMock(spec=Settings)
+    settings.chroma.collection_name = "test_collection"
+    settings.rag.vector_backend = "chroma"
+    evaluation_service = MagicMock(spec=EvaluationDataService)
+    vector_store_service = MagicMock(spec=VectorStoreService)
+
+    q1 = MagicMock(spec=EvaluationQuestion)
+    q1.id = 1
+    q1.question = "Q1"
+    q1.ground_truth_contexts = []
+    evaluation_service.get_all_questions.return_value = [q1]
+    vector_store_service.get_retriever.return_value.invoke.return_value = []
+
+    service = BenchmarkService(settings, evaluation_service, vector_store_service)
+    result = service.run_retrieval_benchmark()
+
+    assert_that(result).does_not_contain_key("quantization")
+    vector_store_service.get_local_index.assert_not_called()
@@ -5,6 +5,7 @@ from pydantic import SecretStr
 
 from ai_unifier_assesment.config import OpenAIConfig, Settings
 from ai_unifier_assesment.large_language_model.model import Model
+from ai_unifier_assesment.resource_registry import ResourceRegistry
 
 
 def create_mock_settings() -> Settings:
@@ -43,3 +44,15 @@ def test_stream_model_should_return_chat_openai():
             model_kwargs={"stream_options": {"include_usage": True}},
         )
         assert_that(result).is_not_none()
+
+
+def test_stream_model_should_be_shared_through_registry():
+    registry = ResourceRegistry()
+    model = Model(create_mock_settings(), registry)
+
+    with patch("ai_unifier_assesment.large_language_model.model.ChatOpenAI") as mock_chat:
+        first = model.stream_model()
+        second = Model(create_mock_settings(), registry).stream_model()
+
+        assert_that(first).is_same_as(second)
+        mock_chat.assert_called_once()
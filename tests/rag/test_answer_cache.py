@@ -0,0 +1,51 @@
+from assertpy import assert_that
+
+from ai_unifier_assesment.rag.answer_cache import SemanticAnswerCache
+
+RESULT = {"answer": "RAG combines retrieval with generation [Source 1]", "sources": [{"source": "a.pdf", "page": 1}]}
+
+
+def test_should_return_answer_for_similar_question():
+    cache = SemanticAnswerCache(threshold=0.9, max_entries=10)
+    cache.store("rag_corpus", "v1", [1.0, 0.0, 0.1], RESULT)
+
+    hit = cache.lookup("rag_corpus", "v1", [0.98, 0.02, 0.1])
+
+    assert_that(hit).contains_entry({"answer": RESULT["answer"]}, {"sources": RESULT["sources"]})
+    assert_that(cache.stats()["hits"]).is_equal_to(1)
+
+
+def test_should_miss_below_threshold():
+    cache = SemanticAnswerCache(threshold=0.9, max_entries=10)
+    cache.store("rag_corpus", "v1", [1.0, 0.0], RESULT)
+
+    assert_that(cache.lookup("rag_corpus", "v1", [0.0, 1.0])).is_none()
+
+
+def test_should_scope_answers_to_collection():
+    cache = SemanticAnswerCache(threshold=0.9, max_entries=10)
+    cache.store("rag_corpus", "v1", [1.0, 0.0], RESULT)
+
+    assert_that(cache.lookup("other_corpus", "v1", [1.0, 0.0])).is_none()
+
+
+def test_should_invalidate_answers_when_collection_is_reingested():
+    cache = SemanticAnswerCache(threshold=0.9, max_entries=10)
+    cache.store("rag_corpus", "v1", [1.0, 0.0], RESULT)
+
+    hit = cache.lookup("rag_corpus", "v2", [1.0, 0.0])
+
+    assert_that(hit).is_none()
+    assert_that(cache.stats()).contains_entry({"invalidations": 1}, {"entries": 0})
+
+
+def test_should_evict_least_recently_used_answer():
+    cache = SemanticAnswerCache(threshold=0.99, max_entries=2)
+    cache.store("rag_corpus", "v1", [1.0, 0.0, 0.0], {"answer": "x", "sources": []})
+    cache.store("rag_corpus", "v1", [0.0, 1.0, 0.0], {"answer": "y", "sources": []})
+    cache.lookup("rag_corpus", "v1", [1.0, 0.0, 0.0])
+
+    cache.store("rag_corpus", "v1", [0.0, 0.0, 1.0], {"answer": "z", "sources": []})
+
+    assert_that(cache.lookup("rag_corpus", "v1", [0.0, 1.0, 0.0])).is_none()
+    assert_that(cache.lookup("rag_corpus", "v1", [1.0, 0.0, 0.0])["answer"]).is_equal_to("x")
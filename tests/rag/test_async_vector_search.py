@@ -0,0 +1,101 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from assertpy import assert_that
+from chromadb.errors import NotFoundError
+
+from ai_unifier_assesment.rag.async_vector_search import AsyncChromaSearch
+
+
+def create_search(query_results: dict) -> tuple[AsyncChromaSearch, AsyncMock]:
+    client = AsyncMock()
+    client.get_or_create_collection.return_value.query.return_value = query_results
+    client_factory = AsyncMock(return_value=client)
+    return AsyncChromaSearch("chroma", 8000, client_factory=client_factory), client_factory
+
+
+@pytest.mark.asyncio
+async def test_should_select_diverse_documents_with_mmr():
+    search, _ = create_search(
+        {
+            "ids": [["a", "a-copy", "b"]],
+            "documents": [["Alpha", "Alpha again", "Beta"]],
+            "metadatas": [[{"source": "a.pdf"}, {"source": "a.pdf"}, None]],
+            "embeddings": [[[1.0, 0.0], [1.0, 0.0], [0.8, 0.6]]],
+        }
+    )
+
+    docs = await search.max_marginal_relevance_search_by_vector("rag_corpus", [1.0, 0.0], k=2, lambda_mult=0.25)
+
+    assert_that([doc.id for doc in docs]).is_equal_to(["a", "b"])
+    assert_that(docs[1].metadata).is_equal_to({})
+
+
+@pytest.mark.asyncio
+async def test_should_return_nothing_for_empty_collection():
+    search, _ = create_search({"ids": [[]], "documents": [[]], "metadatas": [[]], "embeddings": [[]]})
+
+    docs = await search.max_marginal_relevance_search_by_vector("rag_corpus", [1.0, 0.0])
+
+    assert_that(docs).is_empty()
+
+
+@pytest.mark.asyncio
+async def test_should_connect_once_and_reuse_collection():
+    search, client_factory = create_search({"ids": [[]], "documents": [[]], "metadatas": [[]], "embeddings": [[]]})
+
+    await search.get_collection("rag_corpus")
+    await search.get_collection("rag_corpus")
+
+    client_factory.assert_awaited_once_with(host="chroma", port=8000)
+    (await search.get_client()).get_or_create_collection.assert_awaited_once_with("rag_corpus")
+
+
+@pytest.mark.asyncio
+async def test_should_search_several_queries_with_one_chroma_query():
+    search, client_factory = create_search(
+        {
+            "ids": [["a", "b"], ["c"]],
+            "documents": [["Alpha", "Beta"], ["Gamma"]],
+            "metadatas": [[{}, {}], [{"page": 3}]],
+            "embeddings": [[[1.0, 0.0], [0.9, 0.1]], [[0.0, 1.0]]],
+        }
+    )
+
+    results = await search.max_marginal_relevance_search_by_vectors("rag_corpus", [[1.0, 0.0], [0.0, 1.0]], k=1)
+
+    query = (await client_factory.return_value.get_or_create_collection("rag_corpus")).query
+    query.assert_awaited_once()
+    assert_that([[doc.page_content for doc in docs] for docs in results]).is_equal_to([["Alpha"], ["Gamma"]])
+    assert_that(results[1][0].metadata).is_equal_to({"page": 3})
+
+
+@pytest.mark.asyncio
+async def test_should_refetch_collection_when_cached_handle_fails():
+    empty = {"ids": [[]], "documents": [[]], "metadatas": [[]], "embeddings": [[]]}
+    stale, fresh = AsyncMock(), AsyncMock()
+    stale.query.side_effect = NotFoundError("Collection abc does not exist")
+    fresh.query.return_value = empty
+    client = AsyncMock()
+    client.get_or_create_collection.side_effect = [stale, fresh]
+    search = AsyncChromaSearch("chroma", 8000, client_factory=AsyncMock(return_value=client))
+
+    docs = await search.max_marginal_relevance_search_by_vector("rag_corpus", [1.0, 0.0])
+    await search.max_marginal_relevance_search_by_vector("rag_corpus", [1.0, 0.0])
+
+    assert_that(docs).is_empty()
+    assert_that(client.get_or_create_collection.await_count).is_equal_to(2)
+    assert_that(fresh.query.await_count).is_equal_to(2)
+
+
+@pytest.mark.asyncio
+async def test_should_not_refetch_collection_on_other_errors():
+    collection = AsyncMock()
+    collection.query.side_effect = ConnectionError("Chroma unavailable")
+    client = AsyncMock()
+    client.get_or_create_collection.return_value = collection
+    search = AsyncChromaSearch("chroma", 8000, client_factory=AsyncMock(return_value=client))
+
+    with pytest.raises(ConnectionError, match="Chroma unavailable"):
+        await search.max_marginal_relevance_search_by_vectors("rag_corpus", [[1.0, 0.0]])
+    collection.query.assert_awaited_once()
@@ -0,0 +1,80 @@
+from unittest.mock import MagicMock
+
+import pytest
+from assertpy import assert_that
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from ai_unifier_assesment.rag.batch_embedding_client import BatchEmbeddingClient
+
+
+def test_should_embed_in_batches_and_keep_input_order():
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = lambda texts: [[float(len(text))] for text in texts]
+    client = BatchEmbeddingClient(embeddings, batch_size=2, min_batch_size=2, max_batch_size=2, max_in_flight=3)
+
+    batches = list(client.embed_stream(["a", "bb", "ccc", "dddd", "eeeee"], lambda text: text))
+
+    assert_that([len(batch) for batch in batches]).is_equal_to([2, 2, 1])
+    assert_that([vector for batch in batches for _, vector in batch]).is_equal_to([[1.0], [2.0], [3.0], [4.0], [5.0]])
+
+
+def test_should_retry_failed_batch_with_exponential_backoff():
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = [ConnectionError("busy"), ConnectionError("busy"), [[0.1]]]
+    delays = []
+    client = BatchEmbeddingClient(embeddings, max_retries=3, backoff_seconds=0.5, sleep=delays.append)
+
+    vectors = client.embed_documents(["text"])
+
+    assert_that(vectors).is_equal_to([[0.1]])
+    assert_that(delays).is_equal_to([0.5, 1.0])
+    assert_that(client.stats()["retries"]).is_equal_to(2)
+
+
+def test_should_give_up_after_max_retries():
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = ConnectionError("down")
+    client = BatchEmbeddingClient(embeddings, max_retries=1, sleep=lambda _: None)
+
+    with pytest.raises(ConnectionError):
+        client.embed_documents(["text"])
+    assert_that(embeddings.embed_documents.call_count).is_equal_to(2)
+
+
+def test_should_grow_batch_size_while_batches_are_fast():
+    client = BatchEmbeddingClient(
+        DeterministicFakeEmbedding(size=4),
+        batch_size=2,
+        min_batch_size=1,
+        max_batch_size=8,
+        max_in_flight=1,
+        target_batch_seconds=10,
+    )
+
+    batches = list(client.embed_stream([str(i) for i in range(14)], lambda text: text))
+
+    assert_that([len(batch) for batch in batches]).is_equal_to([2, 4, 8])
+    assert_that(client.batch_size).is_equal_to(8)
+
+
+def test_should_shrink_batch_size_when_batches_exceed_target_latency():
+    client = BatchEmbeddingClient(
+        DeterministicFakeEmbedding(size=4), batch_size=16, min_batch_size=4, max_in_flight=1, target_batch_seconds=0
+    )
+
+    batches = list(client.embed_stream([str(i) for i in range(28)], lambda text: text))
+
+    assert_that([len(batch) for batch in batches]).is_equal_to([16, 8, 4])
+
+
+def test_should_record_per_batch_throughput():
+    client = BatchEmbeddingClient(DeterministicFakeEmbedding(size=4), batch_size=2, min_batch_size=2, max_batch_size=2)
+
+    client.embed_documents(["a" * 40, "b" * 40, "c" * 40])
+
+    # Batches run concurrently, so they may finish in either order
+    batch_stats = sorted(client.batch_stats(), key=lambda stats: stats.size, reverse=True)
+    assert_that([stats.size for stats in batch_stats]).is_equal_to([2, 1])
+    assert_that(batch_stats[0].tokens).is_equal_to(20)
+    assert_that(batch_stats[0].chunks_per_second).is_greater_than(0)
+    assert_that(client.stats()).contains_entry({"batches": 2}, {"chunks": 3}, {"tokens": 30})
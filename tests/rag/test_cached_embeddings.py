@@ -0,0 +1,185 @@
+import sqlite3
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from assertpy import assert_that
+from langchain_core.embeddings import Embeddings
+
+from ai_unifier_assesment.rag.cached_embeddings import CachedEmbeddings, SqliteEmbeddingStore, normalize_text
+
+
+def create_embeddings():
+    embeddings = MagicMock(spec=Embeddings)
+    embeddings.embed_query.side_effect = lambda text: [float(len(text)), 0.5]
+    embeddings.aembed_query = AsyncMock(side_effect=lambda text: [float(len(text)), 0.5])
+    return embeddings
+
+
+def test_should_normalize_case_and_whitespace():
+    assert_that(normalize_text("  What   is\tRAG? ")).is_equal_to("what is rag?")
+
+
+def test_should_embed_repeated_question_once():
+    embeddings = create_embeddings()
+    cached = CachedEmbeddings(embeddings, "nomic-embed-text", max_entries=10)
+
+    first = cached.embed_query("What is RAG?")
+    second = cached.embed_query("  what is rag?")
+
+    assert_that(second).is_equal_to(first)
+    embeddings.embed_query.assert_called_once()
+    assert_that(cached.stats()).contains_entry({"hits": 1}, {"misses": 1}, {"hit_rate": 0.5})
+
+
+@pytest.mark.asyncio
+async def test_should_share_cache_between_sync_and_async_queries():
+    embeddings = create_embeddings()
+    cached = CachedEmbeddings(embeddings, "nomic-embed-text", max_entries=10)
+
+    cached.embed_query("What is RAG?")
+    await cached.aembed_query("What is RAG?")
+
+    embeddings.aembed_query.assert_not_awaited()
+
+
+def test_should_evict_least_recently_used_query():
+    embeddings = create_embeddings()
+    cached = CachedEmbeddings(embeddings, "nomic-embed-text", max_entries=1)
+
+    cached.embed_query("first")
+    cached.embed_query("second")
+    cached.embed_query("first")
+
+    assert_that(embeddings.embed_query.call_count).is_equal_to(3)
+    assert_that(cached.stats()["evictions"]).is_equal_to(2)
+
+
+def test_should_not_cache_document_embeddings():
+    embeddings = create_embeddings()
+    embeddings.embed_documents.return_value = [[1.0]]
+    cached = CachedEmbeddings(embeddings, "nomic-embed-text", max_entries=10)
+
+    cached.embed_documents(["chunk"])
+
+    assert_that(cached.stats()["entries"]).is_equal_to(0)
+
+
+def test_should_serve_queries_from_persistent_tier_across_instances(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    first = CachedEmbeddings(create_embeddings(), "nomic-embed-text", 10, SqliteEmbeddingStore(path))
+    first.embed_query("What is RAG?")
+    embeddings = create_embeddings()
+    cached = CachedEmbeddings(embeddings, "nomic-embed-text", 10, SqliteEmbeddingStore(path))
+
+    vector = cached.embed_query("What is RAG?")
+
+    assert_that(vector).is_equal_to([12.0, 0.5])
+    embeddings.embed_query.assert_not_called()
+    assert_that(cached.stats()["persistent_hits"]).is_equal_to(1)
+
+
+def test_should_key_cache_by_model_name(tmp_path):
+    store = SqliteEmbeddingStore(str(tmp_path / "embeddings.sqlite"))
+    CachedEmbeddings(create_embeddings(), "model-a", 10, store).embed_query("What is RAG?")
+    embeddings = create_embeddings()
+
+    CachedEmbeddings(embeddings, "model-b", 10, store).embed_query("What is RAG?")
+
+    embeddings.embed_query.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_should_embed_only_uncached_distinct_queries_of_a_batch():
+    embeddings = create_embeddings()
+    embeddings.aembed_queries = AsyncMock(side_effect=lambda texts: [[float(len(text)), 0.5] for text in texts])
+    cached = CachedEmbeddings(embeddings, "nomic-embed-text", max_entries=10)
+    cached.embed_query("What is RAG?")
+
+    vectors = await cached.aembed_queries(["What is RAG?", "Who is Frodo?", "who is  frodo?", "Sam"])
+
+    embeddings.aembed_queries.assert_awaited_once_with(["Who is Frodo?", "Sam"])
+    assert_that(vectors).is_equal_to([[12.0, 0.5], [13.0, 0.5], [13.0, 0.5], [3.0, 0.5]])
+    assert_that(cached.embed_query("Sam")).is_equal_to([3.0, 0.5])
+
+
+def test_should_fall_back_to_single_query_embeddings_for_batches():
+    embeddings = create_embeddings()
+    cached = CachedEmbeddings(embeddings, "nomic-embed-text", max_entries=10)
+
+    vectors = cached.embed_queries(["a", "bb"])
+
+    assert_that(vectors).is_equal_to([[1.0, 0.5], [2.0, 0.5]])
+    assert_that(embeddings.embed_query.call_count).is_equal_to(2)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += 1.0
+        return self.now
+
+
+def test_should_evict_least_recently_used_vectors_beyond_bound(tmp_path):
+    store = SqliteEmbeddingStore(str(tmp_path / "embeddings.sqlite"), max_entries=10, clock=FakeClock())
+    for i in range(10):
+        store.put(f"key{i}", [float(i)])
+    store.get("key0")
+
+    store.put("key10", [10.0])
+
+    assert_that(len(store)).is_equal_to(9)
+    assert_that(store.get("key0")).is_equal_to([0.0])
+    assert_that(store.get("key1")).is_none()
+    assert_that(store.get("key10")).is_equal_to([10.0])
+
+
+def test_should_not_count_rewritten_keys_towards_bound(tmp_path):
+    store = SqliteEmbeddingStore(str(tmp_path / "embeddings.sqlite"), max_entries=3, clock=FakeClock())
+    for _ in range(5):
+        store.put("key0", [0.0])
+
+    store.put("key1", [1.0])
+    store.put("key2", [2.0])
+
+    assert_that(len(store)).is_equal_to(3)
+
+
+def test_should_add_access_time_to_store_written_without_it(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE embedding_cache (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+    connection.commit()
+    connection.close()
+
+    store = SqliteEmbeddingStore(path, max_entries=2)
+    store.put("key0", [0.0])
+
+    assert_that(store.get("key0")).is_equal_to([0.0])
+
+
+@pytest.mark.asyncio
+async def test_should_access_persistent_tier_off_the_event_loop(tmp_path):
+    loop_thread = threading.get_ident()
+    threads = []
+
+    class RecordingStore(SqliteEmbeddingStore):
+        def get(self, key):
+            threads.append(threading.get_ident())
+            return super().get(key)
+
+        def put(self, key, vector):
+            threads.append(threading.get_ident())
+            super().put(key, vector)
+
+    embeddings = create_embeddings()
+    embeddings.aembed_queries = AsyncMock(side_effect=lambda texts: [[float(len(text)), 0.5] for text in texts])
+    cached = CachedEmbeddings(embeddings, "nomic-embed-text", 10, RecordingStore(str(tmp_path / "e.sqlite")))
+
+    await cached.aembed_query("What is RAG?")
+    await cached.aembed_queries(["Who is Frodo?", "Sam"])
+
+    assert_that(threads).is_length(6)
+    assert_that(threads).does_not_contain(loop_thread)
@@ -0,0 +1,50 @@
+from unittest.mock import AsyncMock
+
+import chromadb
+import pytest
+from assertpy import assert_that
+
+from ai_unifier_assesment.rag.collection_versions import CollectionVersions
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_should_persist_bumped_version_in_collection_metadata():
+    client = chromadb.EphemeralClient()
+    client.get_or_create_collection("versioned_corpus", metadata={"hnsw:space": "cosine"})
+
+    version = CollectionVersions(ttl_seconds=30).bump(client, "versioned_corpus")
+
+    assert_that(CollectionVersions(ttl_seconds=30).get(client, "versioned_corpus")).is_equal_to(version)
+
+
+def test_should_cache_version_until_ttl_expires():
+    client = chromadb.EphemeralClient()
+    clock = FakeClock()
+    versions = CollectionVersions(ttl_seconds=30, clock=clock)
+    before = versions.get(client, "cached_corpus")
+    newer = CollectionVersions(ttl_seconds=30).bump(client, "cached_corpus")
+
+    assert_that(versions.get(client, "cached_corpus")).is_equal_to(before)
+    clock.now = 31.0
+    assert_that(versions.get(client, "cached_corpus")).is_equal_to(newer)
+
+
+@pytest.mark.asyncio
+async def test_should_read_version_with_async_client():
+    client = AsyncMock()
+    client.get_collection.return_value.metadata = {"ingest_version": "v7"}
+    versions = CollectionVersions(ttl_seconds=30)
+
+    first = await versions.aget(client, "async_corpus")
+    second = await versions.aget(client, "async_corpus")
+
+    assert_that(first).is_equal_to("v7")
+    assert_that(second).is_equal_to("v7")
+    client.get_collection.assert_awaited_once_with("async_corpus")
@@ -0,0 +1,97 @@
+from assertpy import assert_that
+from langchain_core.documents import Document
+
+from ai_unifier_assesment.rag.context_packer import pack_context
+
+PASSAGE = (
+    "Frodo Baggins inherited the Ring from his uncle Bilbo after the long-expected party. "
+    "Gandalf returned years later and told him the Ring was the One Ring of Sauron. "
+    "Frodo left the Shire with Sam, Merry and Pippin, and they reached Rivendell after Weathertop."
+)
+
+
+def doc(text: str, source: str = "lotr.pdf", page: int = 1) -> Document:
+    return Document(page_content=text, metadata={"source": source, "page": page})
+
+
+def count_words(text: str) -> int:
+    return len(text.split())
+
+
+def test_should_merge_overlapping_chunks_from_same_page():
+    docs = [doc(PASSAGE[:120]), doc(PASSAGE[90:])]
+
+    context = pack_context(docs, 0, count_words)
+
+    assert_that(context).is_equal_to(f"[Source 1: lotr.pdf, Page 1]\n{PASSAGE}")
+
+
+def test_should_merge_chunks_retrieved_in_reverse_order():
+    docs = [doc(PASSAGE[90:]), doc(PASSAGE[:120])]
+
+    context = pack_context(docs, 0, count_words)
+
+    assert_that(context).is_equal_to(f"[Source 1: lotr.pdf, Page 1]\n{PASSAGE}")
+
+
+def test_should_keep_chunks_from_different_pages_numbered_by_rank():
+    docs = [doc("Frodo meets Gandalf.", page=1), doc("Sam cooks rabbits.", page=2), doc("Gollum follows.", page=3)]
+
+    context = pack_context(docs, 0, count_words)
+
+    assert_that(context).is_equal_to(
+        "[Source 1: lotr.pdf, Page 1]\nFrodo meets Gandalf.\n\n"
+        "[Source 2: lotr.pdf, Page 2]\nSam cooks rabbits.\n\n"
+        "[Source 3: lotr.pdf, Page 3]\nGollum follows."
+    )
+
+
+def test_should_number_merged_block_by_its_best_ranked_chunk():
+    docs = [doc("Sam cooks rabbits.", page=2), doc(PASSAGE[90:]), doc(PASSAGE[:120])]
+
+    context = pack_context(docs, 0, count_words)
+
+    assert_that(context).starts_with("[Source 1: lotr.pdf, Page 2]")
+    assert_that(context).contains(f"[Source 2: lotr.pdf, Page 1]\n{PASSAGE}")
+
+
+def test_should_drop_duplicate_and_contained_chunks():
+    docs = [doc(PASSAGE), doc(PASSAGE, source="copy.pdf"), doc(PASSAGE[20:80])]
+
+    context = pack_context(docs, 0, count_words)
+
+    assert_that(context).is_equal_to(f"[Source 1: lotr.pdf, Page 1]\n{PASSAGE}")
+
+
+def test_should_not_merge_chunks_from_different_sources():
+    docs = [doc(PASSAGE[:120]), doc(PASSAGE[90:], source="hobbit.pdf")]
+
+    context = pack_context(docs, 0, count_words)
+
+    assert_that(context).contains("[Source 1: lotr.pdf, Page 1]", "[Source 2: hobbit.pdf, Page 1]")
+
+
+def test_should_truncate_last_block_to_fit_budget():
+    docs = [doc("Frodo meets Gandalf.", page=1), doc(PASSAGE, page=2)]
+
+    context = pack_context(docs, token_budget=50, count_tokens=count_words)
+
+    assert_that(count_words(context)).is_less_than_or_equal_to(50)
+    assert_that(context).contains("[Source 2: lotr.pdf, Page 2]\nFrodo Baggins inherited")
+    assert_that(context).does_not_contain("Weathertop")
+
+
+def test_should_drop_block_when_too_little_budget_remains():
+    docs = [doc(PASSAGE, page=1), doc(PASSAGE.upper(), page=2)]
+
+    context = pack_context(docs, token_budget=60, count_tokens=count_words)
+
+    assert_that(context).is_equal_to(f"[Source 1: lotr.pdf, Page 1]\n{PASSAGE}")
+
+
+def test_should_keep_all_blocks_when_budget_is_zero():
+    docs = [doc(f"{page}. {PASSAGE}", page=page) for page in range(1, 4)]
+
+    context = pack_context(docs, token_budget=0, count_tokens=count_words)
+
+    assert_that(context.count("[Source ")).is_equal_to(3)
@@ -108,3 +108,39 @@ def test_should_load_and_split_directory():
             mock_load.assert_called_once_with("/test/dir")
             mock_split.assert_called_once_with(mock_docs)
             assert_that(result).is_equal_to(mock_docs)
+
+
+def test_should_stream_chunks_matching_load_and_split():
+    service = DocumentLoaderService(chunk_size=50, chunk_overlap=10)
+    pages = [
+        Document(page_content="first page " * 20, metadata={"source": "test.pdf", "page": 0}),
+        Document(page_content="second page " * 20, metadata={"source": "test.pdf", "page": 1}),
+    ]
+
+    with patch("ai_unifier_assesment.rag.document_loader_service.PyPDFLoader") as mock_loader:
+        mock_loader.return_value.load.return_value = pages
+        mock_loader.return_value.lazy_load.side_effect = lambda: iter(pages)
+
+        streamed = list(service.iter_chunks("test.pdf"))
+        loaded = service.load_and_split("test.pdf")
+
+    assert_that(streamed).is_equal_to(loaded)
+    assert_that([chunk.metadata["page"] for chunk in streamed]).contains(0, 1)
+
+
+def test_should_not_read_ahead_of_the_consumer():
+    service = DocumentLoaderService()
+    read_pages = []
+
+    def lazy_load():
+        for page in range(3):
+            read_pages.append(page)
+            yield Document(page_content=f"page {page}", metadata={"page": page})
+
+    with patch("ai_unifier_assesment.rag.document_loader_service.PyPDFLoader") as mock_loader:
+        mock_loader.return_value.lazy_load.side_effect = lazy_load
+
+        first = next(service.iter_chunks("test.pdf"))
+
+    assert_that(first.page_content).is_equal_to("page 0")
+    assert_that(read_pages).is_equal_to([0])
@@ -2,14 +2,23 @@ from unittest.mock import MagicMock, patch
 
 from assertpy import assert_that
 
-from ai_unifier_assesment.config import Settings
+from ai_unifier_assesment.config import EmbeddingCacheConfig, Settings
+from ai_unifier_assesment.rag.cached_embeddings import CachedEmbeddings
 from ai_unifier_assesment.rag.embedding_service import EmbeddingService
+from ai_unifier_assesment.rag.ollama_embeddings import AsyncOllamaEmbeddings
 
 
-def test_should_create_embeddings_with_configured_model():
+def create_settings(model: str = "nomic-embed-text", base_url: str = "http://localhost:11434", cache_size: int = 0):
     settings = MagicMock(spec=Settings)
-    settings.ollama.embedding_model = "nomic-embed-text"
-    settings.ollama.base_url = "http://localhost:11434"
+    settings.ollama.embedding_model = model
+    settings.ollama.base_url = base_url
+    settings.ollama.embed_concurrency = 4
+    settings.embedding_cache = EmbeddingCacheConfig(max_entries=cache_size, sqlite_path="", sqlite_max_entries=0)
+    return settings
+
+
+def test_should_create_embeddings_with_configured_model():
+    settings = create_settings()
 
     service = EmbeddingService(settings)
 
@@ -23,9 +32,7 @@ def test_should_create_embeddings_with_configured_model():
 
 
 def test_should_use_custom_embedding_model_from_settings():
-    settings = MagicMock(spec=Settings)
-    settings.ollama.embedding_model = "custom-model"
-    settings.ollama.base_url = "http://ollama:11434"
+    settings = create_settings(model="custom-model", base_url="http://ollama:11434")
 
     service = EmbeddingService(settings)
 
@@ -38,17 +45,21 @@ def test_should_use_custom_embedding_model_from_settings():
         )
 
 
-def test_should_return_ollama_embeddings_instance():
-    settings = MagicMock(spec=Settings)
-    settings.ollama.embedding_model = "nomic-embed-text"
-    settings.ollama.base_url = "http://localhost:11434"
+def test_should_return_async_ollama_embeddings_when_cache_disabled():
+    settings = create_settings()
 
     service = EmbeddingService(settings)
 
-    with patch("ai_unifier_assesment.rag.embedding_service.OllamaEmbeddings") as mock_embeddings:
-        mock_instance = MagicMock()
-        mock_embeddings.return_value = mock_instance
+    with patch("ai_unifier_assesment.rag.embedding_service.OllamaEmbeddings"):
+        result = service.get_embeddings()
+
+    assert_that(result).is_instance_of(AsyncOllamaEmbeddings)
+
+
+def test_should_wrap_embeddings_in_cache_when_enabled():
+    service = EmbeddingService(create_settings(cache_size=10))
 
+    with patch("ai_unifier_assesment.rag.embedding_service.OllamaEmbeddings"):
         result = service.get_embeddings()
 
-        assert_that(result).is_equal_to(mock_instance)
+    assert_that(result).is_instance_of(CachedEmbeddings)
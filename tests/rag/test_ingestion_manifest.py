@@ -0,0 +1,46 @@
+from assertpy import assert_that
+from langchain_core.documents import Document
+
+from ai_unifier_assesment.rag.ingestion_manifest import IngestionManifest, chunk_id, ingest_signature, with_chunk_ids
+
+
+def test_should_derive_chunk_id_from_source_page_and_content():
+    document = Document(page_content="Frodo", metadata={"source": "lotr.pdf", "page": 3})
+
+    assert_that(chunk_id("sig", document)).is_equal_to(chunk_id("sig", document.model_copy()))
+    assert_that(chunk_id("sig", document)).is_not_equal_to(
+        chunk_id("sig", Document(page_content="Frodo", metadata={"source": "lotr.pdf", "page": 4}))
+    )
+    assert_that(chunk_id("sig", document)).is_not_equal_to(chunk_id("other", document))
+
+
+def test_should_change_signature_with_chunking_settings_or_model():
+    signature = ingest_signature(500, 100, "nomic-embed-text")
+
+    assert_that(ingest_signature(500, 100, "nomic-embed-text")).is_equal_to(signature)
+    assert_that(ingest_signature(1000, 100, "nomic-embed-text")).is_not_equal_to(signature)
+    assert_that(ingest_signature(500, 100, "mxbai-embed-large")).is_not_equal_to(signature)
+
+
+def test_should_drop_identical_chunks_on_same_page():
+    documents = [Document(page_content="* * *", metadata={"source": "a.pdf", "page": 1}) for _ in range(2)]
+
+    assert_that(with_chunk_ids("sig", documents)).is_length(1)
+
+
+def test_should_persist_entries_per_collection(tmp_path):
+    path = str(tmp_path / "manifest.json")
+    manifest = IngestionManifest(path, "corpus", "sig")
+    manifest.record("a.pdf", "hash-a", ["id-1", "id-2"])
+    manifest.save()
+    other = IngestionManifest(path, "other_corpus", "sig")
+    other.record("b.pdf", "hash-b", ["id-3"])
+    other.save()
+
+    reloaded = IngestionManifest(path, "corpus", "sig")
+
+    assert_that(reloaded.sources()).is_equal_to(["a.pdf"])
+    assert_that(reloaded.chunk_ids("a.pdf")).is_equal_to(["id-1", "id-2"])
+    assert_that(reloaded.is_current("a.pdf", "hash-a")).is_true()
+    assert_that(reloaded.is_current("a.pdf", "hash-changed")).is_false()
+    assert_that(IngestionManifest(path, "corpus", "new-sig").is_current("a.pdf", "hash-a")).is_false()
@@ -0,0 +1,256 @@
+from pathlib import Path
+from typing import Iterator
+
+import chromadb
+import pytest
+from assertpy import assert_that
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from ai_unifier_assesment.config import IngestionConfig
+from ai_unifier_assesment.rag.batch_embedding_client import BatchEmbeddingClient
+from ai_unifier_assesment.rag.ingestion_manifest import IngestionManifest
+from ai_unifier_assesment.rag.ingestion_pipeline import IngestionPipeline
+
+
+def load_lines(path: str) -> Iterator[Document]:
+    with open(path) as file:
+        for i, line in enumerate(file):
+            yield Document(page_content=line.rstrip("\n"), metadata={"source": path, "page": i})
+
+
+def load_or_fail(path: str) -> Iterator[Document]:
+    if path.endswith("doc2.pdf"):
+        raise ValueError("not a PDF")
+    yield from load_lines(path)
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    fail_on_call: int = 0
+    calls: int = 0
+    embedded: int = 0
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise ConnectionError("Ollama went away")
+        self.embedded += len(texts)
+        return super().embed_documents(texts)
+
+
+def create_config(workers: int = 1) -> IngestionConfig:
+    return IngestionConfig(
+        workers=workers,
+        embed_batch_size=2,
+        embed_min_batch_size=2,
+        embed_max_batch_size=2,
+        embed_concurrency=1,
+        embed_target_batch_seconds=2.0,
+        embed_max_retries=0,
+        embed_retry_backoff_seconds=0.0,
+        upsert_batch_size=4,
+        manifest_path="",
+    )
+
+
+def create_corpus(tmp_path: Path, files: int = 2, lines: int = 5) -> list[str]:
+    paths = []
+    for f in range(files):
+        path = tmp_path / f"doc{f}.pdf"
+        path.write_text("\n".join(f"doc{f} line {i}" for i in range(lines)))
+        paths.append(str(path))
+    return paths
+
+
+def run_pipeline(
+    tmp_path, collection, embeddings, paths, signature="sig", workers=1, force=False, loader=load_lines, prune=None
+):
+    config = create_config(workers)
+    manifest = IngestionManifest(str(tmp_path / "manifest.json"), "corpus", signature)
+    embedding_client = BatchEmbeddingClient.from_config(embeddings, config)
+    pipeline = IngestionPipeline(config, loader, embedding_client, collection, manifest, signature, force=force)
+    return pipeline.run(paths, prune_directory=prune)
+
+
+@pytest.fixture
+def collection(request):
+    return chromadb.EphemeralClient().get_or_create_collection(f"pipeline_{request.node.name}"[:60])
+
+
+def test_should_embed_and_upsert_every_chunk(tmp_path, collection):
+    paths = create_corpus(tmp_path)
+
+    report = run_pipeline(tmp_path, collection, CountingEmbeddings(size=8), paths)
+
+    assert_that(report.files).is_equal_to(2)
+    assert_that(report.chunks).is_equal_to(10)
+    assert_that(report.embedding).contains_entry({"batches": 5}, {"chunks": 10})
+    assert_that(collection.count()).is_equal_to(10)
+    stored = collection.get(include=["documents", "metadatas"])
+    assert_that(stored["documents"]).contains("doc1 line 4")
+    assert_that(stored["metadatas"]).contains({"source": paths[0], "page": 0})
+
+
+def test_should_skip_unchanged_files_without_parsing(tmp_path, collection):
+    paths = create_corpus(tmp_path)
+    run_pipeline(tmp_path, collection, CountingEmbeddings(size=8), paths)
+
+    embeddings = CountingEmbeddings(size=8)
+    report = run_pipeline(tmp_path, collection, embeddings, paths)
+
+    assert_that(report.skipped_files).is_equal_to(2)
+    assert_that(embeddings.embedded).is_equal_to(0)
+    assert_that(collection.count()).is_equal_to(10)
+
+
+def test_should_only_embed_changed_pages_and_delete_stale_chunks(tmp_path, collection):
+    paths = create_corpus(tmp_path)
+    run_pipeline(tmp_path, collection, CountingEmbeddings(size=8), paths)
+    Path(paths[1]).write_text("doc1 line 0\ndoc1 line 1\nrewritten line 2")
+
+    embeddings = CountingEmbeddings(size=8)
+    report = run_pipeline(tmp_path, collection, embeddings, paths)
+
+    assert_that(embeddings.embedded).is_equal_to(1)
+    assert_that(report.reused_chunks).is_equal_to(2)
+    assert_that(report.deleted_chunks).is_equal_to(3)
+    assert_that(collection.count()).is_equal_to(8)
+    assert_that(collection.get(include=["documents"])["documents"]).contains("rewritten line 2")
+
+
+def test_should_delete_chunks_of_removed_files(tmp_path, collection):
+    paths = create_corpus(tmp_path)
+    run_pipeline(tmp_path, collection, CountingEmbeddings(size=8), paths)
+
+    report = run_pipeline(tmp_path, collection, CountingEmbeddings(size=8), paths[:1], prune=str(tmp_path))
+
+    assert_that(report.deleted_chunks).is_equal_to(5)
+    assert_that(collection.count()).is_equal_to(5)
+
+
+def test_should_keep_chunks_of_files_ingested_from_another_directory(tmp_path, collection):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    paths_a = create_corpus(tmp_path / "a")
+    paths_b = create_corpus(tmp_path / "b")
+    run_pipeline(tmp_path, collection, CountingEmbeddings(size=8), paths_a, prune=str(tmp_path / "a"))
+
+    report = run_pipeline(tmp_path, collection, CountingEmbeddings(size=8), paths_b, prune=str(tmp_path / "b"))
+
+    assert_that(report.deleted_chunks).is_equal_to(0)
+    assert_that(collection.count()).is_equal_to(20)
+
+
+def test_should_delete_chunks_of_files_removed_from_a_subdirectory(tmp_path, collection):
+    (tmp_path / "sub").mkdir()
+    paths = create_corpus(tmp_path / "sub")
+    run_pipeline(tmp_path, collection, CountingEmbeddings(size=8), paths, prune=str(tmp_path / "sub"))
+    Path(paths[1]).unlink()
+
+    report = run_pipeline(tmp_path, collection, CountingEmbeddings(size=8), [], prune=str(tmp_path))
+
+    assert_that(report.deleted_chunks).is_equal_to(5)
+    assert_that(collection.count()).is_equal_to(5)
+
+
+def test_should_delete_chunks_stored_before_the_manifest_existed(tmp_path, collection):
+    paths = create_corpus(tmp_path)
+    legacy = [document for path in paths for document in load_lines(path)]
+    collection.add(
+        ids=[f"legacy-{i}" for i in range(len(legacy))],
+        embeddings=DeterministicFakeEmbedding(size=8).embed_documents([doc.page_content for doc in legacy]),
+        documents=[doc.page_content for doc in legacy],
+        metadatas=[doc.metadata for doc in legacy],
+    )
+
+    report = run_pipeline(tmp_path, collection, CountingEmbeddings(size=8), paths)
+
+    assert_that(report.deleted_chunks).is_equal_to(10)
+    assert_that(collection.count()).is_equal_to(10)
+    assert_that(collection.get(include=[])["ids"]).does_not_contain("legacy-0")
+
+
+def test_should_resume_after_interruption_without_redoing_upserted_chunks(tmp_path, collection):
+    paths = create_corpus(tmp_path)
+
+    with pytest.raises(ConnectionError):
+        run_pipeline(tmp_path, collection, CountingEmbeddings(size=8, fail_on_call=4), paths)
+    upserted_before_failure = collection.count()
+
+    resumed = CountingEmbeddings(size=8)
+    report = run_pipeline(tmp_path, collection, resumed, paths)
+
+    assert_that(upserted_before_failure).is_equal_to(4)
+    assert_that(report.reused_chunks).is_equal_to(4)
+    assert_that(resumed.embedded).is_equal_to(6)
+    assert_that(collection.count()).is_equal_to(10)
+
+
+def test_should_reembed_everything_when_chunking_settings_change(tmp_path, collection):
+    paths = create_corpus(tmp_path)
+    run_pipeline(tmp_path, collection, CountingEmbeddings(size=8), paths, signature="old")
+
+    embeddings = CountingEmbeddings(size=8)
+    report = run_pipeline(tmp_path, collection, embeddings, paths, signature="new")
+
+    assert_that(embeddings.embedded).is_equal_to(10)
+    assert_that(report.deleted_chunks).is_equal_to(10)
+    assert_that(collection.count()).is_equal_to(10)
+
+
+def test_should_reembed_unchanged_chunks_when_forced(tmp_path, collection):
+    paths = create_corpus(tmp_path)
+    run_pipeline(tmp_path, collection, CountingEmbeddings(size=8), paths)
+
+    embeddings = CountingEmbeddings(size=8)
+    run_pipeline(tmp_path, collection, embeddings, paths, force=True)
+
+    assert_that(embeddings.embedded).is_equal_to(10)
+    assert_that(collection.count()).is_equal_to(10)
+
+
+def test_should_stream_files_from_worker_processes(tmp_path, collection):
+    paths = create_corpus(tmp_path, files=3, lines=40)
+
+    report = run_pipeline(tmp_path, collection, DeterministicFakeEmbedding(size=8), paths, workers=2)
+
+    assert_that(report.files).is_equal_to(3)
+    assert_that(report.chunks).is_equal_to(120)
+    assert_that(collection.count()).is_equal_to(120)
+
+
+def test_should_embed_chunks_before_a_file_is_fully_split(tmp_path, collection):
+    paths = create_corpus(tmp_path, files=1, lines=100)
+    split = []
+
+    class RecordingEmbeddings(CountingEmbeddings):
+        def embed_documents(self, texts: list[str]) -> list[list[float]]:
+            split.append(("embed", len(texts)))
+            return super().embed_documents(texts)
+
+    def loader(path: str) -> Iterator[Document]:
+        for document in load_lines(path):
+            split.append(("chunk", 1))
+            yield document
+
+    report = run_pipeline(tmp_path, collection, RecordingEmbeddings(size=8), paths, loader=loader)
+
+    assert_that(split.index(("embed", 2))).is_less_than(100)
+    assert_that(report.chunks).is_equal_to(100)
+
+
+def test_should_finish_file_split_across_batches_only_once_every_chunk_is_stored(tmp_path, collection):
+    paths = create_corpus(tmp_path, files=1, lines=70)
+
+    run_pipeline(tmp_path, collection, CountingEmbeddings(size=8), paths)
+    manifest = IngestionManifest(str(tmp_path / "manifest.json"), "corpus", "sig")
+
+    assert_that(manifest.chunk_ids(paths[0])).is_length(70)
+    assert_that(collection.count()).is_equal_to(70)
+
+
+def test_should_raise_when_a_worker_fails_to_parse(tmp_path, collection):
+    paths = create_corpus(tmp_path, files=3)
+
+    with pytest.raises(RuntimeError, match="doc2.pdf"):
+        run_pipeline(tmp_path, collection, CountingEmbeddings(size=8), paths, workers=2, loader=load_or_fail)
@@ -3,7 +3,7 @@ from unittest.mock import MagicMock
 from assertpy import assert_that
 from langchain_core.documents import Document
 
-from ai_unifier_assesment.config import Settings
+from ai_unifier_assesment.config import IngestionConfig, Settings
 from ai_unifier_assesment.rag.document_loader_service import DocumentLoaderService
 from ai_unifier_assesment.rag.ingestion_service import IngestionService
 from ai_unifier_assesment.rag.vector_store_service import VectorStoreService
@@ -28,10 +28,96 @@ def test_should_ingest_pdf_and_return_chunk_count():
 
     document_loader.load_and_split.assert_called_once_with("test.pdf")
     vector_store_service.get_vector_store.assert_called_once_with("test_collection")
-    mock_vector_store.add_documents.assert_called_once_with(chunks)
+    assert_that(mock_vector_store.add_documents.call_args.args[0]).is_equal_to(chunks)
+    assert_that(mock_vector_store.add_documents.call_args.kwargs["ids"]).is_length(2)
     assert_that(result).is_equal_to(2)
 
 
+def test_should_bump_collection_version_after_ingesting():
+    settings = MagicMock(spec=Settings)
+    document_loader = MagicMock(spec=DocumentLoaderService)
+    vector_store_service = MagicMock(spec=VectorStoreService)
+    document_loader.load_and_split.return_value = [Document(page_content="chunk1", metadata={})]
+
+    service = IngestionService(settings, document_loader, vector_store_service)
+    service.ingest_pdf("test.pdf", "test_collection")
+
+    vector_store_service.bump_collection_version.assert_called_once_with("test_collection")
+
+
+def test_should_publish_local_index_after_ingesting_when_local_backend_is_selected():
+    settings = MagicMock(spec=Settings)
+    document_loader = MagicMock(spec=DocumentLoaderService)
+    vector_store_service = MagicMock(spec=VectorStoreService)
+    vector_store_service.uses_local_index.return_value = True
+    document_loader.load_and_split.return_value = [Document(page_content="chunk1", metadata={})]
+
+    service = IngestionService(settings, document_loader, vector_store_service)
+    service.ingest_pdf("test.pdf", "test_collection")
+
+    vector_store_service.publish_local_index.assert_called_once_with("test_collection")
+
+
+def test_should_not_publish_local_index_for_chroma_backend():
+    settings = MagicMock(spec=Settings)
+    document_loader = MagicMock(spec=DocumentLoaderService)
+    vector_store_service = MagicMock(spec=VectorStoreService)
+    vector_store_service.uses_local_index.return_value = False
+    document_loader.load_and_split.return_value = [Document(page_content="chunk1", metadata={})]
+
+    service = IngestionService(settings, document_loader, vector_store_service)
+    service.ingest_pdf("test.pdf", "test_collection")
+
+    vector_store_service.publish_local_index.assert_not_called()
+
+
+def test_should_publish_lexical_index_after_ingesting_when_hybrid_search_is_enabled():
+    settings = MagicMock(spec=Settings)
+    document_loader = MagicMock(spec=DocumentLoaderService)
+    vector_store_service = MagicMock(spec=VectorStoreService)
+    vector_store_service.uses_local_index.return_value = False
+    vector_store_service.uses_hybrid_search.return_value = True
+    document_loader.load_and_split.return_value = [Document(page_content="chunk1", metadata={})]
+
+    service = IngestionService(settings, document_loader, vector_store_service)
+    service.ingest_pdf("test.pdf", "test_collection")
+
+    vector_store_service.publish_lexical_index.assert_called_once_with("test_collection")
+
+
+def test_should_not_duplicate_chunks_when_pdf_is_ingested_twice():
+    settings = MagicMock(spec=Settings)
+    document_loader = MagicMock(spec=DocumentLoaderService)
+    vector_store_service = MagicMock(spec=VectorStoreService)
+    document_loader.load_and_split.return_value = [Document(page_content="chunk1", metadata={"source": "a.pdf"})]
+    mock_vector_store = vector_store_service.get_vector_store.return_value
+
+    service = IngestionService(settings, document_loader, vector_store_service)
+    service.ingest_pdf("a.pdf", "test_collection")
+    service.ingest_pdf("a.pdf", "test_collection")
+
+    first, second = mock_vector_store.add_documents.call_args_list
+    assert_that(second.kwargs["ids"]).is_equal_to(first.kwargs["ids"])
+
+
+def test_should_delete_chunks_an_edited_pdf_no_longer_produces():
+    settings = MagicMock(spec=Settings)
+    settings.ingestion.upsert_batch_size = 100
+    document_loader = MagicMock(spec=DocumentLoaderService)
+    vector_store_service = MagicMock(spec=VectorStoreService)
+    document_loader.load_and_split.return_value = [Document(page_content="edited", metadata={"source": "a.pdf"})]
+    collection = vector_store_service.refresh_collection.return_value
+
+    service = IngestionService(settings, document_loader, vector_store_service)
+    service.ingest_pdf("a.pdf", "test_collection")
+    (new_id,) = vector_store_service.get_vector_store.return_value.add_documents.call_args.kwargs["ids"]
+    collection.get.return_value = {"ids": [new_id, "old-chunk"]}
+    service.ingest_pdf("a.pdf", "test_collection")
+
+    collection.get.assert_called_with(where={"source": "a.pdf"}, include=[])
+    collection.delete.assert_called_once_with(ids=["old-chunk"])
+
+
 def test_should_ingest_directory_and_return_chunk_count():
     settings = MagicMock(spec=Settings)
     document_loader = MagicMock(spec=DocumentLoaderService)
@@ -96,3 +182,38 @@ def test_should_return_zero_count_when_collection_not_found():
 
     assert_that(result["collection_name"]).is_equal_to("missing_collection")
     assert_that(result["document_count"]).is_equal_to(0)
+
+
+def test_should_run_incremental_ingestion_and_bump_version(tmp_path):
+    settings = MagicMock(spec=Settings)
+    settings.ingestion = IngestionConfig(
+        workers=1,
+        embed_batch_size=2,
+        embed_min_batch_size=1,
+        embed_max_batch_size=4,
+        embed_concurrency=1,
+        embed_target_batch_seconds=2.0,
+        embed_max_retries=0,
+        embed_retry_backoff_seconds=0.0,
+        upsert_batch_size=2,
+        manifest_path=str(tmp_path / "manifest.json"),
+    )
+    settings.rag.chunk_size = 500
+    settings.rag.chunk_overlap = 100
+    pdf = tmp_path / "a.pdf"
+    pdf.write_text("content")
+    document_loader = MagicMock(spec=DocumentLoaderService)
+    document_loader.list_pdfs.return_value = [str(pdf)]
+    document_loader.iter_chunks.return_value = iter([Document(page_content="chunk1", metadata={"source": "a.pdf"})])
+    vector_store_service = MagicMock(spec=VectorStoreService)
+    vector_store_service.get_embeddings.return_value.embed_documents.return_value = [[0.1, 0.2]]
+    vector_store_service.refresh_collection.return_value.get.return_value = {"ids": []}
+
+    service = IngestionService(settings, document_loader, vector_store_service)
+    report = service.ingest_directory_pipelined(str(tmp_path), "test_collection")
+
+    vector_store_service.refresh_collection.assert_called_once_with("test_collection")
+    vector_store_service.refresh_collection.return_value.upsert.assert_called_once()
+    vector_store_service.refresh_collection.return_value.delete.assert_not_called()
+    vector_store_service.bump_collection_version.assert_called_once_with("test_collection")
+    assert_that(report.chunks).is_equal_to(1)
@@ -0,0 +1,95 @@
+import chromadb
+import numpy as np
+import pytest
+from assertpy import assert_that
+
+from ai_unifier_assesment.rag.lexical_index import (
+    LexicalIndex,
+    LexicalIndexStore,
+    build_lexical_index,
+    current_version,
+    tokenize,
+)
+
+PASSAGES = [
+    "Gandalf drew Glamdring, the Foe-hammer, in the mines of Moria.",
+    "Elrond welcomed the hobbits to Imladris, also called Rivendell.",
+    "The hobbits walked along the road to Bree.",
+    "Rivendell, the Last Homely House, lies east of the Misty Mountains.",
+    "Frodo carried the Ring; Sam carried the pots and pans along the road.",
+]
+
+
+@pytest.fixture
+def collection(request):
+    collection = chromadb.EphemeralClient().get_or_create_collection(f"lexical_{request.node.name[-50:]}")
+    collection.add(
+        ids=[f"id{i}" for i in range(len(PASSAGES))],
+        embeddings=[[float(i), 1.0] for i in range(len(PASSAGES))],
+        documents=PASSAGES,
+        metadatas=[{"source": "lotr.pdf", "page": i} for i in range(len(PASSAGES))],
+    )
+    return collection
+
+
+def test_should_tokenize_case_insensitively_on_word_characters():
+    assert_that(tokenize("Foe-hammer, GLAMDRING's")).is_equal_to(["foe", "hammer", "glamdring", "s"])
+
+
+def test_should_find_rare_proper_noun(tmp_path, collection):
+    index = LexicalIndex(build_lexical_index(collection, str(tmp_path), "v1"))
+
+    docs = index.documents(index.search("Where was Glamdring drawn?", 3)[0])
+
+    assert_that(docs[0].id).is_equal_to("id0")
+    assert_that(docs[0].metadata).is_equal_to({"source": "lotr.pdf", "page": 0})
+
+
+def test_should_rank_documents_matching_more_query_terms_first(tmp_path, collection):
+    index = LexicalIndex(build_lexical_index(collection, str(tmp_path), "v1"))
+
+    rows, scores = index.search("hobbits road", 5)
+
+    assert_that(index.documents(rows[:1])[0].id).is_equal_to("id2")
+    assert_that(list(scores)).is_equal_to(sorted(scores, reverse=True))
+
+
+def test_should_weight_rare_terms_above_common_ones(tmp_path, collection):
+    index = LexicalIndex(build_lexical_index(collection, str(tmp_path), "v1"))
+
+    rows, _ = index.search("the imladris", 2)
+
+    assert_that(index.documents(rows)[0].id).is_equal_to("id1")
+
+
+def test_should_return_nothing_for_unknown_terms(tmp_path, collection):
+    index = LexicalIndex(build_lexical_index(collection, str(tmp_path), "v1"))
+
+    rows, scores = index.search("Shelob Cirith Ungol", 5)
+
+    assert_that(rows).is_empty()
+    assert_that(scores).is_empty()
+
+
+def test_should_store_postings_compactly(tmp_path, collection):
+    target = build_lexical_index(collection, str(tmp_path), "v1")
+
+    with np.load(target / "postings.npz") as postings:
+        assert_that(postings["doc_ids"].dtype).is_equal_to(np.uint32)
+        assert_that(postings["term_freqs"].dtype).is_equal_to(np.uint16)
+        assert_that(int(postings["offsets"][-1])).is_equal_to(len(postings["doc_ids"]))
+
+
+def test_should_publish_next_to_vector_index_and_reload_new_versions(tmp_path, collection):
+    build_lexical_index(collection, str(tmp_path), "v1")
+    store = LexicalIndexStore(str(tmp_path), refresh_seconds=0)
+
+    first = store.get(collection.name)
+    collection.add(ids=["id9"], embeddings=[[9.0, 1.0]], documents=["Shelob waited in Cirith Ungol."])
+    build_lexical_index(collection, str(tmp_path), "v2")
+    second = store.get(collection.name)
+
+    assert_that(current_version(str(tmp_path), collection.name)).is_equal_to("v2")
+    assert_that((tmp_path / f"{collection.name}-bm25").is_dir()).is_true()
+    assert_that(len(first)).is_equal_to(5)
+    assert_that(second.documents(second.search("Shelob", 1)[0])[0].id).is_equal_to("id9")
@@ -0,0 +1,240 @@
+import re
+from pathlib import Path
+
+import chromadb
+import numpy as np
+import pytest
+from assertpy import assert_that
+from langchain_chroma import Chroma
+
+from ai_unifier_assesment.rag.local_index import LocalIndexStore, LocalVectorIndex, build_local_index, current_version
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def clustered_vectors(count: int, dim: int = 16, clusters: int = 8, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)) * 5
+    return (centers[rng.integers(clusters, size=count)] + rng.normal(size=(count, dim))).astype(np.float32)
+
+
+@pytest.fixture
+def collection(request):
+    name = re.sub(r"[^a-zA-Z0-9]+", "_", request.node.name)[-50:].strip("_")
+    return chromadb.EphemeralClient().get_or_create_collection(f"local_{name}")
+
+
+def fill(collection, vectors: np.ndarray) -> None:
+    collection.add(
+        ids=[f"id{i}" for i in range(len(vectors))],
+        embeddings=vectors.tolist(),
+        documents=[f"chunk {i}" for i in range(len(vectors))],
+        metadatas=[{"source": "book.pdf", "page": i} for i in range(len(vectors))],
+    )
+
+
+def test_should_find_exact_nearest_neighbours_without_inverted_lists(tmp_path, collection):
+    vectors = clustered_vectors(300)
+    fill(collection, vectors)
+    query = vectors[42] + 0.01
+
+    index = LocalVectorIndex(build_local_index(collection, str(tmp_path), "v1", n_lists=0))
+    rows, distances = index.search(query.tolist(), 5)
+
+    expected = np.argsort(((vectors - query) ** 2).sum(axis=1))[:5]
+    assert_that([doc.id for doc in index.documents(rows)]).is_equal_to([f"id{i}" for i in expected])
+    assert_that(distances[0]).is_close_to(float(((vectors[42] - query) ** 2).sum()), 1e-3)
+    assert_that(index.documents(rows)[0].metadata).is_equal_to({"source": "book.pdf", "page": 42})
+
+
+def test_should_match_exact_search_when_probing_every_list(tmp_path, collection):
+    vectors = clustered_vectors(500)
+    fill(collection, vectors)
+    query = clustered_vectors(1, seed=7)[0]
+
+    exact = LocalVectorIndex(build_local_index(collection, str(tmp_path / "exact"), "v1", n_lists=0))
+    ivf = LocalVectorIndex(build_local_index(collection, str(tmp_path / "ivf"), "v1", n_lists=16))
+
+    exact_ids = [doc.id for doc in exact.documents(exact.search(query.tolist(), 10)[0])]
+    probed_ids = [doc.id for doc in ivf.documents(ivf.search(query.tolist(), 10, nprobe=16)[0])]
+    assert_that(probed_ids).is_equal_to(exact_ids)
+
+
+def test_should_keep_high_recall_when_probing_a_few_lists(tmp_path, collection):
+    vectors = clustered_vectors(2000)
+    fill(collection, vectors)
+    exact = LocalVectorIndex(build_local_index(collection, str(tmp_path / "exact"), "v1", n_lists=0))
+    ivf = LocalVectorIndex(build_local_index(collection, str(tmp_path / "ivf"), "v1"))
+
+    hits = 0
+    queries = clustered_vectors(20, seed=3)
+    for query in queries:
+        expected = {doc.id for doc in exact.documents(exact.search(query.tolist(), 10)[0])}
+        found = {doc.id for doc in ivf.documents(ivf.search(query.tolist(), 10, nprobe=8)[0])}
+        hits += len(expected & found)
+
+    assert_that(hits / (10 * len(queries))).is_greater_than_or_equal_to(0.9)
+
+
+def test_should_select_the_same_documents_as_chroma_mmr(tmp_path, collection):
+    vectors = clustered_vectors(200)
+    fill(collection, vectors)
+    query = clustered_vectors(1, seed=11)[0].tolist()
+    chroma = Chroma(client=chromadb.EphemeralClient(), collection_name=collection.name)
+
+    index = LocalVectorIndex(build_local_index(collection, str(tmp_path), "v1"))
+    local_docs = index.max_marginal_relevance_search_by_vector(query, k=5, fetch_k=20)
+    chroma_docs = chroma.max_marginal_relevance_search_by_vector(query, k=5, fetch_k=20)
+
+    assert_that(sorted(doc.id for doc in local_docs)).is_equal_to(sorted(doc.id for doc in chroma_docs))
+
+
+def test_should_publish_new_version_and_remove_old_ones(tmp_path, collection):
+    fill(collection, clustered_vectors(10))
+
+    build_local_index(collection, str(tmp_path), "v1")
+    build_local_index(collection, str(tmp_path), "v2")
+
+    assert_that(current_version(str(tmp_path), collection.name)).is_equal_to("v2")
+    assert_that(sorted(path.name for path in (tmp_path / collection.name).iterdir())).is_equal_to(["CURRENT", "v2"])
+
+
+def test_should_reload_published_version_after_refresh_interval(tmp_path, collection):
+    fill(collection, clustered_vectors(10))
+    build_local_index(collection, str(tmp_path), "v1")
+    clock = FakeClock()
+    store = LocalIndexStore(str(tmp_path), refresh_seconds=30, clock=clock)
+
+    first = store.get(collection.name)
+    build_local_index(collection, str(tmp_path), "v2")
+    before_refresh = store.get(collection.name)
+    clock.now = 31
+    after_refresh = store.get(collection.name)
+
+    assert_that(first.version).is_equal_to("v1")
+    assert_that(before_refresh).is_same_as(first)
+    assert_that(after_refresh.version).is_equal_to("v2")
+
+
+def test_should_raise_when_collection_was_never_exported(tmp_path):
+    store = LocalIndexStore(str(tmp_path), refresh_seconds=30)
+
+    with pytest.raises(FileNotFoundError, match="run ingestion first"):
+        store.get("rag_corpus")
+
+
+def test_should_store_vectors_as_float32_grouped_by_list(tmp_path, collection):
+    fill(collection, clustered_vectors(100))
+
+    target = build_local_index(collection, str(tmp_path), "v1", n_lists=4)
+
+    assert_that(Path(target / "vectors.f32").stat().st_size).is_equal_to(100 * 16 * 4)
+    with np.load(target / "ivf.npz") as ivf:
+        assert_that(ivf["offsets"].tolist()[0]).is_equal_to(0)
+        assert_that(ivf["offsets"].tolist()[-1]).is_equal_to(100)
+
+
+@pytest.mark.parametrize("quantization, code_bytes", [("int8", 100 * 16), ("binary", 100 * 2)])
+def test_should_store_compact_codes_next_to_float32_vectors(tmp_path, collection, quantization, code_bytes):
+    fill(collection, clustered_vectors(100))
+
+    index = LocalVectorIndex(build_local_index(collection, str(tmp_path), "v1", quantization=quantization))
+
+    assert_that(index.quantization).is_equal_to(quantization)
+    assert_that(index.scanned_bytes).is_equal_to(code_bytes)
+    assert_that(index.vector_bytes).is_equal_to(100 * 16 * 4)
+
+
+def test_should_keep_high_recall_when_rescoring_int8_candidates(tmp_path, collection):
+    vectors = clustered_vectors(1000, dim=64)
+    fill(collection, vectors)
+    index = LocalVectorIndex(build_local_index(collection, str(tmp_path), "v1", n_lists=0, quantization="int8"))
+
+    hits = 0
+    queries = clustered_vectors(20, dim=64, seed=5)
+    for query in queries:
+        exact_rows, _ = index.search(query.tolist(), 5, exact=True)
+        rows, _ = index.search(query.tolist(), 5, rescore=10)
+        hits += len(set(exact_rows) & set(rows))
+
+    assert_that(hits / (5 * len(queries))).is_greater_than_or_equal_to(0.9)
+
+
+def test_should_find_nearest_neighbour_from_binary_codes(tmp_path, collection):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(1000, 64)).astype(np.float32)
+    fill(collection, vectors)
+    index = LocalVectorIndex(build_local_index(collection, str(tmp_path), "v1", n_lists=0, quantization="binary"))
+
+    targets = range(0, 1000, 50)
+    found = [
+        index.documents(index.search((vectors[i] + rng.normal(size=64) * 0.5).tolist(), 1, rescore=20)[0])[0].id
+        for i in targets
+    ]
+
+    assert_that(found).is_equal_to([f"id{i}" for i in targets])
+
+
+def test_should_return_exact_distances_for_rescored_candidates(tmp_path, collection):
+    vectors = clustered_vectors(300)
+    fill(collection, vectors)
+    query = vectors[42] + 0.01
+
+    index = LocalVectorIndex(build_local_index(collection, str(tmp_path), "v1", n_lists=0, quantization="int8"))
+    rows, distances = index.search(query.tolist(), 3, rescore=20)
+
+    assert_that(index.documents(rows)[0].id).is_equal_to("id42")
+    assert_that(distances[0]).is_close_to(float(((vectors[42] - query) ** 2).sum()), 1e-3)
+    assert_that(list(distances)).is_equal_to(sorted(distances))
+
+
+def test_should_search_quantized_index_of_empty_collection(tmp_path, collection):
+    collection.add(ids=["only"], embeddings=[[1.0, 2.0]], documents=["only chunk"])
+    collection.delete(ids=["only"])
+
+    index = LocalVectorIndex(build_local_index(collection, str(tmp_path), "v1", quantization="int8"))
+
+    assert_that(len(index.search([1.0, 2.0], 5)[0])).is_equal_to(0)
+
+
+@pytest.mark.parametrize("quantization", ["none", "int8", "binary"])
+def test_should_match_single_query_search_when_searching_many(tmp_path, collection, quantization):
+    vectors = clustered_vectors(3000)
+    fill(collection, vectors)
+    index = LocalVectorIndex(build_local_index(collection, str(tmp_path), "v1", quantization=quantization))
+    queries = clustered_vectors(100, seed=9).tolist()
+
+    results = index.search_many(queries, 10, nprobe=4, rescore=30)
+
+    for query, (rows, distances) in zip(queries, results):
+        expected_rows, expected_distances = index.search(query, 10, nprobe=4, rescore=30)
+        assert_that(rows.tolist()).is_equal_to(expected_rows.tolist())
+        assert_that(np.allclose(distances, expected_distances, rtol=1e-4, atol=1e-2)).is_true()
+
+
+def test_should_select_the_same_documents_for_many_queries_as_one_by_one(tmp_path, collection):
+    fill(collection, clustered_vectors(500))
+    index = LocalVectorIndex(build_local_index(collection, str(tmp_path), "v1", n_lists=8))
+    queries = clustered_vectors(5, seed=13).tolist()
+
+    batched = index.max_marginal_relevance_search_by_vectors(queries, k=5, fetch_k=20, nprobe=2)
+
+    one_by_one = [index.max_marginal_relevance_search_by_vector(q, k=5, fetch_k=20, nprobe=2) for q in queries]
+    assert_that([[doc.id for doc in docs] for docs in batched]).is_equal_to(
+        [[doc.id for doc in docs] for docs in one_by_one]
+    )
+
+
+def test_should_search_many_in_empty_index(tmp_path, collection):
+    collection.add(ids=["only"], embeddings=[[1.0, 2.0]], documents=["only chunk"])
+    collection.delete(ids=["only"])
+
+    index = LocalVectorIndex(build_local_index(collection, str(tmp_path), "v1"))
+
+    assert_that([len(rows) for rows, _ in index.search_many([[1.0, 2.0], [2.0, 1.0]], 5)]).is_equal_to([0, 0])
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from assertpy import assert_that
+from langchain_core.vectorstores.utils import maximal_marginal_relevance as langchain_mmr
+
+from ai_unifier_assesment.rag.mmr import maximal_marginal_relevance
+
+
+@pytest.mark.parametrize("lambda_mult", [0.0, 0.25, 0.5, 0.75, 1.0])
+def test_should_select_same_candidates_as_langchain(lambda_mult):
+    rng = np.random.default_rng(0)
+    for _ in range(10):
+        query = rng.normal(size=32)
+        candidates = rng.normal(size=(200, 32))
+
+        selected = maximal_marginal_relevance(query, candidates, k=10, lambda_mult=lambda_mult)
+
+        assert_that(selected).is_equal_to(langchain_mmr(query, candidates, k=10, lambda_mult=lambda_mult))
+
+
+def test_should_pick_most_relevant_candidate_first():
+    selected = maximal_marginal_relevance([1.0, 0.0], [[0.0, 1.0], [1.0, 0.1], [1.0, 0.0]], k=1)
+
+    assert_that(selected).is_equal_to([2])
+
+
+def test_should_prefer_diverse_candidates_over_near_duplicates():
+    candidates = [[1.0, 0.0], [1.0, 0.01], [0.6, 0.8]]
+
+    selected = maximal_marginal_relevance([1.0, 0.0], candidates, k=2, lambda_mult=0.3)
+
+    assert_that(selected).is_equal_to([0, 2])
+
+
+def test_should_not_select_more_than_available_or_repeat_candidates():
+    selected = maximal_marginal_relevance([1.0, 0.0], [[1.0, 0.0], [0.0, 1.0]], k=5)
+
+    assert_that(sorted(selected)).is_equal_to([0, 1])
+
+
+def test_should_return_nothing_without_candidates():
+    assert_that(maximal_marginal_relevance([1.0, 0.0], np.zeros((0, 2)), k=3)).is_empty()
+
+
+def test_should_treat_zero_vectors_as_unrelated():
+    selected = maximal_marginal_relevance([1.0, 0.0], [[0.0, 0.0], [1.0, 0.0]], k=2)
+
+    assert_that(selected).is_equal_to([1, 0])
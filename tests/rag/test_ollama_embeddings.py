@@ -0,0 +1,115 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+from assertpy import assert_that
+from langchain_community.embeddings import OllamaEmbeddings
+
+from ai_unifier_assesment.rag.ollama_embeddings import AsyncOllamaEmbeddings
+
+
+@pytest.mark.asyncio
+async def test_should_embed_query_with_same_payload_as_sync_client(httpx_mock):
+    httpx_mock.add_response(url="http://ollama:11434/api/embeddings", json={"embedding": [0.1, 0.2]})
+    embeddings = AsyncOllamaEmbeddings(OllamaEmbeddings(model="nomic-embed-text", base_url="http://ollama:11434"))
+
+    vector = await embeddings.aembed_query("What is RAG?")
+
+    payload = json.loads(httpx_mock.get_request().content)
+    assert_that(vector).is_equal_to([0.1, 0.2])
+    assert_that(payload).contains_entry({"model": "nomic-embed-text"}, {"prompt": "query: What is RAG?"})
+    await embeddings.aclose()
+
+
+@pytest.mark.asyncio
+async def test_should_send_model_options_like_sync_client(httpx_mock):
+    httpx_mock.add_response(url="http://ollama:11434/api/embeddings", json={"embedding": [0.1]})
+    client = OllamaEmbeddings(model="m", base_url="http://ollama:11434", temperature=0.3, num_ctx=2048)
+    embeddings = AsyncOllamaEmbeddings(client)
+
+    await embeddings.aembed_query("What is RAG?")
+
+    payload = json.loads(httpx_mock.get_request().content)
+    assert_that(payload["options"]).contains_entry({"temperature": 0.3}, {"num_ctx": 2048})
+    assert_that(payload["options"]).is_equal_to(client._default_params["options"])
+    await embeddings.aclose()
+
+
+@pytest.mark.asyncio
+async def test_should_embed_documents_in_order(httpx_mock):
+    vectors_by_prompt = {"passage: a": [1.0], "passage: b": [2.0]}
+    httpx_mock.add_callback(
+        lambda request: httpx.Response(
+            200, json={"embedding": vectors_by_prompt[json.loads(request.content)["prompt"]]}
+        ),
+        is_reusable=True,
+    )
+    embeddings = AsyncOllamaEmbeddings(OllamaEmbeddings(model="m", base_url="http://ollama:11434"))
+
+    vectors = await embeddings.aembed_documents(["a", "b"])
+
+    assert_that(vectors).is_equal_to([[1.0], [2.0]])
+    await embeddings.aclose()
+
+
+@pytest.mark.asyncio
+async def test_should_raise_on_error_response(httpx_mock):
+    httpx_mock.add_response(status_code=500, text="model not found")
+    embeddings = AsyncOllamaEmbeddings(OllamaEmbeddings(model="missing", base_url="http://ollama:11434"))
+
+    with pytest.raises(ValueError, match="model not found"):
+        await embeddings.aembed_query("question")
+    await embeddings.aclose()
+
+
+@pytest.mark.asyncio
+async def test_should_embed_query_batch_with_query_instruction(httpx_mock):
+    httpx_mock.add_callback(
+        lambda request: httpx.Response(200, json={"embedding": [float(len(json.loads(request.content)["prompt"]))]}),
+        is_reusable=True,
+    )
+    embeddings = AsyncOllamaEmbeddings(OllamaEmbeddings(model="m", base_url="http://ollama:11434"))
+
+    vectors = await embeddings.aembed_queries(["a", "bb"])
+
+    prompts = [json.loads(request.content)["prompt"] for request in httpx_mock.get_requests()]
+    assert_that(sorted(prompts)).is_equal_to(["query: a", "query: bb"])
+    assert_that(vectors).is_equal_to([[8.0], [9.0]])
+    await embeddings.aclose()
+
+
+@pytest.mark.asyncio
+async def test_should_bound_concurrent_requests(httpx_mock):
+    in_flight = 0
+    peak = 0
+
+    async def respond(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"embedding": [1.0]})
+
+    httpx_mock.add_callback(respond, is_reusable=True)
+    embeddings = AsyncOllamaEmbeddings(OllamaEmbeddings(model="m", base_url="http://ollama:11434"), max_concurrency=3)
+
+    vectors = await embeddings.aembed_queries([f"q{i}" for i in range(20)])
+
+    assert_that(vectors).is_length(20)
+    assert_that(peak).is_equal_to(3)
+    await embeddings.aclose()
+
+
+def test_should_embed_query_batch_concurrently_in_order():
+    client = OllamaEmbeddings(model="m", base_url="http://ollama:11434")
+    embeddings = AsyncOllamaEmbeddings(client, max_concurrency=4)
+
+    with patch.object(OllamaEmbeddings, "embed_query", side_effect=lambda text: [float(len(text))]) as embed_query:
+        vectors = embeddings.embed_queries(["a", "bb", "ccc", "dddd", "eeeee"])
+
+    assert_that(vectors).is_equal_to([[1.0], [2.0], [3.0], [4.0], [5.0]])
+    assert_that(embed_query.call_count).is_equal_to(5)
+    assert_that(embeddings.embed_queries([])).is_empty()
@@ -1,15 +1,24 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
+import pytest
 from assertpy import assert_that
 from langchain_core.documents import Document
 
 from ai_unifier_assesment.config import Settings
+from ai_unifier_assesment.rag.answer_cache import SemanticAnswerCache
 from ai_unifier_assesment.rag.qa_service import QAService
+from ai_unifier_assesment.rag.retrieval_cache import RetrievalCache
 from ai_unifier_assesment.rag.vector_store_service import VectorStoreService
 
 
-def test_should_create_llm_with_configured_base_url():
+def create_settings() -> MagicMock:
     settings = MagicMock(spec=Settings)
+    settings.rag.context_token_budget = 0
+    return settings
+
+
+def test_should_create_llm_with_configured_base_url():
+    settings = create_settings()
     settings.ollama.base_url = "http://ollama:11434"
     vector_store_service = MagicMock(spec=VectorStoreService)
 
@@ -25,7 +34,7 @@ def test_should_create_llm_with_configured_base_url():
 
 
 def test_should_format_docs_with_citations():
-    settings = MagicMock(spec=Settings)
+    settings = create_settings()
     vector_store_service = MagicMock(spec=VectorStoreService)
 
     service = QAService(settings, vector_store_service)
@@ -43,7 +52,7 @@ def test_should_format_docs_with_citations():
 
 
 def test_should_format_docs_with_unknown_source():
-    settings = MagicMock(spec=Settings)
+    settings = create_settings()
     vector_store_service = MagicMock(spec=VectorStoreService)
 
     service = QAService(settings, vector_store_service)
@@ -54,8 +63,29 @@ def test_should_format_docs_with_unknown_source():
     assert_that(result).contains("[Source 1: Unknown, Page N/A]")
 
 
+def test_should_pack_docs_within_context_token_budget():
+    settings = create_settings()
+    settings.rag.context_token_budget = 100
+    vector_store_service = MagicMock(spec=VectorStoreService)
+
+    service = QAService(settings, vector_store_service)
+    docs = [
+        Document(page_content=f"Chunk {number} " + "hobbit " * 150, metadata={"source": "lotr.pdf", "page": number})
+        for number in range(1, 4)
+    ]
+
+    with patch("ai_unifier_assesment.rag.qa_service.encoding_registry") as registry:
+        registry.get.return_value.encode.side_effect = lambda text, **kwargs: text.split()
+        result = service.format_docs_with_citations(docs)
+
+    registry.get.assert_called_with("llama3.2")
+    registry.get.return_value.encode.assert_called_with(ANY, disallowed_special=())
+    assert_that(result).contains("[Source 1: lotr.pdf, Page 1]")
+    assert_that(result).does_not_contain("[Source 2:", "[Source 3:")
+
+
 def test_should_get_prompt_with_citation_instructions():
-    settings = MagicMock(spec=Settings)
+    settings = create_settings()
     vector_store_service = MagicMock(spec=VectorStoreService)
 
     service = QAService(settings, vector_store_service)
@@ -69,7 +99,7 @@ def test_should_get_prompt_with_citation_instructions():
 
 
 def test_should_answer_question_and_return_sources():
-    settings = MagicMock(spec=Settings)
+    settings = create_settings()
     settings.ollama.base_url = "http://localhost:11434"
     vector_store_service = MagicMock(spec=VectorStoreService)
 
@@ -96,8 +126,154 @@ def test_should_answer_question_and_return_sources():
         assert_that(result).contains_key("retrieval_time_ms")
 
 
+def test_should_retrieve_once_and_feed_same_docs_into_prompt():
+    settings = create_settings()
+    vector_store_service = MagicMock(spec=VectorStoreService)
+
+    mock_retriever = MagicMock()
+    mock_retriever.invoke.return_value = [
+        Document(page_content="Test content", metadata={"source": "test.pdf", "page": 1}),
+    ]
+    vector_store_service.get_retriever.return_value = mock_retriever
+
+    service = QAService(settings, vector_store_service)
+
+    with patch.object(service, "create_chain") as mock_chain:
+        mock_chain.return_value.invoke.return_value = "Test answer [Source 1]"
+
+        service.answer("What is the question?")
+
+        mock_retriever.invoke.assert_called_once_with("What is the question?")
+        chain_input = mock_chain.return_value.invoke.call_args.args[0]
+        assert_that(chain_input["context"]).contains("[Source 1: test.pdf, Page 1]")
+        assert_that(chain_input["question"]).is_equal_to("What is the question?")
+
+
+def test_should_serve_paraphrased_question_from_answer_cache():
+    settings = create_settings()
+    vector_store_service = MagicMock(spec=VectorStoreService)
+    vector_store_service.get_collection_version.return_value = "v1"
+    vector_store_service.get_embeddings.return_value.embed_query.side_effect = [[1.0, 0.0], [0.99, 0.01]]
+    vector_store_service.get_retriever.return_value.invoke.return_value = [
+        Document(page_content="Test content", metadata={"source": "test.pdf", "page": 1}),
+    ]
+    service = QAService(settings, vector_store_service, answer_cache=SemanticAnswerCache(0.9, 10))
+
+    with patch.object(service, "create_chain") as mock_chain:
+        mock_chain.return_value.invoke.return_value = "Test answer [Source 1]"
+
+        first = service.answer("What is RAG?")
+        second = service.answer("Explain RAG")
+
+    mock_chain.return_value.invoke.assert_called_once()
+    assert_that(first["cached"]).is_false()
+    assert_that(second).contains_entry({"cached": True}, {"answer": "Test answer [Source 1]"})
+    assert_that(second["sources"]).is_equal_to(first["sources"])
+
+
+def test_should_not_serve_cached_answer_for_different_mmr_parameters():
+    settings = create_settings()
+    vector_store_service = MagicMock(spec=VectorStoreService)
+    vector_store_service.get_collection_version.return_value = "v1"
+    vector_store_service.get_embeddings.return_value.embed_query.return_value = [1.0, 0.0]
+    vector_store_service.get_retriever.return_value.invoke.return_value = [
+        Document(page_content="Test content", metadata={"source": "test.pdf", "page": 1}),
+    ]
+    service = QAService(settings, vector_store_service, answer_cache=SemanticAnswerCache(0.9, 10))
+
+    with patch.object(service, "create_chain") as mock_chain:
+        mock_chain.return_value.invoke.return_value = "Test answer [Source 1]"
+
+        service.answer("What is RAG?", lambda_mult=0.5)
+        relevance_only = service.answer("What is RAG?", lambda_mult=1.0)
+        wider = service.answer("What is RAG?", fetch_k=50)
+        repeated = service.answer("What is RAG?", lambda_mult=1.0)
+
+    assert_that(relevance_only["cached"]).is_false()
+    assert_that(wider["cached"]).is_false()
+    assert_that(repeated["cached"]).is_true()
+    assert_that(mock_chain.return_value.invoke.call_count).is_equal_to(3)
+
+
+@pytest.mark.asyncio
+async def test_should_not_serve_cached_answer_asynchronously_for_different_mmr_parameters():
+    settings = create_settings()
+    vector_store_service = MagicMock(spec=VectorStoreService)
+    vector_store_service.aget_collection_version.return_value = "v1"
+    vector_store_service.get_embeddings.return_value.aembed_query = AsyncMock(return_value=[1.0, 0.0])
+    vector_store_service.aretrieve_by_vector.return_value = []
+    service = QAService(settings, vector_store_service, answer_cache=SemanticAnswerCache(0.9, 10))
+
+    with patch.object(service, "create_chain") as mock_chain:
+        mock_chain.return_value.ainvoke = AsyncMock(return_value="Test answer")
+
+        await service.aanswer("What is RAG?", lambda_mult=0.5)
+        second = await service.aanswer("What is RAG?", lambda_mult=1.0)
+
+    assert_that(second["cached"]).is_false()
+    assert_that(vector_store_service.aretrieve_by_vector.await_count).is_equal_to(2)
+
+
+@pytest.mark.asyncio
+async def test_should_answer_asynchronously_with_single_embedding():
+    settings = create_settings()
+    vector_store_service = MagicMock(spec=VectorStoreService)
+    vector_store_service.get_embeddings.return_value.aembed_query = AsyncMock(return_value=[1.0, 0.0])
+    vector_store_service.aretrieve_by_vector.return_value = [
+        Document(page_content="Test content", metadata={"source": "test.pdf", "page": 1}),
+    ]
+    service = QAService(settings, vector_store_service)
+
+    with patch.object(service, "create_chain") as mock_chain:
+        mock_chain.return_value.ainvoke = AsyncMock(return_value="Test answer [Source 1]")
+
+        result = await service.aanswer("What is the question?", "custom_collection")
+
+    vector_store_service.aretrieve_by_vector.assert_awaited_once_with(
+        [1.0, 0.0], "custom_collection", fetch_k=20, lambda_mult=0.5, query="What is the question?"
+    )
+    chain_input = mock_chain.return_value.ainvoke.call_args.args[0]
+    assert_that(chain_input["context"]).contains("[Source 1: test.pdf, Page 1]")
+    assert_that(result).contains_entry({"answer": "Test answer [Source 1]"}, {"cached": False})
+    assert_that(result["sources"]).is_equal_to([{"source": "test.pdf", "page": 1}])
+
+
+@pytest.mark.asyncio
+async def test_should_serve_cached_answer_asynchronously():
+    settings = create_settings()
+    vector_store_service = MagicMock(spec=VectorStoreService)
+    vector_store_service.aget_collection_version.return_value = "v1"
+    vector_store_service.get_embeddings.return_value.aembed_query = AsyncMock(side_effect=[[1.0, 0.0], [0.99, 0.01]])
+    vector_store_service.aretrieve_by_vector.return_value = []
+    service = QAService(settings, vector_store_service, answer_cache=SemanticAnswerCache(0.9, 10))
+
+    with patch.object(service, "create_chain") as mock_chain:
+        mock_chain.return_value.ainvoke = AsyncMock(return_value="Test answer")
+
+        await service.aanswer("What is RAG?")
+        second = await service.aanswer("Explain RAG")
+
+    vector_store_service.aretrieve_by_vector.assert_awaited_once()
+    assert_that(second).contains_entry({"cached": True}, {"answer": "Test answer"})
+
+
+@pytest.mark.asyncio
+async def test_should_retrieve_only_asynchronously():
+    settings = create_settings()
+    vector_store_service = MagicMock(spec=VectorStoreService)
+    vector_store_service.aretrieve.return_value = [
+        Document(page_content="Content 1", metadata={"source": "file1.pdf", "page": 1}),
+    ]
+    service = QAService(settings, vector_store_service)
+
+    result = await service.aretrieve_only("test question", "custom_collection", k=3)
+
+    vector_store_service.aretrieve.assert_awaited_once_with("test question", "custom_collection", 3, 20, 0.5)
+    assert_that(result["documents"]).is_equal_to([{"content": "Content 1", "source": "file1.pdf", "page": 1}])
+
+
 def test_should_retrieve_only_without_llm():
-    settings = MagicMock(spec=Settings)
+    settings = create_settings()
     vector_store_service = MagicMock(spec=VectorStoreService)
 
     mock_retriever = MagicMock()
@@ -111,7 +287,7 @@ def test_should_retrieve_only_without_llm():
     service = QAService(settings, vector_store_service)
     result = service.retrieve_only("test question", k=5)
 
-    vector_store_service.get_retriever.assert_called_once_with("rag_corpus", 5)
+    vector_store_service.get_retriever.assert_called_once_with("rag_corpus", 5, fetch_k=20, lambda_mult=0.5)
     assert_that(result["documents"]).is_length(2)
     assert_that(result["documents"][0]["content"]).is_equal_to("Content 1")
     assert_that(result["documents"][0]["source"]).is_equal_to("file1.pdf")
@@ -119,7 +295,7 @@ def test_should_retrieve_only_without_llm():
 
 
 def test_should_use_custom_collection_name():
-    settings = MagicMock(spec=Settings)
+    settings = create_settings()
     vector_store_service = MagicMock(spec=VectorStoreService)
 
     mock_retriever = MagicMock()
@@ -129,4 +305,97 @@ def test_should_use_custom_collection_name():
     service = QAService(settings, vector_store_service)
     service.retrieve_only("test", collection_name="custom_collection")
 
-    vector_store_service.get_retriever.assert_called_once_with("custom_collection", 5)
+    vector_store_service.get_retriever.assert_called_once_with("custom_collection", 5, fetch_k=20, lambda_mult=0.5)
+
+
+def test_should_share_retrieval_cache_between_retrieve_only_and_answer():
+    settings = create_settings()
+    vector_store_service = MagicMock(spec=VectorStoreService)
+    vector_store_service.get_collection_version.return_value = "v1"
+    vector_store_service.get_retriever.return_value.invoke.return_value = [
+        Document(page_content="Content 1", metadata={"source": "file1.pdf", "page": 1}),
+    ]
+    service = QAService(settings, vector_store_service, retrieval_cache=RetrievalCache(10))
+
+    with patch.object(service, "create_chain") as mock_chain:
+        mock_chain.return_value.invoke.return_value = "Answer [Source 1]"
+
+        first = service.retrieve_only("What is RAG?")
+        second = service.retrieve_only("What is RAG?")
+        answer = service.answer("What is RAG?")
+
+    vector_store_service.get_retriever.return_value.invoke.assert_called_once_with("What is RAG?")
+    assert_that(second["documents"]).is_equal_to(first["documents"])
+    assert_that(answer["sources"]).is_equal_to([{"source": "file1.pdf", "page": 1}])
+
+
+def test_should_retrieve_again_after_collection_version_changes():
+    settings = create_settings()
+    vector_store_service = MagicMock(spec=VectorStoreService)
+    vector_store_service.get_collection_version.side_effect = ["v1", "v2"]
+    vector_store_service.get_retriever.return_value.invoke.return_value = []
+    service = QAService(settings, vector_store_service, retrieval_cache=RetrievalCache(10))
+
+    service.retrieve_only("What is RAG?")
+    service.retrieve_only("What is RAG?")
+
+    assert_that(vector_store_service.get_retriever.return_value.invoke.call_count).is_equal_to(2)
+
+
+@pytest.mark.asyncio
+async def test_should_serve_repeated_async_retrievals_from_retrieval_cache():
+    settings = create_settings()
+    vector_store_service = MagicMock(spec=VectorStoreService)
+    vector_store_service.aget_collection_version.return_value = "v1"
+    vector_store_service.get_embeddings.return_value.aembed_query = AsyncMock(return_value=[1.0, 0.0])
+    vector_store_service.aretrieve.return_value = [Document(page_content="Content 1", metadata={})]
+    vector_store_service.aretrieve_by_vector.return_value = [Document(page_content="Content 1", metadata={})]
+    service = QAService(settings, vector_store_service, retrieval_cache=RetrievalCache(10))
+
+    await service.aretrieve_only("What is RAG?")
+    await service.aretrieve_only("What is RAG?")
+    await service.aretrieve_context("What is RAG?")
+    context = await service.aretrieve_context("What is RAG?")
+
+    vector_store_service.aretrieve.assert_awaited_once()
+    vector_store_service.aretrieve_by_vector.assert_not_awaited()
+    assert_that(context.docs).is_length(1)
+
+
+def test_should_retrieve_many_questions_in_one_batch():
+    settings = create_settings()
+    vector_store_service = MagicMock(spec=VectorStoreService)
+    vector_store_service.retrieve_many.return_value = [
+        [Document(page_content="Frodo", metadata={"source": "lotr.pdf", "page": 1})],
+        [],
+    ]
+    service = QAService(settings, vector_store_service)
+
+    result = service.retrieve_many(["Who is Frodo?", "Who is Sam?"], "custom_collection", k=3)
+
+    vector_store_service.retrieve_many.assert_called_once_with(
+        ["Who is Frodo?", "Who is Sam?"], "custom_collection", 3, 20, 0.5
+    )
+    assert_that(result["results"]).is_length(2)
+    assert_that(result["results"][0]["documents"]).is_equal_to([{"content": "Frodo", "source": "lotr.pdf", "page": 1}])
+    assert_that(result["results"][1]).contains_key("retrieval_time_ms")
+    assert_that(result).contains_key("retrieval_time_ms")
+
+
+@pytest.mark.asyncio
+async def test_should_only_search_uncached_questions_of_a_batch():
+    settings = create_settings()
+    vector_store_service = MagicMock(spec=VectorStoreService)
+    vector_store_service.aget_collection_version.return_value = "v1"
+    vector_store_service.aretrieve.return_value = [Document(page_content="Frodo", metadata={})]
+    vector_store_service.aretrieve_many.return_value = [[Document(page_content="Sam", metadata={})]]
+    service = QAService(settings, vector_store_service, retrieval_cache=RetrievalCache(10))
+
+    await service.aretrieve_only("Who is Frodo?")
+    result = await service.aretrieve_many(["Who is Frodo?", "Who is Sam?"])
+    repeated = await service.aretrieve_many(["Who is Sam?"])
+
+    vector_store_service.aretrieve_many.assert_awaited_once_with(["Who is Sam?"], "rag_corpus", 5, 20, 0.5)
+    vector_store_service.aget_collection_version.assert_awaited()
+    assert_that([r["documents"][0]["content"] for r in result["results"]]).is_equal_to(["Frodo", "Sam"])
+    assert_that(repeated["results"][0]["documents"][0]["content"]).is_equal_to("Sam")
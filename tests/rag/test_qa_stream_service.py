@@ -0,0 +1,95 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from assertpy import assert_that
+from langchain_core.documents import Document
+
+from ai_unifier_assesment.rag.qa_service import QAService, RetrievedContext
+from ai_unifier_assesment.rag.qa_stream_service import QAStreamService
+from ai_unifier_assesment.services.metrics_sink import MetricsSink
+from ai_unifier_assesment.services.stream_metrics import StreamMetrics, TokenCounter
+
+
+def create_context(cached_answer: str | None = None) -> RetrievedContext:
+    return RetrievedContext(
+        collection_name="rag_corpus",
+        answer_scope="rag_corpus:mmr:20:0.5",
+        embedding=[1.0, 0.0],
+        version="v1",
+        docs=[Document(page_content="Frodo", metadata={"source": "lotr.pdf", "page": 3})],
+        sources=[{"source": "lotr.pdf", "page": 3}],
+        retrieval_time_ms=12.5,
+        cached_answer=cached_answer,
+    )
+
+
+def create_service(context: RetrievedContext, tokens: list[str]) -> tuple[QAStreamService, MagicMock, MagicMock]:
+    async def astream(inputs):
+        for token in tokens:
+            yield token
+
+    qa_service = MagicMock(spec=QAService)
+    qa_service.aretrieve_context = AsyncMock(return_value=context)
+    qa_service.format_docs_with_citations.return_value = "[Source 1: lotr.pdf, Page 3]\nFrodo"
+    qa_service.get_prompt.return_value.format.return_value = "prompt"
+    qa_service.create_chain.return_value.astream = astream
+    metrics = MagicMock(spec=StreamMetrics)
+    metrics.build_stats.return_value = {"prompt_tokens": 1, "completion_tokens": 3, "cost": 0.0, "latency_ms": 5.0}
+    token_counter = MagicMock(spec=TokenCounter)
+    token_counter.count_text_tokens.return_value = 1
+    metrics_sink = MagicMock(spec=MetricsSink)
+    return QAStreamService(qa_service, metrics, token_counter, metrics_sink), qa_service, metrics_sink
+
+
+async def collect(service: QAStreamService) -> list[str]:
+    return [event async for event in service.stream_answer("Who carried the ring?")]
+
+
+@pytest.mark.asyncio
+async def test_should_send_sources_before_tokens_and_stats_last():
+    service, _, _ = create_service(create_context(), ["Frodo", " did", " [Source 1]"])
+
+    events = await collect(service)
+
+    assert_that(events[0]).starts_with("event: sources\n")
+    sources = json.loads(events[0].split("data: ", 1)[1])
+    assert_that(sources).is_equal_to(
+        {"sources": [{"source": "lotr.pdf", "page": 3}], "retrieval_time_ms": 12.5, "cached": False}
+    )
+    assert_that(events[1:4]).is_equal_to(["data: Frodo\n\n", "data:  did\n\n", "data:  [Source 1]\n\n"])
+    assert_that(events[-1]).starts_with("event: stats\ndata: ")
+
+
+@pytest.mark.asyncio
+async def test_should_remember_full_answer_and_record_metrics():
+    service, qa_service, metrics_sink = create_service(create_context(), ["Frodo", " did"])
+
+    await collect(service)
+
+    qa_service.remember_answer.assert_called_once()
+    assert_that(qa_service.remember_answer.call_args.args[1]).is_equal_to("Frodo did")
+    metrics_sink.record.assert_called_once()
+    assert_that(metrics_sink.record.call_args.kwargs).contains_entry(
+        {"endpoint": "rag_qa"}, {"prompt_tokens": 1}, {"completion_tokens": 2}
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_stream_cached_answer_without_calling_llm():
+    service, qa_service, _ = create_service(create_context(cached_answer="Frodo did"), [])
+
+    events = await collect(service)
+
+    qa_service.create_chain.assert_not_called()
+    assert_that(json.loads(events[0].split("data: ", 1)[1])["cached"]).is_true()
+    assert_that(events[1]).is_equal_to("data: Frodo did\n\n")
+
+
+@pytest.mark.asyncio
+async def test_should_keep_multiline_tokens_in_one_event():
+    service, _, _ = create_service(create_context(), ["line one\nline two"])
+
+    events = await collect(service)
+
+    assert_that(events[1]).is_equal_to("data: line one\ndata: line two\n\n")
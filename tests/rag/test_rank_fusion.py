@@ -0,0 +1,34 @@
+from assertpy import assert_that
+from langchain_core.documents import Document
+
+from ai_unifier_assesment.rag.rank_fusion import reciprocal_rank_fusion
+
+
+def docs(*ids: str) -> list[Document]:
+    return [Document(page_content=f"content {doc_id}", id=doc_id) for doc_id in ids]
+
+
+def test_should_rank_documents_found_by_both_lists_first():
+    fused = reciprocal_rank_fusion([docs("a", "b", "c"), docs("c", "d")], k=4)
+
+    assert_that([doc.id for doc in fused]).is_equal_to(["c", "a", "b", "d"])
+
+
+def test_should_keep_only_top_k():
+    fused = reciprocal_rank_fusion([docs("a", "b", "c"), docs("d", "e")], k=2)
+
+    assert_that(fused).is_length(2)
+
+
+def test_should_break_ties_in_favour_of_earlier_lists():
+    fused = reciprocal_rank_fusion([docs("dense"), docs("lexical")], k=2)
+
+    assert_that([doc.id for doc in fused]).is_equal_to(["dense", "lexical"])
+
+
+def test_should_match_documents_without_ids_by_content():
+    unnamed = [Document(page_content="same text")]
+
+    fused = reciprocal_rank_fusion([unnamed, [Document(page_content="other")] + unnamed], k=3)
+
+    assert_that([doc.page_content for doc in fused]).is_equal_to(["same text", "other"])
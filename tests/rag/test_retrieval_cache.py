@@ -0,0 +1,67 @@
+from assertpy import assert_that
+from langchain_core.documents import Document
+
+from ai_unifier_assesment.rag.retrieval_cache import RetrievalCache
+
+
+def key(query: str = "who is frodo?", version: str = "v1", k: int = 5) -> tuple:
+    return RetrievalCache.key("rag_corpus", version, query, k, "mmr", 20, 0.5)
+
+
+def test_should_return_stored_documents_for_identical_request():
+    cache = RetrievalCache(10)
+    docs = [Document(page_content="Frodo Baggins")]
+
+    cache.put(key(), docs)
+
+    assert_that(cache.get(key())).is_equal_to(docs)
+    assert_that(cache.stats()).contains_entry({"hits": 1}, {"misses": 0})
+
+
+def test_should_miss_when_any_retrieval_parameter_differs():
+    cache = RetrievalCache(10)
+    cache.put(key(), [Document(page_content="Frodo Baggins")])
+
+    assert_that(cache.get(key(k=3))).is_none()
+    assert_that(cache.get(key(query="who is sam?"))).is_none()
+    assert_that(cache.get(RetrievalCache.key("other", "v1", "who is frodo?", 5, "mmr", 20, 0.5))).is_none()
+    assert_that(cache.get(RetrievalCache.key("rag_corpus", "v1", "who is frodo?", 5, "mmr", 20, 0.7))).is_none()
+
+
+def test_should_miss_after_collection_version_changes():
+    cache = RetrievalCache(10)
+    cache.put(key(version="v1"), [Document(page_content="Frodo Baggins")])
+
+    assert_that(cache.get(key(version="v2"))).is_none()
+
+
+def test_should_evict_least_recently_used_entry():
+    cache = RetrievalCache(2)
+    cache.put(key("a"), [])
+    cache.put(key("b"), [])
+    cache.get(key("a"))
+    cache.put(key("c"), [])
+
+    assert_that(cache.get(key("b"))).is_none()
+    assert_that(cache.get(key("a"))).is_not_none()
+    assert_that(cache.stats()).contains_entry({"entries": 2}, {"evictions": 1})
+
+
+def test_should_not_share_stored_list_with_callers():
+    cache = RetrievalCache(10)
+    docs = [Document(page_content="Frodo Baggins")]
+    cache.put(key(), docs)
+
+    cache.get(key()).clear()
+    docs.clear()
+
+    assert_that(cache.get(key())).is_length(1)
+
+
+def test_should_store_nothing_when_disabled():
+    cache = RetrievalCache(0)
+
+    cache.put(key(), [Document(page_content="Frodo Baggins")])
+
+    assert_that(cache.enabled).is_false()
+    assert_that(cache.get(key())).is_none()
@@ -1,10 +1,17 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import chromadb
+import pytest
 from assertpy import assert_that
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
 
 from ai_unifier_assesment.config import Settings
 from ai_unifier_assesment.rag.embedding_service import EmbeddingService
+from ai_unifier_assesment.rag.local_index import build_local_index
+from ai_unifier_assesment.rag.vector_search_retriever import VectorSearchRetriever
 from ai_unifier_assesment.rag.vector_store_service import VectorStoreService
+from ai_unifier_assesment.resource_registry import ResourceRegistry
 
 
 def test_should_create_chroma_client_with_configured_host_and_port():
@@ -65,32 +72,96 @@ def test_should_create_vector_store_with_custom_collection_name():
             assert_that(mock_chroma.call_args[1]["collection_name"]).is_equal_to("custom_collection")
 
 
+def test_should_build_vector_store_with_a_fresh_collection_handle_each_time():
+    settings = MagicMock(spec=Settings)
+    service = VectorStoreService(settings, MagicMock(spec=EmbeddingService), ResourceRegistry())
+
+    with patch("ai_unifier_assesment.rag.vector_store_service.chromadb.HttpClient"):
+        with patch("ai_unifier_assesment.rag.vector_store_service.Chroma") as mock_chroma:
+            service.get_vector_store()
+            service.get_vector_store()
+
+    assert_that(mock_chroma.call_count).is_equal_to(2)
+
+
+def create_chroma_results(vectors: list[list[float]]) -> dict:
+    return {
+        "ids": [[f"id{i}" for i in range(len(vectors))]],
+        "documents": [[f"chunk {i}" for i in range(len(vectors))]],
+        "metadatas": [[{"page": i} for i in range(len(vectors))]],
+        "distances": [[0.0] * len(vectors)],
+        "embeddings": [vectors],
+    }
+
+
 def test_should_create_retriever_with_mmr_search():
     settings = MagicMock(spec=Settings)
-    settings.chroma.host = "localhost"
-    settings.chroma.port = 8000
     embedding_service = MagicMock(spec=EmbeddingService)
-    embedding_service.get_embeddings.return_value = MagicMock()
+    embedding_service.get_embeddings.return_value = DeterministicFakeEmbedding(size=2)
+    collection = MagicMock()
+    collection.query.return_value = create_chroma_results([[1.0, 0.0], [0.99, 0.1], [0.0, 1.0]])
 
     service = VectorStoreService(settings, embedding_service)
 
-    with patch("ai_unifier_assesment.rag.vector_store_service.chromadb.HttpClient"):
-        with patch("ai_unifier_assesment.rag.vector_store_service.Chroma") as mock_chroma:
-            mock_vector_store = MagicMock()
-            mock_chroma.return_value = mock_vector_store
-            mock_retriever = MagicMock()
-            mock_vector_store.as_retriever.return_value = mock_retriever
+    with patch.object(service, "get_collection", return_value=collection):
+        retriever = service.get_retriever(k=2)
+        docs = retriever.invoke("question")
 
-            result = service.get_retriever()
+    assert_that(retriever).is_instance_of(VectorSearchRetriever)
+    assert_that(collection.query.call_args.kwargs["n_results"]).is_equal_to(20)
+    assert_that(docs).is_length(2)
 
-            mock_vector_store.as_retriever.assert_called_once_with(
-                search_type="mmr",
-                search_kwargs={"k": 5, "fetch_k": 20},
-            )
-            assert_that(result).is_equal_to(mock_retriever)
 
+def test_should_refetch_cached_collection_chroma_no_longer_knows():
+    settings = MagicMock(spec=Settings)
+    stale, fresh = MagicMock(), MagicMock()
+    stale.query.side_effect = chromadb.errors.NotFoundError("Collection abc does not exist")
+    fresh.query.return_value = create_chroma_results([[1.0, 0.0]])
+    client = MagicMock()
+    client.get_or_create_collection.side_effect = [stale, fresh]
 
-def test_should_create_retriever_with_custom_k():
+    service = VectorStoreService(settings, MagicMock(spec=EmbeddingService), ResourceRegistry())
+
+    with patch.object(service, "get_client", return_value=client):
+        first = service.retrieve_by_vector([1.0, 0.0], k=1)
+        second = service.retrieve_by_vector([1.0, 0.0], k=1)
+
+    assert_that([doc.id for doc in first + second]).is_equal_to(["id0", "id0"])
+    assert_that(client.get_or_create_collection.call_count).is_equal_to(2)
+    assert_that(fresh.query.call_count).is_equal_to(2)
+
+
+def test_should_not_refetch_collection_on_other_errors():
+    settings = MagicMock(spec=Settings)
+    collection = MagicMock()
+    collection.query.side_effect = ConnectionError("Chroma unavailable")
+
+    service = VectorStoreService(settings, MagicMock(spec=EmbeddingService))
+
+    with patch.object(service, "get_collection", return_value=collection):
+        with pytest.raises(ConnectionError):
+            service.retrieve_by_vector([1.0, 0.0], k=1)
+
+    collection.query.assert_called_once()
+
+
+def test_should_rerank_fetched_candidates_with_lambda_mult():
+    settings = MagicMock(spec=Settings)
+    collection = MagicMock()
+    collection.query.return_value = create_chroma_results([[1.0, 0.0], [0.99, 0.1], [0.0, 1.0]])
+
+    service = VectorStoreService(settings, MagicMock(spec=EmbeddingService))
+
+    with patch.object(service, "get_collection", return_value=collection):
+        relevant = service.retrieve_by_vector([1.0, 0.0], k=2, fetch_k=50, lambda_mult=1.0)
+        diverse = service.retrieve_by_vector([1.0, 0.0], k=2, fetch_k=50, lambda_mult=0.0)
+
+    assert_that(collection.query.call_args.kwargs["n_results"]).is_equal_to(50)
+    assert_that([doc.id for doc in relevant]).is_equal_to(["id0", "id1"])
+    assert_that([doc.id for doc in diverse]).is_equal_to(["id0", "id2"])
+
+
+def test_should_create_similarity_retriever_with_custom_k():
     settings = MagicMock(spec=Settings)
     settings.chroma.host = "localhost"
     settings.chroma.port = 8000
@@ -104,9 +175,12 @@ def test_should_create_retriever_with_custom_k():
             mock_vector_store = MagicMock()
             mock_chroma.return_value = mock_vector_store
 
-            service.get_retriever(k=10)
+            service.get_retriever(k=10, search_type="similarity")
 
-            assert_that(mock_vector_store.as_retriever.call_args[1]["search_kwargs"]["k"]).is_equal_to(10)
+            mock_vector_store.as_retriever.assert_called_once_with(
+                search_type="similarity",
+                search_kwargs={"k": 10},
+            )
 
 
 def test_should_raise_connection_error_when_chromadb_fails():
@@ -125,3 +199,167 @@ def test_should_raise_connection_error_when_chromadb_fails():
             assert False, "Expected ConnectionError to be raised"
         except ConnectionError as e:
             assert_that(str(e)).contains("Unable to establish connection to ChromaDB server")
+
+
+def create_local_settings(tmp_path) -> MagicMock:
+    settings = MagicMock(spec=Settings)
+    settings.rag.vector_backend = "local"
+    settings.rag.index_dir = str(tmp_path)
+    settings.rag.index_nprobe = 4
+    settings.rag.index_quantization = "int8"
+    settings.rag.hybrid_search = False
+    settings.answer_cache.collection_version_ttl_seconds = 30
+    return settings
+
+
+def test_should_serve_retriever_from_local_index_when_selected(tmp_path):
+    embedding_service = MagicMock(spec=EmbeddingService)
+    embedding_service.get_embeddings.return_value = DeterministicFakeEmbedding(size=2)
+    service = VectorStoreService(create_local_settings(tmp_path), embedding_service)
+
+    collection = chromadb.EphemeralClient().get_or_create_collection("local_retriever")
+    texts = [f"passage number {i}" for i in range(10)]
+    collection.add(ids=texts, embeddings=DeterministicFakeEmbedding(size=2).embed_documents(texts), documents=texts)
+    build_local_index(collection, str(tmp_path), "v1")
+
+    docs = service.get_retriever("local_retriever", k=3, search_type="similarity").invoke("passage number 7")
+
+    assert_that(docs).is_length(3)
+    assert_that(docs[0].page_content).is_equal_to("passage number 7")
+
+
+@pytest.mark.asyncio
+async def test_should_retrieve_and_version_from_local_index_without_chroma(tmp_path):
+    collection = chromadb.EphemeralClient().get_or_create_collection("local_backend")
+    collection.add(ids=["a", "b"], embeddings=[[1.0, 0.0], [0.0, 1.0]], documents=["alpha", "beta"])
+    build_local_index(collection, str(tmp_path), "v7")
+    service = VectorStoreService(create_local_settings(tmp_path), MagicMock(spec=EmbeddingService))
+
+    with patch("ai_unifier_assesment.rag.vector_store_service.chromadb") as mock_chromadb:
+        docs = await service.aretrieve_by_vector([1.0, 0.1], "local_backend", k=1, fetch_k=2)
+        version = await service.aget_collection_version("local_backend")
+
+    assert_that([doc.page_content for doc in docs]).is_equal_to(["alpha"])
+    assert_that(version).is_equal_to("v7")
+    mock_chromadb.HttpClient.assert_not_called()
+
+
+def test_should_publish_local_index_only_when_version_changed(tmp_path):
+    service = VectorStoreService(create_local_settings(tmp_path), MagicMock(spec=EmbeddingService))
+    client = chromadb.EphemeralClient()
+    client.get_or_create_collection("publish_me").add(ids=["a"], embeddings=[[1.0, 0.0]], documents=["alpha"])
+
+    with patch.object(service, "get_client", return_value=client):
+        first = service.publish_local_index("publish_me")
+        unchanged = service.publish_local_index("publish_me")
+        service.bump_collection_version("publish_me")
+        bumped = service.publish_local_index("publish_me")
+
+    assert_that(first).is_not_none()
+    assert_that(unchanged).is_none()
+    assert_that(bumped).is_not_equal_to(first)
+    assert_that(service.get_local_index("publish_me").version).is_equal_to(bumped.name)
+
+
+def create_hybrid_service(tmp_path) -> tuple[VectorStoreService, MagicMock]:
+    settings = create_local_settings(tmp_path)
+    settings.rag.vector_backend = "chroma"
+    settings.rag.hybrid_search = True
+    settings.rag.rrf_k = 60
+    collection = MagicMock()
+    collection.query.return_value = create_chroma_results([[1.0, 0.0], [0.9, 0.1]])
+    collection.name = "hybrid"
+    collection.get.side_effect = lambda include, limit, offset: (
+        {"ids": [], "documents": [], "metadatas": []}
+        if offset
+        else {
+            "ids": ["id0", "id1", "glamdring"],
+            "documents": ["chunk 0", "chunk 1", "Gandalf drew Glamdring"],
+            "metadatas": [None, None, {"page": 7}],
+        }
+    )
+    service = VectorStoreService(settings, MagicMock(spec=EmbeddingService))
+    return service, collection
+
+
+def test_should_fuse_lexical_matches_into_dense_results(tmp_path):
+    service, collection = create_hybrid_service(tmp_path)
+
+    with patch.object(service, "get_collection", return_value=collection):
+        with patch.object(service, "_collection_versions") as versions:
+            versions.return_value.get.return_value = "v1"
+            with patch.object(service, "get_client"):
+                service.publish_lexical_index("hybrid")
+        dense_only = service.retrieve_by_vector([1.0, 0.0], "hybrid", k=2)
+        hybrid = service.retrieve_by_vector([1.0, 0.0], "hybrid", k=2, query="Glamdring")
+
+    assert_that([doc.id for doc in dense_only]).is_equal_to(["id0", "id1"])
+    assert_that([doc.id for doc in hybrid]).is_equal_to(["id0", "glamdring"])
+
+
+@pytest.mark.asyncio
+async def test_should_fuse_lexical_matches_into_async_results(tmp_path):
+    service, collection = create_hybrid_service(tmp_path)
+    with patch.object(service, "get_collection", return_value=collection):
+        with patch.object(service, "_collection_versions") as versions:
+            versions.return_value.get.return_value = "v1"
+            with patch.object(service, "get_client"):
+                service.publish_lexical_index("hybrid")
+    async_search = MagicMock()
+    async_search.max_marginal_relevance_search_by_vector = AsyncMock(return_value=docs_with_ids("id0", "id1"))
+
+    with patch.object(service, "get_async_search", return_value=async_search):
+        result = await service.aretrieve_by_vector([1.0, 0.0], "hybrid", k=2, query="Glamdring")
+
+    assert_that([doc.id for doc in result]).is_equal_to(["id0", "glamdring"])
+
+
+def test_should_fall_back_to_dense_results_without_lexical_index(tmp_path):
+    service, collection = create_hybrid_service(tmp_path)
+
+    with patch.object(service, "get_collection", return_value=collection):
+        result = service.retrieve_by_vector([1.0, 0.0], "hybrid", k=2, query="Glamdring")
+
+    assert_that([doc.id for doc in result]).is_equal_to(["id0", "id1"])
+
+
+def docs_with_ids(*ids: str) -> list:
+    return [Document(page_content=f"chunk {doc_id}", id=doc_id) for doc_id in ids]
+
+
+def test_should_retrieve_many_questions_with_one_multi_query_search():
+    settings = MagicMock(spec=Settings)
+    settings.rag.vector_backend = "chroma"
+    settings.rag.hybrid_search = False
+    embedding_service = MagicMock(spec=EmbeddingService)
+    embedding_service.get_embeddings.return_value = DeterministicFakeEmbedding(size=2)
+    collection = MagicMock()
+    first = create_chroma_results([[1.0, 0.0], [0.0, 1.0]])
+    second = create_chroma_results([[0.0, 1.0]])
+    collection.query.return_value = {key: first[key] + second[key] for key in first}
+    service = VectorStoreService(settings, embedding_service)
+
+    with patch.object(service, "get_collection", return_value=collection):
+        results = service.retrieve_many(["first question", "second question"], k=1, fetch_k=5)
+
+    collection.query.assert_called_once()
+    assert_that(collection.query.call_args.kwargs["query_embeddings"]).is_length(2)
+    assert_that([[doc.id for doc in docs] for docs in results]).is_length(2)
+    assert_that(results[1]).is_length(1)
+
+
+@pytest.mark.asyncio
+async def test_should_retrieve_many_questions_from_local_index(tmp_path):
+    collection = chromadb.EphemeralClient().get_or_create_collection("local_many")
+    collection.add(ids=["a", "b"], embeddings=[[1.0, 0.0], [0.0, 1.0]], documents=["alpha", "beta"])
+    build_local_index(collection, str(tmp_path), "v1")
+    embedding_service = MagicMock(spec=EmbeddingService)
+    embeddings = MagicMock()
+    embeddings.aembed_queries = AsyncMock(return_value=[[1.0, 0.1], [0.1, 1.0]])
+    embedding_service.get_embeddings.return_value = embeddings
+    service = VectorStoreService(create_local_settings(tmp_path), embedding_service)
+
+    results = await service.aretrieve_many(["alpha?", "beta?"], "local_many", k=1, fetch_k=2)
+
+    embeddings.aembed_queries.assert_awaited_once_with(["alpha?", "beta?"])
+    assert_that([[doc.page_content for doc in docs] for docs in results]).is_equal_to([["alpha"], ["beta"]])
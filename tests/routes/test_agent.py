@@ -5,8 +5,9 @@ from assertpy import assert_that
 from fastapi.testclient import TestClient
 
 from ai_unifier_assesment.app import app
-from ai_unifier_assesment.agent.trip_planner_agent import TripPlannerAgent
-from ai_unifier_assesment.repositories.metrics_repository import MetricsRepository
+from ai_unifier_assesment.agent.trip_planner_agent import TripPlannerAgent, get_trip_planner_agent
+from ai_unifier_assesment.services.metrics_sink import MetricsSink, get_metrics_sink
+from ai_unifier_assesment.services.usage_collector import UsageCollector
 
 
 @pytest.fixture
@@ -15,14 +16,14 @@ def mock_agent():
 
 
 @pytest.fixture
-def mock_metrics_repo():
-    return MagicMock(spec=MetricsRepository)
+def mock_metrics_sink():
+    return MagicMock(spec=MetricsSink)
 
 
 @pytest.fixture
-def client(mock_agent, mock_metrics_repo):
-    app.dependency_overrides[TripPlannerAgent] = lambda: mock_agent
-    app.dependency_overrides[MetricsRepository] = lambda: mock_metrics_repo
+def client(mock_agent, mock_metrics_sink):
+    app.dependency_overrides[get_trip_planner_agent] = lambda: mock_agent
+    app.dependency_overrides[get_metrics_sink] = lambda: mock_metrics_sink
     yield TestClient(app)
     app.dependency_overrides.clear()
 
@@ -135,3 +136,13 @@ def test_plan_trip_returns_null_itinerary_on_failure(client, mock_agent):
             "itinerary": None,
         }
     )
+
+
+def test_plan_trip_collects_usage_through_callbacks(client, mock_agent, mock_metrics_sink):
+    mock_agent.plan_trip.return_value = {"itinerary": None}
+
+    client.post("/api/plan-trip", json={"prompt": "Plan a trip"})
+
+    callbacks = mock_agent.plan_trip.call_args.kwargs["callbacks"]
+    assert_that(callbacks[0]).is_instance_of(UsageCollector)
+    assert_that(mock_metrics_sink.record.call_args.kwargs["metadata"]).contains_key("nodes")
@@ -0,0 +1,88 @@
+from unittest.mock import MagicMock
+
+from assertpy import assert_that
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from ai_unifier_assesment.app import app
+from ai_unifier_assesment.db.session import get_engine
+from ai_unifier_assesment.rag.embedding_service import EmbeddingService
+from ai_unifier_assesment.rag.retrieval_cache import RetrievalCache, get_retrieval_cache
+from ai_unifier_assesment.services.metrics_sink import MetricsSink, get_metrics_sink
+from ai_unifier_assesment.services.session_window_cache import SessionWindowCache, get_session_window_cache
+
+
+def test_runtime_stats_reports_db_pool():
+    engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=2, max_overflow=0)
+    metrics_sink = MagicMock(spec=MetricsSink)
+    metrics_sink.stats.return_value = {"backlog": 0, "dropped": 0}
+    app.dependency_overrides[get_engine] = lambda: engine
+    app.dependency_overrides[get_metrics_sink] = lambda: metrics_sink
+    try:
+        response = TestClient(app).get("/api/metrics/runtime")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert_that(response.json()["db_pool"]).contains_entry({"pool_class": "QueuePool"}, {"size": 2})
+
+
+def test_runtime_stats_reports_metrics_sink_counters():
+    engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=2, max_overflow=0)
+    metrics_sink = MagicMock(spec=MetricsSink)
+    metrics_sink.stats.return_value = {"backlog": 3, "dropped": 1}
+    app.dependency_overrides[get_engine] = lambda: engine
+    app.dependency_overrides[get_metrics_sink] = lambda: metrics_sink
+    try:
+        response = TestClient(app).get("/api/metrics/runtime")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert_that(response.json()["metrics_sink"]).is_equal_to({"backlog": 3, "dropped": 1})
+
+
+def test_runtime_stats_reports_session_cache():
+    engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=2, max_overflow=0)
+    metrics_sink = MagicMock(spec=MetricsSink)
+    metrics_sink.stats.return_value = {}
+    app.dependency_overrides[get_engine] = lambda: engine
+    app.dependency_overrides[get_metrics_sink] = lambda: metrics_sink
+    app.dependency_overrides[get_session_window_cache] = lambda: SessionWindowCache(10, 60.0, 5)
+    try:
+        response = TestClient(app).get("/api/metrics/runtime")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert_that(response.json()["session_cache"]).contains_entry({"max_sessions": 10}, {"hits": 0})
+
+
+def test_runtime_stats_reports_embedding_cache():
+    engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=2, max_overflow=0)
+    metrics_sink = MagicMock(spec=MetricsSink)
+    metrics_sink.stats.return_value = {}
+    embedding_service = MagicMock(spec=EmbeddingService)
+    embedding_service.cache_stats.return_value = {"hits": 4, "misses": 1}
+    app.dependency_overrides[get_engine] = lambda: engine
+    app.dependency_overrides[get_metrics_sink] = lambda: metrics_sink
+    app.dependency_overrides[EmbeddingService] = lambda: embedding_service
+    try:
+        response = TestClient(app).get("/api/metrics/runtime")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert_that(response.json()["embedding_cache"]).is_equal_to({"hits": 4, "misses": 1})
+
+
+def test_runtime_stats_reports_retrieval_cache():
+    engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=2, max_overflow=0)
+    metrics_sink = MagicMock(spec=MetricsSink)
+    metrics_sink.stats.return_value = {}
+    app.dependency_overrides[get_engine] = lambda: engine
+    app.dependency_overrides[get_metrics_sink] = lambda: metrics_sink
+    app.dependency_overrides[get_retrieval_cache] = lambda: RetrievalCache(16)
+    try:
+        response = TestClient(app).get("/api/metrics/runtime")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert_that(response.json()["retrieval_cache"]).contains_entry({"max_entries": 16}, {"hits": 0})
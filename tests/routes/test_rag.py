@@ -6,6 +6,7 @@ from httpx import ASGITransport, AsyncClient
 
 from ai_unifier_assesment.app import app
 from ai_unifier_assesment.rag.qa_service import QAService
+from ai_unifier_assesment.rag.qa_stream_service import QAStreamService
 
 
 @pytest.fixture
@@ -22,7 +23,7 @@ def override_qa_service(mock_qa_service):
 
 @pytest.mark.asyncio
 async def test_should_return_answer_with_citations(override_qa_service):
-    override_qa_service.answer.return_value = {
+    override_qa_service.aanswer.return_value = {
         "answer": "The answer is 42 [Source 1]",
         "sources": [{"source": "test.pdf", "page": 1}],
         "retrieval_time_ms": 150.5,
@@ -41,7 +42,7 @@ async def test_should_return_answer_with_citations(override_qa_service):
 
 @pytest.mark.asyncio
 async def test_should_use_custom_collection_name(override_qa_service):
-    override_qa_service.answer.return_value = {
+    override_qa_service.aanswer.return_value = {
         "answer": "Answer",
         "sources": [],
         "retrieval_time_ms": 100.0,
@@ -50,12 +51,12 @@ async def test_should_use_custom_collection_name(override_qa_service):
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
         await client.post("/rag/qa", json={"question": "Test?", "collection_name": "custom_collection"})
 
-    override_qa_service.answer.assert_called_once_with("Test?", "custom_collection")
+    override_qa_service.aanswer.assert_called_once_with("Test?", "custom_collection", 20, 0.5)
 
 
 @pytest.mark.asyncio
 async def test_should_retrieve_documents_without_answer(override_qa_service):
-    override_qa_service.retrieve_only.return_value = {
+    override_qa_service.aretrieve_only.return_value = {
         "documents": [
             {"content": "Document content", "source": "file.pdf", "page": 5},
         ],
@@ -72,9 +73,81 @@ async def test_should_retrieve_documents_without_answer(override_qa_service):
     assert_that(data["retrieval_time_ms"]).is_equal_to(50.0)
 
 
+@pytest.mark.asyncio
+async def test_should_pass_mmr_parameters_to_retrieval(override_qa_service):
+    override_qa_service.aretrieve_only.return_value = {"documents": [], "retrieval_time_ms": 5.0}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.post("/rag/retrieve", json={"question": "Find", "fetch_k": 200, "lambda_mult": 0.8})
+
+    override_qa_service.aretrieve_only.assert_called_once_with("Find", "rag_corpus", fetch_k=200, lambda_mult=0.8)
+
+
+@pytest.mark.asyncio
+async def test_should_return_422_for_out_of_range_lambda_mult(override_qa_service):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/rag/qa", json={"question": "Test?", "lambda_mult": 1.5})
+
+    assert_that(response.status_code).is_equal_to(422)
+
+
 @pytest.mark.asyncio
 async def test_should_return_422_for_missing_question(override_qa_service):
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
         response = await client.post("/rag/qa", json={})
 
     assert_that(response.status_code).is_equal_to(422)
+
+
+@pytest.mark.asyncio
+async def test_should_stream_answer_as_event_stream():
+    async def stream_answer(question, collection_name, fetch_k, lambda_mult):
+        yield 'event: sources\ndata: {"sources": []}\n\n'
+        yield "data: Answer\n\n"
+
+    mock_stream_service = MagicMock(spec=QAStreamService)
+    mock_stream_service.stream_answer.side_effect = stream_answer
+    app.dependency_overrides[QAStreamService] = lambda: mock_stream_service
+
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/rag/qa/stream", json={"question": "Test?", "collection_name": "custom"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert_that(response.headers["content-type"]).starts_with("text/event-stream")
+    assert_that(response.text).starts_with("event: sources").contains("data: Answer")
+    mock_stream_service.stream_answer.assert_called_once_with("Test?", "custom", 20, 0.5)
+
+
+@pytest.mark.asyncio
+async def test_should_retrieve_documents_for_many_questions(override_qa_service):
+    override_qa_service.aretrieve_many.return_value = {
+        "results": [
+            {"documents": [{"content": "Frodo", "source": "lotr.pdf", "page": 1}], "retrieval_time_ms": 2.0},
+            {"documents": [], "retrieval_time_ms": 2.0},
+        ],
+        "retrieval_time_ms": 4.5,
+    }
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            "/rag/retrieve/batch", json={"questions": ["Who is Frodo?", "Who is Sam?"], "k": 3}
+        )
+
+    assert_that(response.status_code).is_equal_to(200)
+    data = response.json()
+    assert_that(data["results"]).is_length(2)
+    assert_that(data["results"][0]["documents"][0]["content"]).is_equal_to("Frodo")
+    assert_that(data["retrieval_time_ms"]).is_equal_to(4.5)
+    override_qa_service.aretrieve_many.assert_called_once_with(
+        ["Who is Frodo?", "Who is Sam?"], "rag_corpus", 3, 20, 0.5
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_return_422_for_empty_question_batch(override_qa_service):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/rag/retrieve/batch", json={"questions": []})
+
+    assert_that(response.status_code).is_equal_to(422)
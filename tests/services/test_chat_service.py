@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 from ai_unifier_assesment.services.memory_service import MemoryService
 import pytest
@@ -8,12 +8,13 @@ from assertpy import assert_that
 from ai_unifier_assesment.large_language_model.model import Model
 from ai_unifier_assesment.services.chat_service import ChatService
 from ai_unifier_assesment.services.stream_metrics import StreamMetrics, TokenCounter
-from ai_unifier_assesment.repositories.metrics_repository import MetricsRepository
+from ai_unifier_assesment.services.metrics_sink import MetricsSink
 
 
 @dataclass
 class Chunk:
     content: str | None
+    usage_metadata: dict | None = None
 
 
 async def async_iter(items):
@@ -40,16 +41,16 @@ def create_service_with_mocks():
     mock_memory_service.get_trimmer.return_value = mock_trimmer
 
     mock_history = Mock()
-    mock_history.messages = []
+    mock_history.aget_messages = AsyncMock(return_value=[])
     mock_memory_service.get_session_history.return_value = mock_history
 
     mock_token_counter = Mock(spec=TokenCounter)
     mock_token_counter.count_message_tokens.return_value = 100
     mock_token_counter.count_text_tokens.return_value = 50
 
-    mock_metrics_repo = Mock(spec=MetricsRepository)
+    mock_metrics_sink = Mock(spec=MetricsSink)
 
-    service = ChatService(mock_model, mock_metrics, mock_memory_service, mock_token_counter, mock_metrics_repo)
+    service = ChatService(mock_model, mock_metrics, mock_memory_service, mock_token_counter, mock_metrics_sink)
     return service, mock_model, mock_metrics, mock_memory_service, mock_token_counter
 
 
@@ -107,6 +108,23 @@ async def test_should_count_tokens_using_token_counter():
         mock_token_counter.count_text_tokens.assert_called_once_with("Hello")
 
 
+@pytest.mark.asyncio
+async def test_should_use_provider_reported_usage_when_present():
+    service, _, mock_metrics, _, mock_token_counter = create_service_with_mocks()
+    chunks = [Chunk("Hello"), Chunk("", usage_metadata={"input_tokens": 12, "output_tokens": 3, "total_tokens": 15})]
+
+    with patch("ai_unifier_assesment.services.chat_service.RunnableWithMessageHistory") as mock_rwmh:
+        mock_chain = Mock()
+        mock_chain.astream.return_value = async_iter(chunks)
+        mock_rwmh.return_value = mock_chain
+
+        [chunk async for chunk in service.stream_response("test", "session_id")]
+
+    mock_token_counter.count_message_tokens.assert_not_called()
+    _, prompt_tokens, completion_tokens = mock_metrics.build_stats.call_args.args
+    assert_that((prompt_tokens, completion_tokens)).is_equal_to((12, 3))
+
+
 @pytest.mark.asyncio
 async def test_should_build_stats_at_end():
     service, _, mock_metrics, _, _ = create_service_with_mocks()
@@ -120,3 +138,25 @@ async def test_should_build_stats_at_end():
         [chunk async for chunk in service.stream_response("test", "session_id")]
 
         mock_metrics.build_stats.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_should_queue_metrics_without_waiting_on_database():
+    service, _, _, _, _ = create_service_with_mocks()
+    chunks = [Chunk("Hello")]
+
+    with patch("ai_unifier_assesment.services.chat_service.RunnableWithMessageHistory") as mock_rwmh:
+        mock_chain = Mock()
+        mock_chain.astream.return_value = async_iter(chunks)
+        mock_rwmh.return_value = mock_chain
+
+        [chunk async for chunk in service.stream_response("test", "session_id")]
+
+    service._metrics_sink.record.assert_called_once_with(
+        endpoint="chat",
+        session_id="session_id",
+        prompt_tokens=100,
+        completion_tokens=50,
+        cost=0.00075,
+        latency_ms=500,
+    )
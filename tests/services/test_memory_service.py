@@ -1,10 +1,11 @@
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 from assertpy import assert_that
 from langchain_community.chat_message_histories import PostgresChatMessageHistory
 
 from ai_unifier_assesment.config import Settings, PostgresConfig
 from ai_unifier_assesment.services.memory_service import MemoryService
+from ai_unifier_assesment.services.pooled_chat_history import PooledChatMessageHistory
 
 
 def create_mock_settings(window_size: int = 5) -> Settings:
@@ -33,6 +34,14 @@ def test_get_session_history_should_create_postgres_history(mock_init):
     )
 
 
+def test_get_session_history_should_use_shared_pool_when_available():
+    service = MemoryService(create_mock_settings(), MagicMock(), sync_pool=MagicMock())
+
+    history = service.get_session_history("session-1")
+
+    assert_that(history).is_instance_of(PooledChatMessageHistory)
+
+
 def test_get_trimmer_should_return_trimmer():
     service = MemoryService(create_mock_settings(window_size=10))
 
@@ -0,0 +1,149 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from assertpy import assert_that
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from ai_unifier_assesment.config import MetricsSinkConfig
+from ai_unifier_assesment.models.agent_execution import AgentExecution
+from ai_unifier_assesment.models.base import Base
+from ai_unifier_assesment.models.metrics import Metric
+from ai_unifier_assesment.services.metrics_sink import MetricsSink
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def create_sink(session_factory, batch_size: int = 10, max_queue_size: int = 100, interval: float = 0.05):
+    config = MetricsSinkConfig(batch_size=batch_size, flush_interval_seconds=interval, max_queue_size=max_queue_size)
+    return MetricsSink(session_factory, config)
+
+
+def record(sink: MetricsSink, endpoint: str = "chat") -> bool:
+    return sink.record(
+        endpoint=endpoint,
+        session_id="s1",
+        prompt_tokens=10,
+        completion_tokens=5,
+        cost=0.001,
+        latency_ms=12.5,
+    )
+
+
+def count_rows(session_factory) -> int:
+    with session_factory() as session:
+        return len(session.scalars(select(Metric)).all())
+
+
+@pytest.mark.asyncio
+async def test_should_flush_queued_metrics_on_close(session_factory):
+    sink = create_sink(session_factory)
+    for _ in range(3):
+        record(sink)
+
+    await sink.aclose()
+
+    assert_that(count_rows(session_factory)).is_equal_to(3)
+
+
+@pytest.mark.asyncio
+async def test_should_persist_agent_executions_alongside_metrics(session_factory):
+    sink = create_sink(session_factory)
+    record(sink, endpoint="coding_agent")
+    sink.record_agent_execution(
+        {
+            "session_id": "run-1",
+            "task_description": "write quicksort",
+            "language": "python",
+            "status": "success",
+            "attempts": 1,
+            "started_at": datetime.utcnow(),
+            "total_tokens": 42,
+            "total_cost": 0.001,
+        }
+    )
+
+    await sink.aclose()
+
+    with session_factory() as session:
+        execution = session.scalars(select(AgentExecution)).one()
+    assert_that(execution.total_tokens).is_equal_to(42)
+    assert_that(count_rows(session_factory)).is_equal_to(1)
+
+
+@pytest.mark.asyncio
+async def test_should_flush_in_background_after_interval(session_factory):
+    sink = create_sink(session_factory, interval=0.01)
+    record(sink)
+
+    for _ in range(100):
+        if sink.stats()["flushed"]:
+            break
+        await asyncio.sleep(0.01)
+
+    assert_that(count_rows(session_factory)).is_equal_to(1)
+    await sink.aclose()
+
+
+@pytest.mark.asyncio
+async def test_should_write_rows_in_batches_of_configured_size(session_factory):
+    sink = create_sink(session_factory, batch_size=2)
+    for _ in range(5):
+        record(sink)
+
+    await sink.aclose()
+
+    assert_that(sink.stats()["batches"]).is_equal_to(3)
+
+
+@pytest.mark.asyncio
+async def test_should_drop_metrics_when_queue_is_full(session_factory):
+    sink = create_sink(session_factory, max_queue_size=1)
+
+    results = [record(sink) for _ in range(3)]
+
+    assert_that(results).is_equal_to([True, False, False])
+    assert_that(sink.stats()["dropped"]).is_equal_to(2)
+    await sink.aclose()
+
+
+@pytest.mark.asyncio
+async def test_should_count_failed_rows_when_database_write_fails():
+    def broken_factory():
+        raise RuntimeError("database down")
+
+    sink = create_sink(broken_factory)
+    record(sink)
+
+    await sink.aclose()
+
+    assert_that(sink.stats()["failed"]).is_equal_to(1)
+
+
+@pytest.mark.asyncio
+async def test_should_keep_metrics_when_agent_execution_row_fails(session_factory):
+    sink = create_sink(session_factory)
+    record(sink, endpoint="coding_agent")
+    sink.record_agent_execution({"session_id": "run-1", "status": "success"})
+
+    await sink.aclose()
+
+    assert_that(count_rows(session_factory)).is_equal_to(1)
+    assert_that(sink.stats()).contains_entry({"flushed": 1}, {"failed": 1}, {"batches": 1})
+
+
+@pytest.mark.asyncio
+async def test_should_reject_metrics_after_close(session_factory):
+    sink = create_sink(session_factory)
+    await sink.aclose()
+
+    accepted = record(sink)
+
+    assert_that(accepted).is_false()
@@ -0,0 +1,137 @@
+import json
+from contextlib import asynccontextmanager, contextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from assertpy import assert_that
+from langchain_core.messages import AIMessage, HumanMessage, message_to_dict
+
+from ai_unifier_assesment.services.pooled_chat_history import PooledChatMessageHistory
+from ai_unifier_assesment.services.session_window_cache import SessionWindowCache
+
+
+def create_pool(rows=None):
+    conn = MagicMock()
+    cursor = MagicMock()
+    cursor.fetchall = AsyncMock(return_value=rows or [])
+    conn.execute = AsyncMock(return_value=cursor)
+
+    @asynccontextmanager
+    async def connection():
+        yield conn
+
+    pool = MagicMock()
+    pool.open = AsyncMock()
+    pool.connection = connection
+    return pool, conn
+
+
+def create_sync_pool(rows=None):
+    conn = MagicMock()
+    conn.execute.return_value.fetchall.return_value = rows or []
+
+    @contextmanager
+    def connection():
+        yield conn
+
+    pool = MagicMock()
+    pool.connection = connection
+    return pool, conn
+
+
+def rendered(query) -> str:
+    return query.as_string(None)
+
+
+@pytest.mark.asyncio
+async def test_should_read_only_trailing_window():
+    pool, conn = create_pool()
+    history = PooledChatMessageHistory(pool, MagicMock(), "session-1", window_size=5)
+
+    await history.aget_messages()
+
+    query, params = conn.execute.call_args.args
+    assert_that(rendered(query)).contains("ORDER BY id DESC LIMIT %s")
+    assert_that(params).is_equal_to(("session-1", 5))
+
+
+@pytest.mark.asyncio
+async def test_should_decode_stored_messages_in_order():
+    rows = [
+        (message_to_dict(HumanMessage(content="Hi")),),
+        (json.dumps(message_to_dict(AIMessage(content="Hello"))),),
+    ]
+    pool, _ = create_pool(rows)
+    history = PooledChatMessageHistory(pool, MagicMock(), "session-1", window_size=5)
+
+    messages = await history.aget_messages()
+
+    assert_that([m.content for m in messages]).is_equal_to(["Hi", "Hello"])
+
+
+@pytest.mark.asyncio
+async def test_should_append_messages_in_single_statement():
+    pool, conn = create_pool()
+    history = PooledChatMessageHistory(pool, MagicMock(), "session-1", window_size=5)
+
+    await history.aadd_messages([HumanMessage(content="Hi"), AIMessage(content="Hello")])
+
+    conn.execute.assert_awaited_once()
+    query, params = conn.execute.call_args.args
+    assert_that(rendered(query)).contains("VALUES (%s, %s), (%s, %s)")
+    assert_that(params[0]).is_equal_to("session-1")
+
+
+@pytest.mark.asyncio
+async def test_should_skip_insert_for_no_messages():
+    pool, conn = create_pool()
+    history = PooledChatMessageHistory(pool, MagicMock(), "session-1", window_size=5)
+
+    await history.aadd_messages([])
+
+    conn.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_should_serve_appended_turns_from_window_cache():
+    pool, conn = create_pool()
+    cache = SessionWindowCache(max_sessions=10, ttl_seconds=60.0, window_size=5)
+    history = PooledChatMessageHistory(pool, MagicMock(), "session-1", window_size=5, window_cache=cache)
+
+    await history.aget_messages()
+    await history.aadd_messages([HumanMessage(content="Hi"), AIMessage(content="Hello")])
+    messages = await history.aget_messages()
+
+    assert_that([m.content for m in messages]).is_equal_to(["Hi", "Hello"])
+    assert_that(conn.execute.await_count).is_equal_to(2)
+    assert_that(cache.stats()["hits"]).is_equal_to(1)
+
+
+def test_should_read_trailing_window_through_sync_pool():
+    pool, conn = create_pool()
+    sync_pool, sync_conn = create_sync_pool([(message_to_dict(HumanMessage(content="Hi")),)])
+    history = PooledChatMessageHistory(pool, sync_pool, "session-1", window_size=5)
+
+    messages = history.messages
+
+    query, params = sync_conn.execute.call_args.args
+    assert_that(rendered(query)).contains("ORDER BY id DESC LIMIT %s")
+    assert_that(params).is_equal_to(("session-1", 5))
+    assert_that([m.content for m in messages]).is_equal_to(["Hi"])
+    conn.execute.assert_not_awaited()
+
+
+def test_should_append_and_clear_through_sync_pool():
+    pool, _ = create_pool()
+    sync_pool, sync_conn = create_sync_pool()
+    cache = SessionWindowCache(max_sessions=10, ttl_seconds=60.0, window_size=5)
+    history = PooledChatMessageHistory(pool, sync_pool, "session-1", window_size=5, window_cache=cache)
+
+    history.add_messages([HumanMessage(content="Hi"), AIMessage(content="Hello")])
+    history.clear()
+
+    insert, delete = sync_conn.execute.call_args_list
+    assert_that(rendered(insert.args[0])).contains("VALUES (%s, %s), (%s, %s)")
+    assert_that(rendered(delete.args[0])).contains("DELETE FROM")
+    assert_that(delete.args[1]).is_equal_to(("session-1",))
+    assert_that(cache.get("session-1")).is_none()
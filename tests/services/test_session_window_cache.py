@@ -0,0 +1,82 @@
+from assertpy import assert_that
+from langchain_core.messages import AIMessage, HumanMessage
+
+from ai_unifier_assesment.services.session_window_cache import SessionWindowCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def create_cache(max_sessions=2, ttl_seconds=60.0, window_size=3, clock=None):
+    return SessionWindowCache(max_sessions, ttl_seconds, window_size, clock=clock or FakeClock())
+
+
+def test_should_return_cached_window_and_count_hit():
+    cache = create_cache()
+    cache.put("s1", [HumanMessage(content="Hi")])
+
+    messages = cache.get("s1")
+
+    assert_that([m.content for m in messages]).is_equal_to(["Hi"])
+    assert_that(cache.stats()).contains_entry({"hits": 1}, {"misses": 0})
+
+
+def test_should_count_miss_for_unknown_session():
+    cache = create_cache()
+
+    assert_that(cache.get("unknown")).is_none()
+    assert_that(cache.stats()["misses"]).is_equal_to(1)
+
+
+def test_should_keep_only_trailing_window_on_append():
+    cache = create_cache(window_size=3)
+    cache.put("s1", [HumanMessage(content="1"), AIMessage(content="2")])
+
+    cache.append("s1", [HumanMessage(content="3"), AIMessage(content="4")])
+
+    assert_that([m.content for m in cache.get("s1")]).is_equal_to(["2", "3", "4"])
+
+
+def test_should_not_populate_uncached_session_on_append():
+    cache = create_cache()
+
+    cache.append("s1", [HumanMessage(content="Hi")])
+
+    assert_that(cache.get("s1")).is_none()
+
+
+def test_should_evict_least_recently_used_session():
+    cache = create_cache(max_sessions=2)
+    cache.put("s1", [])
+    cache.put("s2", [])
+    cache.get("s1")
+
+    cache.put("s3", [])
+
+    assert_that(cache.get("s2")).is_none()
+    assert_that(cache.get("s1")).is_not_none()
+    assert_that(cache.stats()["evictions"]).is_equal_to(1)
+
+
+def test_should_expire_entries_after_ttl():
+    clock = FakeClock()
+    cache = create_cache(ttl_seconds=10.0, clock=clock)
+    cache.put("s1", [HumanMessage(content="Hi")])
+
+    clock.now = 11.0
+
+    assert_that(cache.get("s1")).is_none()
+    assert_that(cache.stats()).contains_entry({"expirations": 1}, {"sessions": 0})
+
+
+def test_should_not_cache_when_disabled():
+    cache = create_cache(max_sessions=0)
+
+    cache.put("s1", [HumanMessage(content="Hi")])
+
+    assert_that(cache.get("s1")).is_none()
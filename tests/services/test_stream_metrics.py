@@ -1,10 +1,10 @@
 import time
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from assertpy import assert_that
 
-from ai_unifier_assesment.config import OpenAIConfig, PricingConfig, Settings
-from ai_unifier_assesment.services.stream_metrics import StreamMetrics, TokenCounter
+from ai_unifier_assesment.config import OpenAIConfig, PricingConfig, Settings, TokenizerConfig
+from ai_unifier_assesment.services.stream_metrics import EncodingRegistry, StreamingUsage, StreamMetrics, TokenCounter
 
 
 def create_settings(input_cost: float = 2.50, output_cost: float = 10.00) -> Settings:
@@ -23,6 +23,7 @@ def create_settings_for_token_counter(model_name: str = "gpt-4o-mini") -> Settin
         api_key="test-key",
         model_name=model_name,
     )
+    settings.tokenizer = TokenizerConfig(warm_up=False, num_threads=1)
     return settings
 
 
@@ -113,9 +114,86 @@ def test_token_counter_handles_message_with_name():
     assert_that(token_count).is_greater_than(6)
 
 
+def test_token_counter_encodes_prompt_messages_in_one_batch():
+    encoding = Mock()
+    encoding.encode_batch.return_value = [[1, 2], [3], [4]]
+
+    with patch("ai_unifier_assesment.services.stream_metrics.encoding_registry") as mock_registry:
+        mock_registry.get.return_value = encoding
+        counter = TokenCounter(create_settings_for_token_counter())
+
+    token_count = counter.count_message_tokens(
+        [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "Hi", "name": "Alice"}]
+    )
+
+    assert_that(token_count).is_equal_to(3 * 2 + 4 + 3)
+    encoding.encode_batch.assert_called_once_with(["Be brief.", "Hi", "Alice"], num_threads=1)
+
+
 def test_token_counter_falls_back_for_unknown_model():
     counter = TokenCounter(create_settings_for_token_counter(model_name="unknown-model"))
 
     token_count = counter.count_text_tokens("Hello")
 
     assert_that(token_count).is_greater_than(0)
+
+
+def test_streaming_usage_counts_completion_chunk_by_chunk():
+    counter = Mock(spec=TokenCounter)
+    counter.count_text_tokens.return_value = 1
+    usage = StreamingUsage(counter)
+
+    for content in ["Hello", " world", ""]:
+        usage.add(Mock(content=content, usage_metadata=None))
+
+    assert_that(usage.completion_tokens()).is_equal_to(2)
+    assert_that(usage.prompt_tokens(lambda: 42)).is_equal_to(42)
+
+
+def test_streaming_usage_prefers_provider_reported_usage():
+    counter = Mock(spec=TokenCounter)
+    counter.count_text_tokens.return_value = 1
+    usage = StreamingUsage(counter)
+    count_prompt = Mock(return_value=42)
+
+    usage.add(Mock(content="Hello", usage_metadata=None))
+    usage.add(Mock(content="", usage_metadata={"input_tokens": 120, "output_tokens": 7, "total_tokens": 127}))
+
+    assert_that(usage.completion_tokens()).is_equal_to(7)
+    assert_that(usage.prompt_tokens(count_prompt)).is_equal_to(120)
+    count_prompt.assert_not_called()
+
+
+def test_encoding_registry_loads_each_model_once():
+    registry = EncodingRegistry()
+
+    with patch("ai_unifier_assesment.services.stream_metrics.tiktoken") as mock_tiktoken:
+        first = registry.get("gpt-4o-mini")
+        second = registry.get("gpt-4o-mini")
+
+    assert_that(first).is_same_as(second)
+    mock_tiktoken.encoding_for_model.assert_called_once_with("gpt-4o-mini")
+
+
+def test_encoding_registry_warm_up_tolerates_load_failures():
+    registry = EncodingRegistry()
+
+    with patch("ai_unifier_assesment.services.stream_metrics.tiktoken") as mock_tiktoken:
+        mock_tiktoken.encoding_for_model.side_effect = OSError("offline")
+        registry.warm_up(["gpt-4o-mini"])
+
+    mock_tiktoken.encoding_for_model.assert_called_once()
+
+
+def test_token_counter_counts_many_texts_in_one_batch():
+    encoding = Mock()
+    encoding.encode_batch.return_value = [[1, 2], [3]]
+    settings = create_settings_for_token_counter()
+    settings.tokenizer = Mock(num_threads=4)
+
+    with patch("ai_unifier_assesment.services.stream_metrics.encoding_registry") as mock_registry:
+        mock_registry.get.return_value = encoding
+        counter = TokenCounter(settings)
+
+    assert_that(counter.count_many(["Hello", "world"])).is_equal_to([2, 1])
+    encoding.encode_batch.assert_called_once_with(["Hello", "world"], num_threads=4)
@@ -0,0 +1,80 @@
+from typing import TypedDict
+from uuid import uuid4
+
+import pytest
+from assertpy import assert_that
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langgraph.graph import END, StateGraph
+
+from ai_unifier_assesment.services.usage_collector import UsageCollector
+
+
+class GraphState(TypedDict):
+    answer: str
+
+
+def usage_message(content: str, input_tokens: int, output_tokens: int) -> AIMessage:
+    return AIMessage(
+        content=content,
+        usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        },
+    )
+
+
+def build_graph(llm):
+    async def draft(state: GraphState) -> dict:
+        return {"answer": (await llm.ainvoke("draft")).content}
+
+    async def review(state: GraphState) -> dict:
+        return {"answer": (await llm.ainvoke("review")).content}
+
+    graph = StateGraph(GraphState)
+    graph.add_node("draft", draft)
+    graph.add_node("review", review)
+    graph.set_entry_point("draft")
+    graph.add_edge("draft", "review")
+    graph.add_edge("review", END)
+    return graph.compile()
+
+
+@pytest.mark.asyncio
+async def test_should_attribute_usage_to_graph_nodes():
+    llm = GenericFakeChatModel(messages=iter([usage_message("a", 10, 2), usage_message("b", 20, 3)]))
+    collector = UsageCollector()
+
+    await build_graph(llm).ainvoke({"answer": ""}, config={"callbacks": [collector]})
+
+    breakdown = collector.node_breakdown(lambda prompt, completion: 0.0)
+    assert_that(breakdown["draft"]).contains_entry({"llm_calls": 1}, {"prompt_tokens": 10}, {"completion_tokens": 2})
+    assert_that(breakdown["review"]).contains_entry({"runs": 1}, {"total_tokens": 23})
+
+
+@pytest.mark.asyncio
+async def test_should_aggregate_totals_across_llm_calls():
+    llm = GenericFakeChatModel(messages=iter([usage_message("a", 10, 2), usage_message("b", 20, 3)]))
+    collector = UsageCollector()
+
+    await build_graph(llm).ainvoke({"answer": ""}, config={"callbacks": [collector]})
+
+    assert_that((collector.prompt_tokens, collector.completion_tokens, collector.total_tokens)).is_equal_to((30, 5, 35))
+
+
+def test_should_fall_back_to_llm_output_token_usage():
+    collector = UsageCollector()
+    run_id = uuid4()
+    result = LLMResult(
+        generations=[[ChatGeneration(message=AIMessage(content="hi"))]],
+        llm_output={"token_usage": {"prompt_tokens": 7, "completion_tokens": 4}},
+    )
+
+    collector.on_chat_model_start({}, [], run_id=run_id, metadata={"langgraph_node": "agent"})
+    collector.on_llm_end(result, run_id=run_id)
+
+    assert_that(collector.node_breakdown(lambda prompt, completion: 0.5)["agent"]).contains_entry(
+        {"prompt_tokens": 7}, {"completion_tokens": 4}, {"cost": 0.5}
+    )
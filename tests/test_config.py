@@ -3,16 +3,20 @@ from unittest.mock import patch
 
 import pytest
 from assertpy import assert_that
+from pydantic import ValidationError
 
 from ai_unifier_assesment.config import (
     ChromaConfig,
+    DatabasePoolConfig,
     EvaluationConfig,
+    IngestionConfig,
     OllamaConfig,
     OpenAIConfig,
     PostgresConfig,
     PricingConfig,
     RAGConfig,
     Settings,
+    TokenizerConfig,
 )
 
 
@@ -132,13 +136,14 @@ def test_should_load_ollama_from_environment():
         "OPENAI_API_KEY": "sk-test",
         "OLLAMA_BASE_URL": "http://ollama:11434",
         "OLLAMA_EMBEDDING_MODEL": "custom-embed",
+        "OLLAMA_EMBED_CONCURRENCY": "16",
     }
 
     with patch.dict(os.environ, env_vars, clear=True):
         settings = Settings()
 
     assert_that(settings.ollama).is_equal_to(
-        OllamaConfig(base_url="http://ollama:11434", embedding_model="custom-embed")
+        OllamaConfig(base_url="http://ollama:11434", embedding_model="custom-embed", embed_concurrency=16)
     )
 
 
@@ -152,6 +157,13 @@ def test_should_use_default_ollama_embedding_model_when_not_set():
     settings = Settings()
 
     assert_that(settings.ollama.embedding_model).is_equal_to("nomic-embed-text")
+    assert_that(settings.ollama.embed_concurrency).is_equal_to(8)
+
+
+def test_should_bound_persistent_embedding_cache_by_default():
+    settings = Settings()
+
+    assert_that(settings.embedding_cache.sqlite_max_entries).is_equal_to(100000)
 
 
 def test_should_load_chroma_from_environment():
@@ -195,12 +207,50 @@ def test_should_load_rag_config_from_environment():
         "OPENAI_API_KEY": "sk-test",
         "RAG_CHUNK_SIZE": "1000",
         "RAG_CHUNK_OVERLAP": "200",
+        "RAG_VECTOR_BACKEND": "local",
+        "RAG_INDEX_DIR": "/var/index",
+        "RAG_INDEX_NPROBE": "4",
+        "RAG_INDEX_QUANTIZATION": "binary",
+        "RAG_HYBRID_SEARCH": "false",
+        "RAG_RRF_K": "30",
+        "RAG_CONTEXT_TOKEN_BUDGET": "800",
     }
 
     with patch.dict(os.environ, env_vars, clear=True):
         settings = Settings()
 
-    assert_that(settings.rag).is_equal_to(RAGConfig(chunk_size=1000, chunk_overlap=200))
+    assert_that(settings.rag).is_equal_to(
+        RAGConfig(
+            chunk_size=1000,
+            chunk_overlap=200,
+            vector_backend="local",
+            index_dir="/var/index",
+            index_nprobe=4,
+            index_quantization="binary",
+            hybrid_search=False,
+            rrf_k=30,
+            context_token_budget=800,
+        )
+    )
+
+
+def test_should_use_chroma_vector_backend_when_not_set():
+    settings = Settings()
+
+    assert_that(settings.rag.vector_backend).is_equal_to("chroma")
+    assert_that(settings.rag.index_dir).is_equal_to("data/index")
+    assert_that(settings.rag.index_quantization).is_equal_to("int8")
+    assert_that(settings.rag.hybrid_search).is_true()
+    assert_that(settings.rag.rrf_k).is_equal_to(60)
+    assert_that(settings.rag.context_token_budget).is_equal_to(1500)
+
+
+def test_should_reject_unknown_vector_backend():
+    env_vars = {"OPENAI_BASE_URL": "https://api.com", "OPENAI_API_KEY": "sk-test", "RAG_VECTOR_BACKEND": "faiss"}
+
+    with patch.dict(os.environ, env_vars, clear=True):
+        with pytest.raises(ValidationError):
+            Settings()
 
 
 def test_should_use_default_rag_chunk_size_when_not_set():
@@ -276,3 +326,90 @@ def test_should_use_default_evaluation_values_when_not_set():
 
     assert_that(settings.evaluation.test_size).is_equal_to(25)
     assert_that(settings.evaluation.llm_model).is_equal_to("llama3.1:8b-instruct-q4_K_M")
+
+
+def test_should_load_database_pool_from_environment():
+    env_vars = {
+        "OPENAI_BASE_URL": "https://api.com",
+        "OPENAI_API_KEY": "sk-test",
+        "POSTGRES_POOL_SIZE": "20",
+        "POSTGRES_MAX_OVERFLOW": "5",
+        "POSTGRES_POOL_RECYCLE_SECONDS": "600",
+        "POSTGRES_POOL_TIMEOUT_SECONDS": "2.5",
+        "POSTGRES_STATEMENT_TIMEOUT_MS": "1000",
+    }
+
+    with patch.dict(os.environ, env_vars, clear=True):
+        settings = Settings()
+
+    assert_that(settings.database_pool).is_equal_to(
+        DatabasePoolConfig(
+            pool_size=20,
+            max_overflow=5,
+            pool_recycle_seconds=600,
+            pool_timeout_seconds=2.5,
+            statement_timeout_ms=1000,
+        )
+    )
+
+
+def test_should_use_default_database_pool_values_when_not_set():
+    settings = Settings()
+
+    assert_that(settings.database_pool.pool_size).is_equal_to(5)
+    assert_that(settings.database_pool.max_overflow).is_equal_to(10)
+    assert_that(settings.database_pool.statement_timeout_ms).is_equal_to(30000)
+
+
+def test_should_load_tokenizer_from_environment():
+    env_vars = {
+        "OPENAI_BASE_URL": "https://api.com",
+        "OPENAI_API_KEY": "sk-test",
+        "TOKENIZER_WARM_UP": "true",
+        "TOKENIZER_NUM_THREADS": "4",
+    }
+
+    with patch.dict(os.environ, env_vars, clear=True):
+        settings = Settings()
+
+    assert_that(settings.tokenizer).is_equal_to(TokenizerConfig(warm_up=True, num_threads=4))
+
+
+def test_should_load_ingestion_settings_from_environment():
+    env_vars = {
+        "OPENAI_BASE_URL": "https://api.com",
+        "OPENAI_API_KEY": "sk-test",
+        "INGEST_WORKERS": "8",
+        "INGEST_MANIFEST_PATH": "/tmp/manifest.json",
+    }
+
+    with patch.dict(os.environ, env_vars, clear=True):
+        settings = Settings()
+
+    assert_that(settings.ingestion).is_equal_to(
+        IngestionConfig(
+            workers=8,
+            embed_batch_size=32,
+            embed_min_batch_size=8,
+            embed_max_batch_size=256,
+            embed_concurrency=4,
+            embed_target_batch_seconds=2.0,
+            embed_max_retries=3,
+            embed_retry_backoff_seconds=0.5,
+            upsert_batch_size=256,
+            manifest_path="/tmp/manifest.json",
+        )
+    )
+
+
+def test_should_load_retrieval_cache_size_from_environment():
+    env_vars = {
+        "OPENAI_BASE_URL": "https://api.com",
+        "OPENAI_API_KEY": "sk-test",
+        "RAG_RETRIEVAL_CACHE_MAX_ENTRIES": "64",
+    }
+
+    with patch.dict(os.environ, env_vars, clear=True):
+        settings = Settings()
+
+    assert_that(settings.answer_cache.retrieval_max_entries).is_equal_to(64)
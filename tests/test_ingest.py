@@ -3,6 +3,7 @@ from unittest.mock import MagicMock, patch
 from assertpy import assert_that
 
 from ai_unifier_assesment.ingest import main, create_ingestion_service, ingest_pdf, ingest_directory, show_stats
+from ai_unifier_assesment.rag.ingestion_pipeline import IngestionReport
 
 
 def test_should_create_ingestion_service_with_settings():
@@ -49,13 +50,12 @@ def test_should_ingest_directory_using_collection_from_settings():
 
         with patch("ai_unifier_assesment.ingest.create_ingestion_service") as mock_create:
             mock_service = MagicMock()
-            mock_service.get_collection_stats.return_value = {"document_count": 0}
-            mock_service.ingest_directory.return_value = 50
+            mock_service.ingest_directory_pipelined.return_value = IngestionReport(files=1, chunks=50)
             mock_create.return_value = mock_service
 
             ingest_directory("/test/dir")
 
-            mock_service.ingest_directory.assert_called_once_with("/test/dir", "test_collection")
+            mock_service.ingest_directory_pipelined.assert_called_once_with("/test/dir", "test_collection", force=False)
 
 
 def test_should_show_stats_for_collection():
@@ -98,6 +98,15 @@ def test_main_should_return_zero_for_directory():
             assert_that(result).is_equal_to(0)
 
 
+def test_main_should_pass_force_flag_for_directory():
+    with patch("ai_unifier_assesment.ingest.ingest_directory") as mock_ingest:
+        with patch("sys.argv", ["ingest", "--directory", "/test/dir", "--force"]):
+            result = main()
+
+            assert_that(result).is_equal_to(0)
+            mock_ingest.assert_called_once_with("/test/dir", force=True)
+
+
 def test_main_should_return_one_for_no_args():
     with patch("sys.argv", ["ingest"]):
         result = main()
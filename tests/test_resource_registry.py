@@ -0,0 +1,97 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from assertpy import assert_that
+
+from ai_unifier_assesment.resource_registry import ResourceRegistry
+
+
+def test_should_create_resource_only_once():
+    registry = ResourceRegistry()
+    factory = Mock(return_value=object())
+
+    first = registry.get_or_create("engine", factory)
+    second = registry.get_or_create("engine", factory)
+
+    assert_that(first).is_same_as(second)
+    factory.assert_called_once()
+
+
+def test_should_allow_factories_to_resolve_other_resources():
+    registry = ResourceRegistry()
+
+    agent = registry.get_or_create("agent", lambda: ("agent", registry.get_or_create("llm", object)))
+
+    assert_that(agent[1]).is_same_as(registry.get_or_create("llm", object))
+    assert_that(registry.keys()).is_equal_to(["llm", "agent"])
+
+
+def test_should_recreate_discarded_resource_without_closing_it():
+    registry = ResourceRegistry()
+    resource = Mock()
+    registry.get_or_create("collection", lambda: resource)
+
+    registry.discard("collection")
+    recreated = registry.get_or_create("collection", object)
+
+    assert_that(recreated).is_not_same_as(resource)
+    resource.close.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_should_dispose_resources_on_close():
+    registry = ResourceRegistry()
+    engine = Mock(spec=["dispose"])
+    registry.get_or_create("engine", lambda: engine)
+
+    await registry.aclose()
+
+    engine.dispose.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_should_await_async_closers():
+    registry = ResourceRegistry()
+    pool = Mock(spec=["aclose"])
+    pool.aclose = AsyncMock()
+    registry.get_or_create("pool", lambda: pool)
+
+    await registry.aclose()
+
+    pool.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_should_use_custom_closer_when_given():
+    registry = ResourceRegistry()
+    closer = Mock()
+    client = object()
+    registry.get_or_create("client", lambda: client, closer=closer)
+
+    await registry.aclose()
+
+    closer.assert_called_once_with(client)
+
+
+@pytest.mark.asyncio
+async def test_should_forget_resources_after_close():
+    registry = ResourceRegistry()
+    registry.get_or_create("engine", object)
+
+    await registry.aclose()
+
+    assert_that(registry.keys()).is_empty()
+
+
+@pytest.mark.asyncio
+async def test_should_keep_closing_when_one_resource_fails():
+    registry = ResourceRegistry()
+    failing = Mock(spec=["close"])
+    failing.close.side_effect = RuntimeError("boom")
+    engine = Mock(spec=["dispose"])
+    registry.get_or_create("engine", lambda: engine)
+    registry.get_or_create("failing", lambda: failing)
+
+    await registry.aclose()
+
+    engine.dispose.assert_called_once()